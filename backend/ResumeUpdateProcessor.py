@@ -1,108 +1,89 @@
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
-import logging
-from cosmosdb import CosmosDBManager
-import uuid
-from azure.search.documents import SearchClient
-from azure.search.documents.models import QueryType
-from azure.core.credentials import AzureKeyCredential
-from openai import AzureOpenAI
-from dotenv import load_dotenv
-import os
-from prompts import generate_work_experience_system_prompt
-from azure.core.credentials import AzureKeyCredential
-from azure.search.documents.indexes import SearchIndexClient
-from azure.search.documents import SearchClient
-from langchain_openai import AzureChatOpenAI
-from azure.communication.email import EmailClient  # Added back
+"""
+### ResumeUpdateProcessor.py ###
 
-from pydantic import BaseModel
+Resume update processing: key member events, trackers, draft generation, notifications and
+resume edits.
 
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
-import logging
-from cosmosdb import CosmosDBManager
-import uuid
-from azure.search.documents import SearchClient
-from azure.search.documents.models import QueryType
-from azure.core.credentials import AzureKeyCredential
-from openai import AzureOpenAI
-from dotenv import load_dotenv
-import os
-from azure.storage.blob import BlobServiceClient
-from io import BytesIO
+Importing this module is cheap: the Azure, OpenAI/langchain and python-docx packages are only
+imported, and their clients only built, on first use (see backends.LazyClient), so a
+notification run never loads docx or the embeddings client. check_import_time.py keeps this in
+check.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING, Union
+import contextlib
+import copy
 import json
-from docx import Document
-from docx.shared import Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-import tempfile
+import logging
 import os
-import contextlib
 import tempfile
-import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from io import BytesIO
+
+from azure.core.exceptions import HttpResponseError
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+import backends
+import tracing
+from email_dispatch import EmailDispatcher
+import notification_templates
+import search_cache
+from search_queries import eq_filter, search_by_keys
+from cosmosdb import CosmosDBManager, PreconditionFailedError, MAX_PATCH_OPERATIONS
+from employee_cache import get_employee_cache
+from llm_cache import LLMResponseCache, get_llm_cache
+from partitioning import PartitionRouter, strip_system_fields
+from pending_view import PendingUpdatesView, is_listed
+from project_screening import ProjectScreen, get_project_screen
 from prompts import insertion_system_prompt
-from langchain_openai import AzureOpenAIEmbeddings
-from datetime import timezone
-from prompts import generate_work_experience_system_prompt
-from azure.core.credentials import AzureKeyCredential
-from azure.search.documents.indexes import SearchIndexClient
-from azure.search.documents import SearchClient
-from langchain_openai import AzureChatOpenAI
-from azure.communication.email import EmailClient  # Added back
-from azure.identity import DefaultAzureCredential
+from structured_logging import fields, log_sampled
+
+if TYPE_CHECKING:
+    from docx.document import Document
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Azure OpenAI
 aoai_deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
 aoai_key = os.getenv("AZURE_OPENAI_API_KEY")
 aoai_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
 aoai_embedding_deployment = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME")
 
-
-
-primary_llm = AzureChatOpenAI(
-    azure_deployment=aoai_deployment,
-    api_version="2024-05-01-preview",
-    temperature=0.75,
-    max_tokens=None,
-    timeout=None,
-    max_retries=2,
-    api_key=aoai_key,
-    azure_endpoint=aoai_endpoint
-)
-
 API_VERSION = "2024-08-01-preview"
 
+# Azure AI Search
+# Fields read for a resume; `date` is the version the resume caches are keyed on
+RESUME_FIELDS = "id,jobTitle,experienceLevel,content,sourceFileName,employee_id,date"
+PROJECT_FIELDS = "id, project_number, content, sourcefilename, sourcepage, date"
+PROJECTS_PER_QUERY = 50
+# A total order on project chunks, so skip paging neither repeats nor drops one
+PROJECT_ORDER_BY = ["project_number asc", "sourcepage asc"]
+
 # Azure Blob Storage
 connect_str = os.getenv("STORAGE_ACCOUNT_CONNECTION_STRING")
 storage_account_name = os.getenv("STORAGE_ACCOUNT_NAME")
 container_name = "resumes"
 
+# Clients come from backends.py so BACKEND_MODE=fake can swap in the in-memory fakes. Each one
+# is built on first use, not at import.
+primary_llm = backends.LazyClient(backends.chat_model, temperature=0.75, api_version="2024-05-01-preview")
+
+# Passed to the client and to the LLM response cache key, so the cache never builds the client
+INSERTION_TEMPERATURE = 0
+
+aoai_client = backends.LazyClient(backends.openai_client)
 
-# Initialize Azure OpenAI client
-try:
-    aoai_client = AzureOpenAI(
-        azure_endpoint=aoai_endpoint,
-        api_key=aoai_key,
-        api_version=API_VERSION
-    )
-except Exception as e:
-    print(f"Failed to initialize Azure OpenAI client: {e}")
-    raise
-
-primary_llm_description_json = AzureChatOpenAI(
-    azure_deployment=aoai_deployment,
-    api_version="2024-08-01-preview",
+primary_llm_description_json = backends.LazyClient(
+    backends.chat_model,
     temperature=0,
-    max_tokens=None,
-    timeout=None,
-    max_retries=2,
-    api_key=aoai_key,
-    azure_endpoint=aoai_endpoint,
-    model_kwargs={
-    "response_format": {"type": "json_schema",
-    "json_schema": {
+    json_schema={
       "name": "project_title_and_description",
       "schema": {
         "type": "object",
@@ -120,22 +101,12 @@ primary_llm_description_json = AzureChatOpenAI(
         ]
       }
     }
-    }
-    }
 )
 
-primary_llm_insertion_json = AzureChatOpenAI(
-    azure_deployment=aoai_deployment,
-    api_version="2024-08-01-preview",
-    temperature=0,
-    max_tokens=None,
-    timeout=None,
-    max_retries=2,
-    api_key=aoai_key,
-    azure_endpoint=aoai_endpoint,
-    model_kwargs={
-    "response_format": {"type": "json_schema",
-    "json_schema": {
+primary_llm_insertion_json = backends.LazyClient(
+    backends.chat_model,
+    temperature=INSERTION_TEMPERATURE,
+    json_schema={
       "name": "project_insertion_position",
       "schema": {
         "type": "object",
@@ -153,19 +124,34 @@ primary_llm_insertion_json = AzureChatOpenAI(
         ]
       }
     }
-    }
-    }
 )
 
-primary_embedding_llm = AzureOpenAIEmbeddings(
-    model=aoai_embedding_deployment,
-    azure_endpoint=aoai_endpoint,
-    api_key=aoai_key,
-    openai_api_version="2024-08-01-preview"
-)
+primary_embedding_llm = backends.LazyClient(backends.embedding_model)
 
-from typing import List, Dict, Optional, Union
-def inference_structured_output_aoai(messages: List[Dict[str, Union[str, List[Dict[str, Union[str, Dict[str, str]]]]]]], deployment: str, schema: BaseModel) -> dict:
+def _llm_span_attributes(deployment: str, messages: List[Dict], response_format: Optional[str] = None) -> Dict[str, Any]:
+    attributes = {
+        "gen_ai.system": "az.ai.openai",
+        "gen_ai.operation.name": "chat",
+        "gen_ai.request.model": deployment or "",
+    }
+    if response_format:
+        attributes["gen_ai.request.response_format"] = response_format
+    if tracing.records_payloads():
+        attributes["payload.request_bytes"] = sum(tracing.payload_size(message.get("content")) for message in messages)
+    return attributes
+
+
+def invoke_llm(llm, messages: List[Dict], response_format: Optional[str] = None):
+    """Call a langchain chat model inside a tracing span that records its token usage."""
+    with tracing.span("openai.chat", attributes=_llm_span_attributes(aoai_deployment, messages, response_format)) as span:
+        response = llm.invoke(messages)
+        tracing.record_llm_usage(span, response)
+        span.set_attribute("payload.response_bytes", tracing.payload_size(response.content))
+        return response
+
+
+def inference_structured_output_aoai(messages: List[Dict[str, Union[str, List[Dict[str, Union[str, Dict[str, str]]]]]]], deployment: str, schema: BaseModel,
+                                    temperature: Optional[float] = None) -> dict:
     """
     Perform an inference task with structured output using Azure OpenAI.
 
@@ -175,6 +161,7 @@ def inference_structured_output_aoai(messages: List[Dict[str, Union[str, List[Di
       for text-only messages or a list of dictionaries for messages that include images.
     - deployment (str): The name of the Azure OpenAI deployment to use.
     - schema (BaseModel): A Pydantic model that defines the structure of the expected output.
+    - temperature (float, optional): Sampling temperature; the deployment's default if not given.
 
     Returns:
     - dict: The parsed response from Azure OpenAI, or None if an error occurs. The response includes
@@ -185,17 +172,22 @@ def inference_structured_output_aoai(messages: List[Dict[str, Union[str, List[Di
     include images, similar to the inference_aoai function.
     """
     try:
-        completion = aoai_client.beta.chat.completions.parse(
-            model=deployment,
-            messages=messages,
-            response_format=schema,
-        )
-        print("Structured output inference completed")
-        print(f"Completion content: {completion.choices[0].message.content}")
-        print(f"Parsed event: {completion.choices[0].message.parsed}")
+        with tracing.span("openai.chat.parse", attributes=_llm_span_attributes(deployment, messages, schema.__name__)) as span:
+            options = {"temperature": temperature} if temperature is not None else {}
+            completion = aoai_client.beta.chat.completions.parse(
+                model=deployment,
+                messages=messages,
+                response_format=schema,
+                **options
+            )
+            tracing.record_llm_usage(span, completion)
+            span.set_attribute("payload.response_bytes", tracing.payload_size(completion.choices[0].message.content))
+        # Completions can be several KB; only formatted when DEBUG is enabled
+        logger.debug("Structured output completion: %s", completion.choices[0].message.content,
+                     extra=fields(schema=schema.__name__))
         return completion
     except Exception as e:
-        print(f"Error in structured output inference: {e}")
+        logger.error("Error in structured output inference: %s", e, extra=fields(schema=schema.__name__))
         return None
 
 
@@ -213,74 +205,107 @@ class ResumeUpdateProcessor:
     def __init__(self):
         # Constants
         self.NOTIFICATION_COOLDOWN_HOURS = 24
+        # Employees whose notification records and emails are loaded together
+        self.NOTIFICATION_BATCH_SIZE = 500
         self.HOURS_THRESHOLD = 40
-        #Azure AI Search
-        self.ai_search_credential = AzureKeyCredential(os.environ.get("AZURE_SEARCH_KEY"))
-        
-        # Initialize Azure AI Search clients
-        self.search_client_resumes = SearchClient(
-            endpoint=os.environ.get("AZURE_SEARCH_ENDPOINT"),
-            index_name=os.environ.get("AZURE_SEARCH_INDEX_RESUMES"),
-            credential=self.ai_search_credential
-        )
-        
-        self.search_client_projects = SearchClient(
-            endpoint=os.environ.get("AZURE_SEARCH_ENDPOINT"),
-            index_name=os.environ.get("AZURE_SEARCH_INDEX_PROJECTS"),
-            credential=self.ai_search_credential
-        )
-        
-        self.events_container = CosmosDBManager(
-            cosmos_database_id="ResumeAutomation",
-            cosmos_container_id="project_key_members"
-        )
-        self.trackers_container = CosmosDBManager(
-            cosmos_database_id="ResumeAutomation",
-            cosmos_container_id="resume_trackers"
-        )
-        self.notification_container = CosmosDBManager(
-            cosmos_database_id="ResumeAutomation",
-            cosmos_container_id="notifications"
-        )
-        self.employee_metadata_container = CosmosDBManager(
-            cosmos_database_id="ResumeAutomation",
-            cosmos_container_id="employee_metadata"
-        )
-        self.feedback_container = CosmosDBManager(
-            cosmos_database_id="ResumeAutomation",
-            cosmos_container_id="feedback"
-        )
+        self.MAX_TRACKER_CONFLICT_RETRIES = 10
+        # Title/description parsing is deterministic, which lets llm_cache answer repeats
+        self.PARSE_TEMPERATURE = 0
+        # Projects of one save parsed concurrently
+        self.SAVE_UPDATES_MAX_CONCURRENCY = int(os.environ.get("SAVE_UPDATES_MAX_CONCURRENCY", 8))
+        self.events_container = backends.cosmos_container("project_key_members")
+        self.trackers_container = backends.cosmos_container("resume_trackers")
+        self.notification_container = backends.cosmos_container("notifications")
+        self.employee_metadata_container = backends.cosmos_container("employee_metadata")
+        self.feedback_container = backends.cosmos_container("feedback")
         self.logger = logging.getLogger(__name__)
         self.notification_cooldown = timedelta(hours=self.NOTIFICATION_COOLDOWN_HOURS)
+
+        # Routes trackers, notification records and employee metadata to their partitions
+        self.partition_router = PartitionRouter()
+
+        # "worker": ingestion stops at marking a tracker in_progress and draft_worker.py generates
+        # the draft from the trackers change feed. "inline": generate it during ingestion.
+        self.draft_generation_mode = os.environ.get("DRAFT_GENERATION_MODE", "worker")
+
+        # Per-employee pending-updates summaries, kept next to the trackers
+        self.pending_view = PendingUpdatesView(self.trackers_container, self.partition_router, self.MAX_TRACKER_CONFLICT_RETRIES)
+
+        # Employee metadata (emails) cached per process, shared with other processors
+        self.employee_cache = get_employee_cache(self.employee_metadata_container, self.partition_router)
+
+        # Resume documents from the search index, cached per request and per process
+        self.resume_cache = search_cache.get_cache("resumes")
+        self.project_cache = search_cache.get_cache("projects")
+        # Cleared if the project index predates sortable project_number and sourcepage
+        self.project_order_by: Optional[List[str]] = PROJECT_ORDER_BY
+
+        # Number of tracker writes retried after an ETag conflict
+        self.tracker_conflict_retries = 0
+        self._tracker_conflict_retries_lock = threading.Lock()
         
-        # Initialize Email Client
-        connection_string = os.environ.get("COMMUNICATION_SERVICES_CONNECTION_STRING")
-        self.email_client = EmailClient.from_connection_string(connection_string)
         self.webapp_url = os.environ.get("WEBAPP_URL")
 
-        self.blob_service_client = None
-        try:
-            # First try connection string
-            connect_str = os.getenv("STORAGE_ACCOUNT_CONNECTION_STRING")
-            if connect_str:
-                self.logger.info("Initializing blob storage with connection string")
-                self.blob_service_client = BlobServiceClient.from_connection_string(connect_str)
-            else:
-                # Fall back to DefaultAzureCredential
-                self.logger.info("No connection string found, using DefaultAzureCredential")
-                storage_account_name = os.getenv("STORAGE_ACCOUNT_NAME")
-                account_url = f"https://{storage_account_name}.blob.core.windows.net"
-                credential = DefaultAzureCredential()
-                self.blob_service_client = BlobServiceClient(account_url=account_url, credential=credential)
-        except Exception as e:
-            self.logger.error(f"Failed to initialize blob storage client: {str(e)}")
-            raise
-
         # Store container names
         self.resume_container_name = os.getenv("STORAGE_ACCOUNT_RESUME_CONTAINER", "resumes")
         self.input_resumes_folder = os.environ.get("STORAGE_ACCOUNT_INPUT_FOLDER", "processed")
         self.updated_resumes_folder = os.environ.get("STORAGE_ACCOUNT_OUTPUT_FOLDER", "updated")
             
+    # Search, email and blob clients are built on first use; a notification run never needs
+    # search or blob storage, and ingestion only needs email when a draft is ready.
+    @cached_property
+    def search_client_resumes(self):
+        return backends.search_client(os.environ.get("AZURE_SEARCH_INDEX_RESUMES", "resumes"))
+
+    @cached_property
+    def search_client_projects(self):
+        return backends.search_client(os.environ.get("AZURE_SEARCH_INDEX_PROJECTS", "projects"))
+
+    @cached_property
+    def email_client(self):
+        return backends.email_client()
+
+    @cached_property
+    def email_dispatcher(self) -> EmailDispatcher:
+        return EmailDispatcher(self.email_client)
+
+    @cached_property
+    def blob_service_client(self):
+        try:
+            # Connection string first, then DefaultAzureCredential
+            return backends.blob_service_client()
+        except Exception as e:
+            self.logger.error("Failed to initialize blob storage client: %s", e)
+            raise
+
+    def provision(self) -> None:
+        """
+        Create the Cosmos DB database and containers if they do not exist.
+        Only needed for first-time setup of an environment.
+        """
+        for container in self._cosmos_containers():
+            container.provision()
+
+    def _cosmos_containers(self) -> List[CosmosDBManager]:
+        return [
+            self.events_container,
+            self.trackers_container,
+            self.notification_container,
+            self.employee_metadata_container,
+            self.feedback_container
+        ]
+
+    def get_request_charges(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Get the Cosmos DB request count and RU charge recorded per container and operation.
+
+        Returns:
+            Dict keyed by container id, e.g. {"resume_trackers": {"read": {"count": 3, "request_charge": 3.0}}}
+        """
+        return {container.cosmos_container_id: container.get_request_charges() for container in self._cosmos_containers()}
+
+    @tracing.traced()
+    @search_cache.scoped
     def process_key_member(self, member_entry: Dict) -> Dict:
         """Process an incoming key member entry."""
         try:
@@ -290,24 +315,24 @@ class ResumeUpdateProcessor:
             
             # 2. Get or create resume tracker
             tracker = self._get_or_create_tracker(member_entry)
+            self._refresh_pending_hours(tracker)
             
             # 3. Check if we need to trigger resume update
             if self._should_trigger_update(tracker):
-                # Update tracker status to in_progress first
-                tracker['added_to_resume'] = 'in_progress'
-                tracker['last_updated'] = datetime.utcnow().isoformat()
-                tracker['version'] += 1
-                updated_tracker = self.trackers_container.update_item(tracker)
+                # Update tracker status to in_progress first. None means a concurrent
+                # writer already started the update for this tracker.
+                updated_tracker = self._mark_in_progress(tracker)
                 
-                # Then trigger the draft creation
-                final_tracker = self._trigger_draft_creation(updated_tracker)
-                
-                return {
-                    'status': 'triggered',
-                    'message': f"Resume update triggered. Total hours: {final_tracker['total_hours']}",
-                    'event_id': stored_event['id'],
-                    'tracker_id': final_tracker['id']
-                }
+                if updated_tracker:
+                    # Then trigger the draft creation, unless the draft worker picks it up
+                    final_tracker = self._queue_or_create_draft(updated_tracker)
+                    
+                    return {
+                        'status': 'triggered',
+                        'message': f"Resume update triggered. Total hours: {final_tracker['total_hours']}",
+                        'event_id': stored_event['id'],
+                        'tracker_id': final_tracker['id']
+                    }
             
             return {
                 'status': 'stored',
@@ -317,49 +342,318 @@ class ResumeUpdateProcessor:
             }
 
         except Exception as e:
-            self.logger.error(f"Error processing key member entry: {str(e)}")
+            self.logger.error("Error processing key member entry: %s", e)
+            raise
+
+    @tracing.traced()
+    def process_key_members(self, member_entries: List[Dict]) -> List[Dict]:
+        """
+        Process a batch of incoming key member entries.
+
+        Rows are grouped by tracker id (<project_number>-<employee_id>) and duplicates are
+        collapsed so only the latest hours of each tracker are applied. Events and trackers
+        are written with transactional batches instead of one round trip per row.
+
+        Args:
+            member_entries: Key member entries in the order they were exported
+
+        Returns:
+            List[Dict]: One result per entry, in input order, shaped like process_key_member's result.
+            A row whose event could not be stored, even on retry, has status 'event_not_stored':
+            its hours are on the tracker and only the event (event_id) is missing.
+        """
+        try:
+            # 1. Store every event; upserted, so a replayed row keeps a single event. A batch
+            # fails as a whole, so its events are retried one at a time.
+            event_docs = [self._build_event(member_entry) for member_entry in member_entries]
+            stored_events = self.events_container.upsert_items(event_docs)
+            for row, stored_event in enumerate(stored_events):
+                if stored_event is None:
+                    try:
+                        stored_events[row] = self.events_container.upsert_item(event_docs[row])
+                    except Exception as e:
+                        self.logger.error("Error storing event %s: %s", event_docs[row]['id'], e)
+
+            # 2. Group rows by tracker, keeping input order within each group
+            rows_by_tracker: Dict[str, List[int]] = {}
+            for row, member_entry in enumerate(member_entries):
+                rows_by_tracker.setdefault(self._get_tracker_id(member_entry), []).append(row)
+
+            # 3. Apply each group to its existing or new tracker. Existing trackers are
+            # patched only if their ETag still matches, new ones are created.
+            existing_trackers = self._get_trackers(list(rows_by_tracker))
+            operations = []
+            partition_keys = []
+            for tracker_id, rows in rows_by_tracker.items():
+                group_entries = [member_entries[row] for row in rows]
+                partition_keys.append(self._tracker_partition_key(self._get_employee_id(group_entries[0])))
+                tracker = existing_trackers.get(tracker_id)
+                if tracker:
+                    patch_operations = self._tracker_patch_operations(self._entry_patch_operations(tracker, group_entries))
+                    if len(patch_operations) <= MAX_PATCH_OPERATIONS:
+                        operations.append(("patch", (tracker_id, patch_operations), {"if_match_etag": tracker['_etag']}))
+                    else:
+                        self._apply_entries_to_tracker(tracker, group_entries)
+                        tracker['last_updated'] = datetime.utcnow().isoformat()
+                        tracker['version'] += 1
+                        operations.append(("replace", (tracker_id, tracker), {"if_match_etag": tracker['_etag']}))
+                else:
+                    tracker = self._new_tracker(group_entries[0])
+                    self._apply_entries_to_tracker(tracker, group_entries)
+                    operations.append(("create", (tracker,)))
+
+            saved_trackers = self.trackers_container.execute_in_batches(operations, partition_keys)
+
+            # A batch fails as a whole if any tracker in it changed concurrently;
+            # re-apply those groups one tracker at a time with conflict retries
+            for position, rows in enumerate(rows_by_tracker.values()):
+                if saved_trackers[position] is None:
+                    try:
+                        saved_trackers[position] = self._apply_entries_with_retry([member_entries[row] for row in rows])
+                    except Exception as e:
+                        self.logger.error("Error saving tracker %s: %s", self._get_tracker_id(member_entries[rows[0]]), e)
+
+            # 4. Check each saved tracker for a resume update and build per-row results. Trackers
+            # over the threshold are checked against the resume, so load those resumes and
+            # projects with bulk queries first.
+            self.prefetch_search_documents([
+                tracker for tracker in saved_trackers
+                if tracker and tracker['total_hours'] >= self.HOURS_THRESHOLD and tracker['added_to_resume'] == 'no'
+            ])
+            results: List[Dict] = [None] * len(member_entries)
+            for rows, tracker in zip(rows_by_tracker.values(), saved_trackers):
+                final_tracker = tracker
+                triggered = False
+                error = None
+                if tracker is None:
+                    error = "Failed to save tracker"
+                else:
+                    self._refresh_pending_hours(tracker)
+                    try:
+                        if self._should_trigger_update(tracker):
+                            updated_tracker = self._mark_in_progress(tracker)
+                            if updated_tracker:
+                                final_tracker = self._queue_or_create_draft(updated_tracker)
+                                triggered = True
+                    except Exception as e:
+                        self.logger.error("Error triggering update for tracker %s: %s", tracker['id'], e)
+                        error = str(e)
+
+                for row in rows:
+                    stored_event = stored_events[row]
+                    result = {
+                        'status': 'stored',
+                        'message': f"Event stored, total hours: {final_tracker['total_hours'] if final_tracker else None}",
+                        'event_id': stored_event['id'] if stored_event else None,
+                        'tracker_id': self._get_tracker_id(member_entries[row])
+                    }
+                    if error:
+                        result['status'] = 'error'
+                        result['message'] = error
+                    elif not stored_event:
+                        # The tracker has the row's hours; only the event write needs retrying
+                        result['status'] = 'event_not_stored'
+                        result['message'] = "Tracker updated, event not stored"
+                        result['event_id'] = event_docs[row]['id']
+                    elif triggered and row == rows[-1]:
+                        result['status'] = 'triggered'
+                        result['message'] = f"Resume update triggered. Total hours: {final_tracker['total_hours']}"
+                    results[row] = result
+
+            return results
+
+        except Exception as e:
+            self.logger.error("Error processing key member entries: %s", e)
             raise
 
+    @tracing.traced()
     def _get_resume(self, employee_id: str) -> Dict:
-        """Get the resume for the given employee ID."""
-        print("Getting resume for employee_id: ", employee_id)
-        print(f"Querying {self.search_client_resumes._index_name} for employee_id: ", employee_id)
-        results = self.search_client_resumes.search(
-            search_text="*",
-            filter="employee_id eq '" + employee_id + "'",
-            select="id,jobTitle,experienceLevel,content,sourceFileName,employee_id"
-        )
+        """
+        Get the resume for the given employee ID.
+
+        Served from the current request scope or the process resume cache when possible; a cached
+        resume older than the revalidation window is checked against the index `date` first.
+        Callers get their own copy and may modify it.
+        """
+        found, resume = self.resume_cache.get_memo(employee_id)
+        if found:
+            return resume
+
+        cached = self.resume_cache.get(employee_id)
+        if cached is not None and not cached.fresh:
+            current = self._query_resume(employee_id, select="id,date")
+            if current and current.get('date') == cached.version:
+                self.resume_cache.confirm(employee_id)
+                cached = cached._replace(fresh=True)
+        if cached is not None and cached.fresh:
+            resume = cached.value
+        else:
+            resume = self._query_resume(employee_id, select=RESUME_FIELDS)
+            if resume:
+                self.resume_cache.put(employee_id, resume.get('date'), dict(resume), stale=cached is not None)
+
+        self.resume_cache.set_memo(employee_id, resume)
+        return dict(resume)
+
+    def _query_resume(self, employee_id: str, select: str) -> Dict:
+        """Query the resumes index for an employee's resume document."""
+        log_sampled(self.logger, logging.DEBUG, "Querying %s for employee_id %s", self.search_client_resumes._index_name, employee_id)
+        with tracing.span("search.query", attributes={"search.index": self.search_client_resumes._index_name}) as span:
+            results = self.search_client_resumes.search(
+                search_text="*",
+                filter=eq_filter("employee_id", employee_id),
+                select=select
+            )
 
-  
-        for result in results:
-            #check if sourceFileName contains employee_id
-            #print sourceFileName
-            print("SourceFileName: ", result["sourceFileName"])
-            return result
+      
+            for result in results:
+                span.set_attribute("payload.response_bytes", tracing.payload_size(result))
+                return result
         return {}  # added fallback return statement if no results
     
-    def _get_project(self, project_number: str) -> Dict:
-        search_results = self.search_client_projects.search(
-            search_text="*",
-            filter="project_number eq '" + project_number + "'",
-            select="id, project_number, content, sourcefilename, sourcepage"
-        )
-        
-        sorted_results = sorted(search_results, key=lambda x: x['sourcepage'])
+    @tracing.traced()
+    def _get_resumes(self, employee_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get the resumes of many employees. Resumes fresh in the process cache are used as is;
+        the rest are fetched with one search.in query per chunk of ids and cached.
+
+        Returns:
+            Dict mapping employee_id to a copy of its resume; employees without one are omitted
+        """
+        resumes = {}
+        to_fetch = []
+        for employee_id in dict.fromkeys(employee_ids):
+            cached = self.resume_cache.get(employee_id)
+            if cached is not None and cached.fresh:
+                resumes[employee_id] = cached.value
+            else:
+                to_fetch.append(employee_id)
+
+        if to_fetch:
+            fetched = search_by_keys(self.search_client_resumes, "employee_id", to_fetch, select=RESUME_FIELDS)
+            for employee_id, documents in fetched.items():
+                self.resume_cache.put(employee_id, documents[0].get('date'), dict(documents[0]))
+                resumes[employee_id] = dict(documents[0])
+        return resumes
+
+    @tracing.traced()
+    def _get_project_descriptions(self, project_numbers: List[str]) -> Dict[str, str]:
+        """
+        Get the full descriptions of many projects, like _get_project_description. Projects not
+        fresh in the process cache are fetched with one search.in query per chunk of numbers.
+
+        Returns:
+            Dict mapping project_number to its description; projects not indexed are omitted
+        """
+        descriptions = {}
+        to_fetch = []
+        for project_number in dict.fromkeys(project_numbers):
+            cached = self.project_cache.get(project_number)
+            if cached is not None and cached.fresh:
+                descriptions[project_number] = cached.value
+            else:
+                to_fetch.append(project_number)
+
+        if to_fetch:
+            # A project has several chunks, so fewer keys per query keep each chunk to one page
+            try:
+                fetched = search_by_keys(self.search_client_projects, "project_number", to_fetch,
+                                         select=PROJECT_FIELDS, keys_per_query=PROJECTS_PER_QUERY,
+                                         order_by=self.project_order_by)
+            except HttpResponseError as e:
+                if not self.project_order_by or e.status_code != 400:
+                    raise
+                # An index created before the fields were sortable rejects the sort. Unsorted
+                # chunks are split until each fits in one page, so the lookup stays batched.
+                self.logger.warning("Project index rejected sorting by %s, batching project lookups without it; "
+                                    "recreate the index with scripts/project-indexing.py to restore it: %s",
+                                    self.project_order_by, e)
+                self.project_order_by = None
+                fetched = search_by_keys(self.search_client_projects, "project_number", to_fetch,
+                                         select=PROJECT_FIELDS, keys_per_query=PROJECTS_PER_QUERY)
+            for project_number, chunks in fetched.items():
+                chunks.sort(key=lambda chunk: chunk['sourcepage'])
+                description = "".join(chunk["content"] for chunk in chunks)
+                self.project_cache.put(project_number, self._project_version(chunks), description)
+                descriptions[project_number] = description
+        return descriptions
+
+    def prefetch_search_documents(self, trackers: List[Dict]) -> None:
+        """
+        Load the resumes and project descriptions a batch of trackers needs into the process
+        caches with a few bulk queries, so generating their drafts does no per-tracker lookups.
+        """
+        if not trackers:
+            return
+        try:
+            self._get_resumes([tracker['employee_id'] for tracker in trackers])
+            self._get_project_descriptions([tracker['project_number'] for tracker in trackers])
+        except Exception as e:
+            # Only an optimization: each draft falls back to its own lookups
+            self.logger.warning("Prefetching search documents failed: %s", e)
+
+    @tracing.traced()
+    def _get_project(self, project_number: str, select: str = PROJECT_FIELDS) -> List[Dict]:
+        """Get a project's indexed chunks, in page order."""
+        with tracing.span("search.query", attributes={"search.index": self.search_client_projects._index_name}) as span:
+            search_results = self.search_client_projects.search(
+                search_text="*",
+                filter=eq_filter("project_number", project_number),
+                select=select
+            )
+            
+            sorted_results = sorted(search_results, key=lambda x: x['sourcepage'])
+            span.set_attribute("payload.response_bytes", tracing.payload_size(sorted_results))
         return sorted_results
 
-    def _generate_project_experience(self, project_data: Dict, role_name: str, resume: Dict) -> Dict:
+    @tracing.traced()
+    def _get_project_description(self, project_number: str) -> str:
         """
-        Generate a structured project experience using the project data and resume data.
+        Get a project's full description: the content of its indexed chunks in page order.
+
+        The assembled text is cached per request and per process. A process entry is keyed on
+        the chunks' index `date` and chunk count. Once it is older than the revalidation window,
+        those are checked with a query that selects no content before the cached text is reused.
+
+        Returns:
+            str: The description, or "" if the project is not indexed
+        """
+        found, description = self.project_cache.get_memo(project_number)
+        if found:
+            return description
+
+        with self.project_cache.key_lock(project_number):
+            cached = self.project_cache.get(project_number)
+            if cached is not None and not cached.fresh:
+                current = self._get_project(project_number, select="id, sourcepage, date")
+                if self._project_version(current) == cached.version:
+                    self.project_cache.confirm(project_number)
+                    cached = cached._replace(fresh=True)
+            if cached is not None and cached.fresh:
+                description = cached.value
+            else:
+                chunks = self._get_project(project_number)
+                description = "".join(chunk["content"] for chunk in chunks)
+                if chunks:
+                    self.project_cache.put(project_number, self._project_version(chunks), description, stale=cached is not None)
+
+        self.project_cache.set_memo(project_number, description)
+        return description
+
+    @staticmethod
+    def _project_version(chunks: List[Dict]) -> tuple:
+        """Version of an indexed project: re-indexing changes the chunk dates or count."""
+        return len(chunks), max((chunk.get('date') or "" for chunk in chunks), default="")
+
+    @tracing.traced()
+    def _generate_project_experience(self, project_description: str, role_name: str, resume: Dict) -> Dict:
+        """
+        Generate a structured project experience using the project description and resume data.
         
         Returns:
             Dict with project_name and project_experience fields
         """
-        print("Generating project work experience...")
-
-        project_string = ""
-        for project in project_data:
-            project_string = project_string + project["content"]
+        project_string = project_description
         
         current_date = datetime.utcnow().strftime("%Y-%m-%d")
 
@@ -383,11 +677,10 @@ class ResumeUpdateProcessor:
         result = inference_structured_output_aoai(messages, aoai_deployment, ProjectExperience)
         if result:
             project_experience = ProjectExperience(**result.choices[0].message.parsed.dict())
-            print(f"Project Name: {project_experience.project_name}")
-            print(f"Work Experience: {project_experience.project_experience}")
+            self.logger.debug("Generated work experience for %s: %s", project_experience.project_name, project_experience.project_experience)
 
         else:
-            print("Failed to process structured output")
+            self.logger.error("Failed to process structured output")
 
 
         return {
@@ -396,139 +689,75 @@ class ResumeUpdateProcessor:
         }
 
     def _get_employee_email(self, employee_id: str) -> str:
-        """Get employee email from metadata container."""
+        """Get employee email from the employee metadata cache."""
         try:
-            results = self.employee_metadata_container.query_items(
-                query="SELECT * FROM c WHERE c.employee_id = @employee_id",
-                parameters=[{"name": "@employee_id", "value": employee_id}],
-                partition_key="metadata"
-            )
+            metadata = self.employee_cache.get(employee_id)
             
-            if results:
-                return results[0].get('email')
+            if metadata:
+                return metadata.get('email')
             else:
                 # For testing - return default email if no record exists
-                self.logger.warning(f"No email found for employee {employee_id}, using default")
+                self.logger.warning("No email found for employee %s, using default", employee_id)
                 return "NA"
                 
         except Exception as e:
-            self.logger.error(f"Error getting employee email: {str(e)}")
+            self.logger.error("Error getting employee email: %s", e)
             return None
 
-    def _send_notification(self, employee_id: str) -> bool:
+    def _get_employee_emails(self, employee_ids: List[str]) -> Dict[str, str]:
+        """
+        Get the emails of many employees from the employee metadata cache; misses are loaded
+        with one query per chunk of ids.
+
+        Returns:
+            Dict mapping employee_id to email; employees without a metadata record get the
+            same "NA" default as _get_employee_email
+        """
+        metadata = self.employee_cache.get_many(employee_ids)
+        emails = {}
+        for employee_id in employee_ids:
+            if employee_id in metadata:
+                emails[employee_id] = metadata[employee_id].get('email')
+            else:
+                self.logger.warning("No email found for employee %s, using default", employee_id)
+                emails[employee_id] = "NA"
+        return emails
+
+    def _build_notification_message(self, employee_email: str, kind: str = "reminder") -> Dict[str, Any]:
+        """Build a notification email of the given kind (see notification_templates.KINDS) for one recipient."""
+        return notification_templates.build_message(kind, employee_email, review_link=f"{self.webapp_url}/resume-review")
+
+    @tracing.traced()
+    def _send_notification(self, employee_id: str, employee_email: Optional[str] = None, kind: str = "reminder") -> bool:
         try:
-            employee_email = self._get_employee_email(employee_id)
+            if employee_email is None:
+                employee_email = self._get_employee_email(employee_id)
             if not employee_email:
-                self.logger.error(f"Could not send notification - no email found for employee {employee_id}")
+                self.logger.error("Could not send notification - no email found for employee %s", employee_id)
                 return False
 
-            review_link = f"{self.webapp_url}/resume-review"
-
-            message = {
-                "senderAddress": "DoNotReply@5fec6054-f6e1-4926-9c37-029ca719c8ae.azurecomm.net",
-                "recipients": {
-                    "to": [{"address": employee_email}]
-                },
-                "content": {
-                    "subject": "Resume Update Required",
-                    "plainText": (
-                        "Hello,\n\n"
-                        "You have a pending resume update that requires your review. Please take a moment to review and approve these updates to keep your resume current.\n\n"
-                        f"Review your updates here: {review_link}\n\n"
-                        "This is an automated message. Please do not reply to this email."
-                    ),
-                    "html": f"""
-                    <html>
-                        <head>
-                            <style>
-                                body {{
-                                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Arial, sans-serif;
-                                    line-height: 1.6;
-                                    margin: 0;
-                                    padding: 0;
-                                    background-color: #ffffff;
-                                }}
-                                .container {{
-                                    max-width: 600px;
-                                    margin: 0 auto;
-                                    background: #ffffff;
-                                }}
-                                .header {{
-                                    background-color: #003087;
-                                    padding: 20px;
-                                    text-align: left;
-                                }}
-                                .header h1 {{
-                                    margin: 0;
-                                    color: #ffffff;
-                                    font-size: 20px;
-                                    font-weight: 500;
-                                }}
-                                .content {{
-                                    padding: 40px 20px;
-                                    color: #333333;
-                                }}
-                                .button {{
-                                    display: inline-block;
-                                    background-color: #7AC143;
-                                    color: #ffffff;
-                                    padding: 10px 24px;
-                                    text-decoration: none;
-                                    border-radius: 4px;
-                                    font-weight: 500;
-                                    margin-top: 20px;
-                                }}
-                                .footer {{
-                                    padding: 20px;
-                                    color: #666666;
-                                    font-size: 14px;
-                                    border-top: 1px solid #eeeeee;
-                                }}
-                            </style>
-                        </head>
-                        <body>
-                            <div class="container">
-                                <div class="header">
-                                    <h1>📄 Resume Update Review Required</h1>
-                                </div>
-                                <div class="content">
-                                    <p>Hello,</p>
-                                    <p>You have a pending resume update that requires your review. Please take a moment to review and approve these updates to keep your resume current.</p>
-                                    <a href="{review_link}" class="button">Review Updates Now</a>
-                                </div>
-                                <div class="footer">
-                                    This is an automated message. Please do not reply to this email.
-                                </div>
-                            </div>
-                        </body>
-                    </html>"""
-                }
-            }
+            message = self._build_notification_message(employee_email, kind)
 
-            poller = self.email_client.begin_send(message)
-            result = poller.result()
-            self.logger.info(f"Email sent to {employee_email}: {result}")
+            with tracing.span("email.send", attributes={"payload.request_bytes": tracing.payload_size(message)}):
+                poller = self.email_client.begin_send(message)
+                result = poller.result()
+            log_sampled(self.logger, logging.INFO, "Email sent to employee %s: %s", employee_id, result)
             return True
 
         except Exception as e:
-            self.logger.error(f"Error sending email notification: {str(e)}")
+            self.logger.error("Error sending email notification: %s", e)
             return False
 
     def _update_notification_record(self, employee_id: str) -> Dict:
         """Update notification record with latest notification time or create it if it doesn't exist."""
         try:
             notification_id = f"notification-{employee_id}"
-            partition_key = "notifications"
+            partition_key = self.partition_router.partition_key("notifications", employee_id)
             
             # Check if the notification record exists
-            existing_notifications = self.notification_container.query_items(
-                query="SELECT * FROM c WHERE c.id = @id",
-                parameters=[{"name": "@id", "value": notification_id}],
-                partition_key=partition_key
-            )
+            notification = self.partition_router.read_item(self.notification_container, notification_id, employee_id)
             
-            if existing_notifications:
-                notification = existing_notifications[0]
+            if notification:
                 notification['last_notification'] = datetime.utcnow().isoformat()
                 return self.notification_container.update_item(notification)
             else:
@@ -542,12 +771,61 @@ class ResumeUpdateProcessor:
                 return self.notification_container.create_item(notification)
 
         except Exception as e:
-            self.logger.error(f"Error updating notification record: {str(e)}")
+            self.logger.error("Error updating notification record: %s", e)
             raise
+
+    def _get_notification_records(self, employee_ids: List[str]) -> Dict[str, Dict]:
+        """Load the notification records of many employees with one query per chunk of ids."""
+        records = self.partition_router.query_items_for_employees(self.notification_container, employee_ids)
+        notification_records = {}
+        for employee_id, items in records.items():
+            for item in items:
+                if item['id'] == f"notification-{employee_id}":
+                    notification_records[employee_id] = item
+        return notification_records
+
+    def _update_notification_records(self, employee_ids: List[str], records: Dict[str, Dict]) -> List[str]:
+        """
+        Set last_notification for many employees with batched upserts, one transactional batch
+        per partition. Records still in their legacy partition are written to the employee
+        partition and the legacy copy is removed.
+
+        Args:
+            employee_ids: Employees that were just notified
+            records: Their existing notification records, from _get_notification_records
+
+        Returns:
+            List[str]: Employee ids whose record could not be written
+        """
+        now = datetime.utcnow().isoformat()
+        items = []
+        for employee_id in employee_ids:
+            record = records.get(employee_id)
+            item = strip_system_fields(record) if record else {"id": f"notification-{employee_id}", "employee_id": employee_id}
+            item['partitionKey'] = self.partition_router.partition_key("notifications", employee_id)
+            item['last_notification'] = now
+            items.append(item)
+
+        written = self.notification_container.upsert_items(items)
+        failed = []
+        for employee_id, item, result in zip(employee_ids, items, written):
+            if result is None:
+                failed.append(employee_id)
+                continue
+            record = records.get(employee_id)
+            if record and record['partitionKey'] != item['partitionKey']:
+                self.notification_container.delete_item(record['id'], record['partitionKey'])
+        if failed:
+            self.logger.error("Failed to update notification records for %d employees: %s", len(failed), failed)
+        return failed
         
+    @tracing.traced()
     def _is_project_on_resume(self, employee_id: str, project_number: str) -> bool:
         """
-        Check if a project is already included in the resume using LLM analysis.
+        Check if a project is already included in the resume.
+
+        The embedding pre-screen (project_screening.py) answers clear cases; only scores in its
+        ambiguous band, or every check in shadow mode, are sent to the LLM.
         
         Args:
             employee_id: ID of the employee
@@ -560,123 +838,204 @@ class ResumeUpdateProcessor:
             # Get resume
             resume = self._get_resume(employee_id)
             if not resume:
-                self.logger.warning(f"No resume found for employee {employee_id}")
+                self.logger.warning("No resume found for employee %s", employee_id)
                 return False
                 
             # Get project description
-            project_data = self._get_project(project_number)
-            if not project_data:
-                self.logger.warning(f"No project data found for project {project_number}")
+            project_string = self._get_project_description(project_number)
+            if not project_string:
+                self.logger.warning("No project data found for project %s", project_number)
                 return False
-                
-            # Concatenate project content like in _generate_project_experience
-            project_string = ""
-            for project in project_data:
-                project_string = project_string + project["content"]
-            
-            # Prepare system prompt
-            system_prompt = """You are an expert resume analyst. Your task is to determine if a specific project is already mentioned 
-            in a resume. Analyze the content carefully and consider that the same project might be described using different words or 
-            phrases. Look for matching:
-            - Project descriptions
-            - Key responsibilities
-            - Technologies used
-            - Time periods
-            - Project outcomes
-            
-            Respond with only "yes" if you are confident the project is already included in the resume, or "no" if it is not included 
-            or if you are unsure. Do not provide any other explanation or commentary."""
-            
-            # Prepare user message
-            user_message = f"""Please analyze if this project is already included in the resume:
 
-            RESUME CONTENT:
-            {resume.get('content', '')}
-            
-            PROJECT DESCRIPTION:
-            {project_string}
-            
-            Is this project already included in the resume? Answer only 'yes' or 'no'."""
-            
-            # Prepare messages for LLM
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ]
-            
-            
-            # Call LLM
-            response = primary_llm.invoke(messages)
-            
-            # Extract answer and convert to boolean
-            answer = response.content.strip().lower()
-            print(f"Is project on resume?: {answer}")
-            self.logger.info(f"LLM response for project inclusion check: {answer}")
+            resume_content = resume.get('content', '')
+            screen = self.project_screen.screen(resume_content, project_string)
+            if self.project_screen.decides(screen):
+                answer = screen.decision
+                self.logger.info("Pre-screen answered project inclusion check: %s (score %.3f)", answer, screen.score,
+                                 extra=fields(employee_id=employee_id, project_number=project_number))
+            else:
+                answer = self._ask_llm_project_on_resume(resume_content, project_string)
+                self.logger.info("LLM response for project inclusion check: %s", answer,
+                                 extra=fields(employee_id=employee_id, project_number=project_number,
+                                              prescreen_score=round(screen.score, 4) if screen else None,
+                                              prescreen_decision=screen.decision if screen else None))
             
             #if answer == "yes", update tracker with added_to_resume = 'yes'
             if answer == "yes":
                 #update tracker
                 tracker_id = f"{project_number}-{employee_id}"
-                tracker = self.trackers_container.query_items(
-                    query="SELECT * FROM c WHERE c.id = @id",
-                    parameters=[{"name": "@id", "value": tracker_id}],
-                    partition_key="resumeupdatestatus"
-                )
-                if tracker:
-                    tracker[0]['added_to_resume'] = 'yes'
-                    tracker[0]['last_updated'] = datetime.utcnow().isoformat()
-                    tracker[0]['version'] += 1
-                    self.trackers_container.update_item(tracker[0])
-                    print("Tracker updated with added_to_resume='yes'")
+                if self._transition_tracker(tracker_id, employee_id, from_status='no', to_status='yes'):
+                    self.logger.info("Tracker %s updated with added_to_resume='yes'", tracker_id)
             
             return answer == "yes"
             
         except Exception as e:
-            self.logger.error(f"Error checking if project is on resume: {str(e)}")
+            self.logger.error("Error checking if project is on resume: %s", e)
             return False
 
+    @cached_property
+    def project_screen(self) -> ProjectScreen:
+        return get_project_screen(primary_embedding_llm)
+
+    @cached_property
+    def llm_cache(self) -> LLMResponseCache:
+        # Responses to temperature-0 prompts, shared by every processor in the process
+        return get_llm_cache()
+
+    def _ask_llm_project_on_resume(self, resume_content: str, project_string: str) -> str:
+        """
+        Ask the LLM whether a project is already described in the resume.
+
+        Returns:
+            str: The LLM's answer, lower-cased; "yes" or "no"
+        """
+        # Prepare system prompt
+        system_prompt = """You are an expert resume analyst. Your task is to determine if a specific project is already mentioned 
+        in a resume. Analyze the content carefully and consider that the same project might be described using different words or 
+        phrases. Look for matching:
+        - Project descriptions
+        - Key responsibilities
+        - Technologies used
+        - Time periods
+        - Project outcomes
+        
+        Respond with only "yes" if you are confident the project is already included in the resume, or "no" if it is not included 
+        or if you are unsure. Do not provide any other explanation or commentary."""
+        
+        # Prepare user message
+        user_message = f"""Please analyze if this project is already included in the resume:
+
+        RESUME CONTENT:
+        {resume_content}
+        
+        PROJECT DESCRIPTION:
+        {project_string}
+        
+        Is this project already included in the resume? Answer only 'yes' or 'no'."""
+        
+        # Prepare messages for LLM
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ]
+        
+        # Call LLM
+        response = invoke_llm(primary_llm, messages)
+        return response.content.strip().lower()
+
+    def _queue_or_create_draft(self, tracker: Dict) -> Dict:
+        """Generate the draft now in inline mode; in worker mode the change feed delivers it to draft_worker.py."""
+        if self.draft_generation_mode == "inline":
+            return self._trigger_draft_creation(tracker)
+        return tracker
+
+    def needs_draft(self, tracker: Dict) -> bool:
+        """Whether a tracker is waiting for its draft to be generated."""
+        return (
+            tracker.get('type') == 'resume_update_tracker'
+            and tracker.get('added_to_resume') == 'in_progress'
+            and tracker.get('draft_status') == 'pending'
+        )
+
+    @search_cache.scoped
+    def generate_draft(self, tracker: Dict) -> Optional[Dict]:
+        """
+        Generate the draft for a tracker delivered by the change feed.
+
+        Returns:
+            Dict: The updated tracker, or None if it no longer needs a draft (already drafted,
+            approved or discarded since the change was recorded)
+        """
+        current = self._read_tracker(tracker['id'], tracker['employee_id'])
+        if not current or not self.needs_draft(current):
+            return None
+        return self._trigger_draft_creation(current)
+
+    def mark_draft_failed(self, tracker: Dict, error: str) -> Optional[Dict]:
+        """
+        Record that draft generation gave up on a tracker. The change feed does not deliver it
+        again; requeue_failed_drafts() (draft_worker.py --requeue-failed) retries it.
+        """
+        try:
+            return self._patch_tracker(tracker['id'], tracker['employee_id'], [
+                {"op": "set", "path": "/draft_status", "value": "failed"},
+                {"op": "set", "path": "/draft_error", "value": error}
+            ], filter_predicate="FROM c WHERE c.draft_status = 'pending'")
+        except PreconditionFailedError:
+            return None
+
+    def requeue_failed_drafts(self) -> int:
+        """
+        Set every failed draft back to 'pending', so the change feed delivers it to the draft
+        worker again.
+
+        Returns:
+            int: Number of trackers requeued
+        """
+        failed_trackers = self.trackers_container.query_items(
+            query="SELECT * FROM c WHERE c.type = 'resume_update_tracker' AND c.draft_status = 'failed'"
+        )
+        requeued = 0
+        for tracker in failed_trackers:
+            try:
+                if self._patch_tracker(tracker['id'], tracker['employee_id'], [
+                    {"op": "set", "path": "/draft_status", "value": "pending"},
+                    {"op": "remove", "path": "/draft_error"}
+                ], filter_predicate="FROM c WHERE c.draft_status = 'failed'"):
+                    requeued += 1
+            except PreconditionFailedError:
+                # Requeued or changed by someone else in the meantime
+                continue
+        self.logger.info("Requeued %s failed drafts", requeued)
+        return requeued
+
+    @tracing.traced()
     def _trigger_draft_creation(self, tracker: Dict) -> Dict:
         """Process resume update for the given tracker."""
         try:
             # Get current resume
             resume = self._get_resume(tracker['employee_id'])
             
-            # Get project details
-            project = self._get_project(tracker['project_number'])
+            # Get project description
+            project_description = self._get_project_description(tracker['project_number'])
             
             # Get current role from tracker's role history
             current_role = tracker['role_history'][-1]['role_name']
             
             # Generate project experience with structured output
             generated_content = self._generate_project_experience(
-                project_data=project,
+                project_description=project_description,
                 role_name=current_role,
                 resume=resume
             )
             
-            # Update tracker with the generated content
-            tracker['project_name'] = generated_content['project_name']
-            tracker['description'] = generated_content['project_experience']
-            tracker['last_updated'] = datetime.utcnow().isoformat()
-            tracker['version'] += 1
-            
-            # Save the updated tracker
-            updated_tracker = self.trackers_container.update_item(tracker)
+            # Update tracker with the generated content. Only the first writer completes the
+            # draft; a duplicate delivery of the same change must not notify twice.
+            try:
+                updated_tracker = self._patch_tracker(tracker['id'], tracker['employee_id'], [
+                    {"op": "set", "path": "/project_name", "value": generated_content['project_name']},
+                    {"op": "set", "path": "/description", "value": generated_content['project_experience']},
+                    {"op": "set", "path": "/draft_status", "value": "ready"}
+                ], filter_predicate="FROM c WHERE c.draft_status = 'pending'")
+            except PreconditionFailedError:
+                self.logger.info("Draft for tracker %s was already completed", tracker['id'])
+                return self._read_tracker(tracker['id'], tracker['employee_id'])
+            self._record_pending(updated_tracker)
 
             # Check notification cooldown before sending notification
             if self._should_send_notification(tracker['employee_id']):
-                if self._send_notification(tracker['employee_id']):
-                    print("Notification sent successfully")
+                if self._send_notification(tracker['employee_id'], kind="first_notice"):
+                    self.logger.info("Notification sent to employee %s", tracker['employee_id'])
                     self._update_notification_record(tracker['employee_id'])
                 else:
-                    print("Failed to send notification")
+                    self.logger.warning("Failed to send notification to employee %s", tracker['employee_id'])
             else:
-                print(f"Skipping notification for employee {tracker['employee_id']} due to cooldown period")
+                self.logger.info("Skipping notification for employee %s due to cooldown period", tracker['employee_id'])
             
             return updated_tracker
             
         except Exception as e:
-            self.logger.error(f"Error in trigger_draft_creation: {str(e)}")
+            self.logger.error("Error in trigger_draft_creation: %s", e)
             raise
         
     def _should_trigger_update(self, tracker: Dict) -> bool:
@@ -685,14 +1044,13 @@ class ResumeUpdateProcessor:
         Returns True if hours >= 40 and status is 'no'
         """
         #check if total_hours >=40 and added_to_resume == 'no'
-        print("Checking if we should trigger update...")
         if tracker['total_hours'] >= 40 and tracker['added_to_resume'] == 'no':
             # Extract employee_id and project_number from the tracker
             employee_id = tracker['employee_id']
             project_number = tracker['project_number']
             
 
-            print("Hours > 40 and added_to_resume='no'. Checking if project is on resume...")
+            self.logger.debug("Tracker %s reached %s hours; checking if project is on resume", tracker['id'], tracker['total_hours'])
             # Run _is_project_on_resume() to check if the project is on the resume
             if self._is_project_on_resume(employee_id, project_number):
                 #Set added_to_resume to 'yes' and return False
@@ -704,13 +1062,32 @@ class ResumeUpdateProcessor:
 
         return False  
 
-    def _store_event(self, member_entry: Dict) -> Dict:
-        """Store the key member entry in the events container."""
+    def _get_employee_id(self, member_entry: Dict) -> str:
+        """Extract employee ID from display name (e.g., "Diaz, John - 18117" -> "18117")."""
+        return member_entry['employee_display_name'].split(' - ')[1]
+
+    def _get_tracker_id(self, member_entry: Dict) -> str:
+        """Build the compound tracker ID (<project_number>-<employee_id>) for an entry."""
+        return f"{member_entry['project_number']}-{self._get_employee_id(member_entry)}"
+
+    def _tracker_partition_key(self, employee_id: str) -> str:
+        return self.partition_router.partition_key("resume_trackers", employee_id)
+
+    def _read_tracker(self, tracker_id: str, employee_id: str) -> Optional[Dict]:
+        """Point-read a tracker from its partition, moving it out of the legacy partition if needed."""
+        return self.partition_router.read_item(self.trackers_container, tracker_id, employee_id)
+
+    def _build_event(self, member_entry: Dict) -> Dict:
+        """
+        Build the event document for a key member entry. Entries from event_loader.py carry an
+        event_id derived from their position in the export, so a replayed row overwrites its
+        event instead of adding a second one; other entries get a random id.
+        """
         # Extract employee ID from display name (e.g., "Diaz, John - 18117" -> "18117")
         employee_id = member_entry['employee_display_name'].split(' - ')[1]
         
-        event_doc = {
-            "id": str(uuid.uuid4()),
+        return {
+            "id": member_entry.get('event_id') or str(uuid.uuid4()),
             "partitionKey": member_entry['project_number'],  # Use project number as partition key
             "type": "project_key_member",
             "subject_area": member_entry['subject_area'],
@@ -722,69 +1099,254 @@ class ResumeUpdateProcessor:
             "employee_job_family_function_code": member_entry['employee_job_family_function_code'],
             "timestamp": datetime.utcnow().isoformat()
         }
-        print(f'Storing event for Employee_id={employee_id} and project_number={member_entry["project_number"]}')
-        return self.events_container.create_item(event_doc)
 
-    def _get_or_create_tracker(self, member_entry: Dict) -> Dict:
-        """Get or create tracker in the trackers container."""
+    def _store_event(self, member_entry: Dict) -> Dict:
+        """Store the key member entry in the events container."""
+        event_doc = self._build_event(member_entry)
+        log_sampled(self.logger, logging.DEBUG, "Storing event for employee_id=%s and project_number=%s", event_doc["employee_id"], member_entry["project_number"])
+        return self.events_container.upsert_item(event_doc)
+
+    def _new_tracker(self, member_entry: Dict) -> Dict:
+        """Build a new tracker document for a key member entry."""
         # Extract employee ID from display name
         employee_id = member_entry['employee_display_name'].split(' - ')[1]
-        
-        # Create compound ID from project and employee
-        tracker_id = f"{member_entry['project_number']}-{employee_id}"
-        
-        try:
-            # Try to get existing tracker directly by ID
-            tracker = self.trackers_container.query_items(
-                query="SELECT * FROM c WHERE c.id = @id",
-                parameters=[{"name": "@id", "value": tracker_id}],
-                partition_key="resumeupdatestatus"
+
+        return {
+            "id": self._get_tracker_id(member_entry),
+            "partitionKey": self._tracker_partition_key(employee_id),
+            "type": "resume_update_tracker",
+            "employee_id": employee_id,
+            "employee_display_name": member_entry['employee_display_name'],
+            "project_number": member_entry['project_number'],
+            "subject_area": member_entry['subject_area'],
+            "total_hours": member_entry['job_hours'],
+            "added_to_resume": "no",
+            "project_name": "",  # Added new field
+            "description": "",
+            "created_timestamp": datetime.utcnow().isoformat(),
+            "last_updated": datetime.utcnow().isoformat(),
+            "version": 1,
+            "role_history": [
+                {
+                    "role_name": member_entry['project_role_name'],
+                    "job_family_code": member_entry['employee_job_family_function_code'],
+                    "start_date": datetime.utcnow().isoformat(),
+                    "end_date": None
+                }
+            ],
+            "review_date": (datetime.utcnow() + timedelta(days=30)).isoformat()
+        }
+
+    def _get_trackers(self, tracker_ids: List[str]) -> Dict[str, Dict]:
+        """Load existing trackers by ID with one cross-partition query per chunk of IDs."""
+        trackers = {}
+        chunk_size = 1000
+        for start in range(0, len(tracker_ids), chunk_size):
+            results = self.trackers_container.query_items(
+                query="SELECT * FROM c WHERE ARRAY_CONTAINS(@ids, c.id) AND c.type = 'resume_update_tracker'",
+                parameters=[{"name": "@ids", "value": tracker_ids[start:start + chunk_size]}]
             )
-            
-            if tracker:
-                existing_tracker = tracker[0]
-                # Update with latest hours - no need to sum up events anymore
-                existing_tracker['total_hours'] = member_entry['job_hours']
-                existing_tracker['last_updated'] = datetime.utcnow().isoformat()
-                existing_tracker['version'] += 1
-                
-                # Update role history if needed
-                self._update_role_history(existing_tracker, member_entry)
-                
-                return self.trackers_container.update_item(existing_tracker)
-            
-            # Create new tracker if not found
-            new_tracker = {
-                "id": tracker_id,
-                "partitionKey": "resumeupdatestatus",
-                "type": "resume_update_tracker",
-                "employee_id": employee_id,
-                "employee_display_name": member_entry['employee_display_name'],
-                "project_number": member_entry['project_number'],
-                "subject_area": member_entry['subject_area'],
-                "total_hours": member_entry['job_hours'],
-                "added_to_resume": "no",
-                "project_name": "",  # Added new field
-                "description": "",
-                "created_timestamp": datetime.utcnow().isoformat(),
-                "last_updated": datetime.utcnow().isoformat(),
-                "version": 1,
-                "role_history": [
-                    {
-                        "role_name": member_entry['project_role_name'],
-                        "job_family_code": member_entry['employee_job_family_function_code'],
-                        "start_date": datetime.utcnow().isoformat(),
-                        "end_date": None
-                    }
-                ],
-                "review_date": (datetime.utcnow() + timedelta(days=30)).isoformat()
-            }
-            return self.trackers_container.create_item(new_tracker)
+            for tracker in results:
+                expected_partition_key = self._tracker_partition_key(tracker['employee_id'])
+                if tracker['partitionKey'] != expected_partition_key:
+                    # Still in its legacy partition during the cutover window
+                    if trackers.get(tracker['id']):
+                        continue
+                    tracker = self.partition_router.promote_item(self.trackers_container, tracker, tracker['employee_id'])
+                    if tracker is None:
+                        continue
+                trackers[tracker['id']] = tracker
+        return trackers
+
+    def _get_or_create_tracker(self, member_entry: Dict) -> Dict:
+        """Get or create tracker in the trackers container."""
+        try:
+            return self._apply_entries_with_retry([member_entry])
             
         except Exception as e:
-            self.logger.error(f"Error in get_or_create_tracker: {str(e)}")
+            self.logger.error("Error in get_or_create_tracker: %s", e)
             raise
 
+    def _apply_entries_to_tracker(self, tracker: Dict, member_entries: List[Dict]) -> None:
+        """Apply role changes from each entry in order, then the latest entry's hours."""
+        for member_entry in member_entries:
+            # Update role history if needed
+            self._update_role_history(tracker, member_entry)
+        # Update with latest hours - no need to sum up events anymore
+        tracker['total_hours'] = member_entries[-1]['job_hours']
+
+    def _entry_patch_operations(self, tracker: Dict, member_entries: List[Dict]) -> List[Dict]:
+        """Build the patch operations that apply entries' role changes and latest hours to a tracker."""
+        preview = copy.deepcopy(tracker)
+        self._apply_entries_to_tracker(preview, member_entries)
+
+        operations = [{"op": "set", "path": "/total_hours", "value": preview['total_hours']}]
+        original_length = len(tracker['role_history'])
+        for index in range(original_length):
+            if preview['role_history'][index]['end_date'] != tracker['role_history'][index]['end_date']:
+                operations.append({"op": "set", "path": f"/role_history/{index}/end_date", "value": preview['role_history'][index]['end_date']})
+        for role in preview['role_history'][original_length:]:
+            operations.append({"op": "add", "path": "/role_history/-", "value": role})
+        return operations
+
+    def _apply_entries_with_retry(self, member_entries: List[Dict]) -> Dict:
+        """
+        Apply entries for a single tracker, creating the tracker if it does not exist.
+
+        Hours are patched server-side. Role changes depend on the role history that was read,
+        so those patches are conditioned on the tracker's ETag and re-applied on conflict.
+        """
+        # Create compound ID from project and employee
+        tracker_id = self._get_tracker_id(member_entries[0])
+        employee_id = self._get_employee_id(member_entries[0])
+
+        for attempt in range(self.MAX_TRACKER_CONFLICT_RETRIES + 1):
+            tracker = self._read_tracker(tracker_id, employee_id)
+
+            if tracker is None:
+                # Create new tracker if not found
+                new_tracker = self._new_tracker(member_entries[0])
+                self._apply_entries_to_tracker(new_tracker, member_entries)
+                created_tracker = self.trackers_container.create_item(new_tracker)
+                if created_tracker:
+                    return created_tracker
+                # Another writer created the tracker first; apply the entries on top of theirs
+                self._record_tracker_conflict_retry()
+                continue
+
+            operations = self._entry_patch_operations(tracker, member_entries)
+            if len(self._tracker_patch_operations(operations)) > MAX_PATCH_OPERATIONS:
+                # Too many role changes for a single patch; replace the whole document instead
+                return self._mutate_tracker(tracker_id, employee_id, lambda current: self._apply_entries_to_tracker(current, member_entries), tracker)
+
+            role_changed = len(operations) > 1
+            try:
+                updated_tracker = self._patch_tracker(tracker_id, employee_id, operations, etag=tracker['_etag'] if role_changed else None)
+            except PreconditionFailedError:
+                self._record_tracker_conflict_retry()
+                continue
+            if updated_tracker:
+                return updated_tracker
+
+        raise RuntimeError(f"Failed to create or update tracker {tracker_id} after {self.MAX_TRACKER_CONFLICT_RETRIES} retries")
+
+    def _mark_in_progress(self, tracker: Dict) -> Optional[Dict]:
+        """
+        Move a tracker from 'no' to 'in_progress'.
+        Returns None if a concurrent writer already moved it out of 'no'.
+        """
+        return self._transition_tracker(
+            tracker['id'],
+            tracker['employee_id'],
+            from_status='no',
+            to_status='in_progress',
+            extra_operations=[{"op": "set", "path": "/draft_status", "value": "pending"}]
+        )
+
+    def _tracker_patch_operations(self, operations: List[Dict]) -> List[Dict]:
+        """Append the bookkeeping every tracker write carries; version is incremented server-side."""
+        return operations + [
+            {"op": "set", "path": "/last_updated", "value": datetime.utcnow().isoformat()},
+            {"op": "incr", "path": "/version", "value": 1}
+        ]
+
+    def _patch_tracker(self, tracker_id: str, employee_id: str, operations: List[Dict], etag: Optional[str] = None,
+                       filter_predicate: Optional[str] = None) -> Optional[Dict]:
+        """
+        Patch a tracker in place instead of sending the whole document back.
+
+        Args:
+            tracker_id: ID of the tracker
+            employee_id: ID of the employee the tracker belongs to (its partition)
+            operations: Cosmos DB patch operations for the changed fields
+            etag: Optional ETag the tracker must still have
+            filter_predicate: Optional condition the tracker must still match
+
+        Returns:
+            Dict: The patched tracker, or None if it does not exist
+        """
+        operations = self._tracker_patch_operations(operations)
+        partition_key = self._tracker_partition_key(employee_id)
+        patched_tracker = self.trackers_container.patch_item(
+            tracker_id,
+            partition_key,
+            operations,
+            etag=etag,
+            filter_predicate=filter_predicate
+        )
+        if patched_tracker is None and self.partition_router.mode == "dual":
+            # The tracker may still live in its legacy partition; move it and patch again
+            if self._read_tracker(tracker_id, employee_id):
+                patched_tracker = self.trackers_container.patch_item(
+                    tracker_id,
+                    partition_key,
+                    operations,
+                    etag=etag,
+                    filter_predicate=filter_predicate
+                )
+        return patched_tracker
+
+    def _transition_tracker(self, tracker_id: str, employee_id: str, from_status: str, to_status: str,
+                            extra_operations: Optional[List[Dict]] = None) -> Optional[Dict]:
+        """
+        Atomically move a tracker's added_to_resume status from one value to another, applying
+        any extra_operations in the same write.
+        Returns None if the tracker does not exist or is no longer in from_status.
+        """
+        try:
+            return self._patch_tracker(
+                tracker_id,
+                employee_id,
+                [{"op": "set", "path": "/added_to_resume", "value": to_status}] + (extra_operations or []),
+                filter_predicate=f"FROM c WHERE c.added_to_resume = '{from_status}'"
+            )
+        except PreconditionFailedError:
+            return None
+
+    def _mutate_tracker(self, tracker_id: str, employee_id: str, mutate: Callable[[Dict], Optional[bool]], tracker: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Read-modify-write a tracker with optimistic concurrency.
+
+        The write is conditioned on the tracker's ETag. If another writer changed it in the
+        meantime (HTTP 412), the tracker is re-read and the mutation re-applied.
+
+        Args:
+            tracker_id: ID of the tracker
+            employee_id: ID of the employee the tracker belongs to (its partition)
+            mutate: Applies the change in place; returning False skips the write
+            tracker: Optional already-read copy of the tracker to try first
+
+        Returns:
+            Dict: The updated tracker, or None if it does not exist or mutate skipped the write
+        """
+        for attempt in range(self.MAX_TRACKER_CONFLICT_RETRIES + 1):
+            if tracker is None:
+                tracker = self._read_tracker(tracker_id, employee_id)
+                if tracker is None:
+                    return None
+
+            if mutate(tracker) is False:
+                return None
+            tracker['last_updated'] = datetime.utcnow().isoformat()
+            tracker['version'] += 1
+
+            try:
+                return self.trackers_container.update_item(tracker, etag=tracker.get('_etag'))
+            except PreconditionFailedError:
+                self._record_tracker_conflict_retry()
+                tracker = None
+
+        raise RuntimeError(f"Tracker {tracker_id} kept changing; gave up after {self.MAX_TRACKER_CONFLICT_RETRIES} retries")
+
+    def _record_tracker_conflict_retry(self) -> None:
+        with self._tracker_conflict_retries_lock:
+            self.tracker_conflict_retries += 1
+
+    def get_conflict_retry_count(self) -> int:
+        """Get the number of tracker writes retried because of a concurrent update."""
+        with self._tracker_conflict_retries_lock:
+            return self.tracker_conflict_retries
+
     def _update_role_history(self, tracker: Dict, member_entry: Dict):
         """Update role history if role has changed."""
         current_role = tracker['role_history'][-1]
@@ -809,28 +1371,40 @@ class ResumeUpdateProcessor:
             employee_id: Optional employee ID. If None, returns updates for all employees.
             
         Returns:
-            List[Dict]: List of pending resume update trackers
+            List[Dict]: The display fields of each pending tracker from the pending-updates
+            view, oldest first per employee
         """
-        base_query = """
-            SELECT *
-            FROM c
-            WHERE c.partitionKey = 'resumeupdatestatus'
-            AND c.added_to_resume = 'in_progress'
-        """
-        
         if employee_id:
-            query = base_query + " AND c.employee_id = @employee_id"
-            parameters = [{"name": "@employee_id", "value": employee_id}]
-        else:
-            query = base_query
-            parameters = []
+            # One point read of the employee's pending-updates summary
+            return self.pending_view.get_employee_pending(employee_id)
         
-        return self.trackers_container.query_items(
-            query=query,
-            parameters=parameters,
-            partition_key="resumeupdatestatus"
-        )
+        # A point read per index shard and per employee with pending updates
+        return self.pending_view.get_all_pending()
+
+    def _refresh_pending_hours(self, tracker: Dict) -> None:
+        """Keep the hours and role shown for a drafted, pending tracker current as new events arrive."""
+        if is_listed(tracker):
+            self._record_pending(tracker)
+
+    def _record_pending(self, tracker: Optional[Dict]) -> None:
+        """
+        Reflect a tracker write in the pending-updates view without failing the write itself. If
+        the update fails, the employee's summary is rebuilt from the trackers; if that fails too,
+        reconcile_pending_view.py repairs it.
+        """
+        if not tracker:
+            return
+        try:
+            self.pending_view.record_tracker(tracker)
+        except Exception as e:
+            self.logger.warning("Error updating pending updates view for tracker %s, rebuilding the summary: %s", tracker['id'], e)
+            try:
+                self.pending_view.refresh_employee(tracker['employee_id'])
+            except Exception as e:
+                self.logger.error("Pending updates summary for employee %s is stale until the view is reconciled: %s",
+                                  tracker['employee_id'], e)
     
+    @tracing.traced()
     def _parse_project_title_and_description(self, full_description: str) -> Dict[str, str]:
         """
         Use LLM to separate the title and description from a project description.
@@ -858,23 +1432,33 @@ class ResumeUpdateProcessor:
                 {"role": "user", "content": user_message}
             ]
             
-            result = inference_structured_output_aoai(messages, aoai_deployment, ProjectTitleAndDescription)
-            if result:
+            def parse() -> Optional[Dict[str, str]]:
+                result = inference_structured_output_aoai(messages, aoai_deployment, ProjectTitleAndDescription,
+                                                          temperature=self.PARSE_TEMPERATURE)
+                if not result:
+                    return None
                 parsed_content = ProjectTitleAndDescription(**result.choices[0].message.parsed.dict())
-                print(f"Parsed title: {parsed_content.title}")
-                print(f"Parsed description: {parsed_content.description}")
                 return {
                     "title": parsed_content.title,
                     "description": parsed_content.description
                 }
+
+            # Deterministic, so a re-saved description is answered from the cache
+            parsed = self.llm_cache.cached(aoai_deployment, ProjectTitleAndDescription.__name__, messages,
+                                           temperature=self.PARSE_TEMPERATURE, compute=parse)
+            if parsed:
+                self.logger.debug("Parsed title: %s", parsed["title"])
+                return parsed
             else:
                 self.logger.error("Failed to parse project content")
                 return None
 
         except Exception as e:
-            self.logger.error(f"Error parsing project title and description: {str(e)}")
+            self.logger.error("Error parsing project title and description: %s", e)
             return None
 
+    @tracing.traced()
+    @search_cache.scoped
     def save_updates(self, employee_id: str, projects: List[Dict]) -> bool:
         """
         Save multiple resume updates by updating their status and modifying the resume document.
@@ -888,77 +1472,75 @@ class ResumeUpdateProcessor:
             bool: True if all updates were saved successfully, False otherwise
         """
         try:
-            self.logger.info(f"Saving updates for employee {employee_id}, projects: {projects}")
+            self.logger.info("Saving updates for employee %s, %d projects", employee_id, len(projects),
+                             extra=fields(project_numbers=[project['project_number'] for project in projects]))
             
             # Get the employee's current resume
             resume = self._get_resume(employee_id)
             if not resume:
-                self.logger.error(f"No resume found for employee {employee_id}")
+                self.logger.error("No resume found for employee %s", employee_id)
                 return False
             
             resume_name = resume.get('sourceFileName')
-            print(f"Resume name: {resume_name}")
             if not resume_name:
-                self.logger.error(f"No resume filename found for employee {employee_id}")
+                self.logger.error("No resume filename found for employee %s", employee_id)
                 return False
 
-            # Download and prepare resume document once
-            doc = self._get_resume_document(resume_name)
-            if not doc:
-                self.logger.error(f"Failed to download resume document: {resume_name}")
-                return False
+            def prepare(project: Dict):
+                """Parse a project's title and description and read its tracker."""
+                project_number = project['project_number']
+                parsed_content = self._parse_project_title_and_description(project['description'])
+                if not parsed_content:
+                    return project_number, None, None
+                return project_number, parsed_content, self._read_tracker(f"{project_number}-{employee_id}", employee_id)
+
+            # Every project is parsed concurrently, and the document download and insertion
+            # analysis run meanwhile, so a save costs about one model round trip whatever the
+            # number of projects. The document is still edited in the submitted order.
+            workers = max(1, min(self.SAVE_UPDATES_MAX_CONCURRENCY, len(projects)))
+            executor = ThreadPoolExecutor(max_workers=workers)
+            prepared = [executor.submit(tracing.propagate(prepare), project) for project in projects]
+            try:
+                # Download and prepare resume document once
+                doc = self._get_resume_document(resume_name)
+                if not doc:
+                    self.logger.error("Failed to download resume document: %s", resume_name)
+                    return False
 
-            # Find insertion point once
-            insert_phrase = self._find_insert_position(doc)
-            if not insert_phrase:
-                self.logger.error("Failed to find insertion point in resume")
-                return False
+                # Find insertion point once
+                insert_phrase = self._find_insert_position(doc)
+                if not insert_phrase:
+                    self.logger.error("Failed to find insertion point in resume")
+                    return False
 
-            # Collect trackers to update
-            trackers_to_update = []
+                # Collect trackers to update
+                trackers_to_update = []
 
-            # Process each project update
-            for project in projects:
-                try:
-                    project_number = project['project_number']
-                    description = project['description']
-                    
-                    # Parse the title and description
-                    parsed_content = self._parse_project_title_and_description(description)
-                    if not parsed_content:
-                        self.logger.error(f"Failed to parse content for project {project_number}")
-                        return False
+                # Apply each project update in order
+                for project, future in zip(projects, prepared):
+                    try:
+                        project_number, parsed_content, tracker = future.result()
+                        if not parsed_content:
+                            self.logger.error("Failed to parse content for project %s", project_number)
+                            return False
 
-                    # Get tracker
-                    tracker_id = f"{project_number}-{employee_id}"
-                    results = self.trackers_container.query_items(
-                        query="SELECT * FROM c WHERE c.id = @id",
-                        parameters=[{"name": "@id", "value": tracker_id}],
-                        partition_key="resumeupdatestatus"
-                    )
-                    
-                    results_list = list(results)
-                    if not results_list:
-                        self.logger.error(f"No tracker found with ID: {tracker_id}")
-                        continue
-                            
-                    tracker = results_list[0]
-                    
-                    # Prepare tracker update (but don't save yet)
-                    tracker['project_name'] = parsed_content['title']  # Store the parsed title
-                    tracker['description'] = parsed_content['description']  # Store the parsed description
-                    tracker['added_to_resume'] = 'yes'
-                    tracker['last_updated'] = datetime.utcnow().isoformat()
-                    tracker['version'] += 1
-                    
-                    trackers_to_update.append(tracker)
-                    
-                    # Add project to document using parsed content
-                    doc = self._save_new_project(doc, json.dumps(parsed_content), insert_phrase)
-                    
-                except Exception as e:
-                    self.logger.error(f"Error processing project {project_number}: {str(e)}")
-                    return False
+                        if not tracker:
+                            self.logger.error("No tracker found with ID: %s-%s", project_number, employee_id)
+                            continue
+
+                        # Prepare tracker update (but don't save yet)
+                        trackers_to_update.append((tracker, parsed_content))
+
+                        # Add project to document using parsed content
+                        doc = self._save_new_project(doc, json.dumps(parsed_content), insert_phrase)
+
+                    except Exception as e:
+                        self.logger.error("Error processing project %s: %s", project.get('project_number'), e)
+                        return False
+            finally:
+                # Nothing left to wait for once the save has failed: drop queued parses and
+                # return without waiting for the ones in flight
+                executor.shutdown(wait=False, cancel_futures=True)
 
             # Save updated resume once
             enhanced_docx_name = self._save_resume_document(doc, resume_name, resume)
@@ -967,83 +1549,93 @@ class ResumeUpdateProcessor:
                 return False
 
             # Only update trackers after successful document save
-            for tracker in trackers_to_update:
+            for tracker, parsed_content in trackers_to_update:
                 try:
-                    self.trackers_container.update_item(tracker)
-                    self.logger.info(f"Successfully updated tracker: {tracker['id']}")
+                    updated_tracker = self._patch_tracker(tracker['id'], employee_id, [
+                        {"op": "set", "path": "/project_name", "value": parsed_content['title']},  # Store the parsed title
+                        {"op": "set", "path": "/description", "value": parsed_content['description']},  # Store the parsed description
+                        {"op": "set", "path": "/added_to_resume", "value": "yes"}
+                    ])
+                    self._record_pending(updated_tracker)
+                    self.logger.debug("Successfully updated tracker: %s", tracker['id'])
                 except Exception as e:
-                    self.logger.error(f"Error updating tracker {tracker['id']}: {str(e)}")
+                    self.logger.error("Error updating tracker %s: %s", tracker['id'], e)
                     # Log error but continue with other trackers
                     continue
 
-            self.logger.info(f"Successfully updated resume: {enhanced_docx_name}")
+            self.logger.info("Successfully updated resume: %s", enhanced_docx_name)
             return True
                     
         except Exception as e:
-            self.logger.error(f"Error saving updates: {str(e)}")
+            self.logger.error("Error saving updates: %s", e)
             return False
             
 
 
-    def _get_resume_document(self, resume_name: str) -> Document:
+    @tracing.traced()
+    def _get_resume_document(self, resume_name: str) -> "Document":
         """Download resume document from blob storage."""
         try:
-            print("Downloading resume document...")
-            
             blob_name = f"{self.input_resumes_folder}/{resume_name}"
-            print(f"Downloading resume document: {blob_name}")
+            self.logger.debug("Downloading resume document: %s", blob_name)
             
             container_client = self.blob_service_client.get_container_client(self.resume_container_name)
             blob_client = container_client.get_blob_client(blob_name)
 
-            if not blob_client.exists():
-                self.logger.error(f"Blob {blob_name} not found in {self.resume_container_name}.")
-                return None
+            with tracing.span("blob.download", attributes={"blob.container": self.resume_container_name}) as span:
+                if not blob_client.exists():
+                    self.logger.error("Blob %s not found in %s.", blob_name, self.resume_container_name)
+                    return None
 
-            # Download and return document
-            blob_data = blob_client.download_blob().readall()
+                # Download and return document
+                blob_data = blob_client.download_blob().readall()
+                span.set_attribute("payload.response_bytes", len(blob_data))
+            from docx import Document
             return Document(BytesIO(blob_data))
 
         except Exception as e:
-            self.logger.error(f"Error downloading resume document: {str(e)}")
+            self.logger.error("Error downloading resume document: %s", e)
             return None
 
-    def _save_resume_document(self, doc: Document, resume_name: str, resume: dict) -> str:
+    @tracing.traced()
+    def _save_resume_document(self, doc: "Document", resume_name: str, resume: dict) -> str:
         """Save updated resume document to blob storage and update index."""
         try:
             resume_name_without_ext = os.path.splitext(resume_name)[0]
             enhanced_docx_name = f"{resume_name_without_ext}.docx"
 
             # Update search index
-            print("Converting document to string...")
             document_content = self._read_docx_to_string(doc)
-            print("Updating resume index...")
             self._update_resume_index(resume, document_content)
-            print("Resume index updated.")
 
             # Save document to blob storage
             container_client = self.blob_service_client.get_container_client(self.resume_container_name)
 
             # Save the enhanced DOCX to blob with updated folder path
             with self._temporary_file(suffix='.docx') as temp_docx_path:
-                doc.save(temp_docx_path)
+                with tracing.span("docx.save", kind="internal"):
+                    doc.save(temp_docx_path)
                 enhanced_docx_blob_name = f"{self.updated_resumes_folder}/{enhanced_docx_name}"
                 
                 enhanced_docx_client = container_client.get_blob_client(enhanced_docx_blob_name)
-                with open(temp_docx_path, "rb") as docx_file:          
-                    enhanced_docx_client.upload_blob(docx_file, overwrite=True)
-
-                print(f"Enhanced resume (DOCX) uploaded as {enhanced_docx_blob_name}")
+                with tracing.span("blob.upload", attributes={
+                    "blob.container": self.resume_container_name,
+                    "payload.request_bytes": os.path.getsize(temp_docx_path)
+                }):
+                    with open(temp_docx_path, "rb") as docx_file:          
+                        enhanced_docx_client.upload_blob(docx_file, overwrite=True)
+
+                self.logger.info("Enhanced resume (DOCX) uploaded as %s", enhanced_docx_blob_name)
             return enhanced_docx_blob_name
 
         except Exception as e:
-            self.logger.error(f"Error saving resume document: {str(e)}")
+            self.logger.error("Error saving resume document: %s", e)
             return None
 
 
 
     #NEW
-    def _read_docx_to_string(self, doc: Document):
+    def _read_docx_to_string(self, doc: "Document"):
         # Extract text from each paragraph and concatenate into a single string
         full_text = []
         for paragraph in doc.paragraphs:
@@ -1066,9 +1658,9 @@ class ResumeUpdateProcessor:
                 pass
 
     #NEW            
+    @tracing.traced()
     def _find_insert_position(self, doc):
         # Extract text from the document
-        print("Finding insert position...")
         full_text = "\n".join([para.text for para in doc.paragraphs])
         # Prompt for the LLM
 
@@ -1077,18 +1669,25 @@ class ResumeUpdateProcessor:
             {"role": "user", "content": full_text}
         ]
         
-        result = primary_llm_insertion_json.invoke(messages)
-        result_json = json.loads(result.content)
+        # The same resume gets the same answer at temperature 0, so repeat saves hit the cache
+        content = self.llm_cache.cached(
+            aoai_deployment, "project_insertion_position", messages,
+            temperature=INSERTION_TEMPERATURE,
+            compute=lambda: invoke_llm(primary_llm_insertion_json, messages, "project_insertion_position").content
+        )
+        result_json = json.loads(content)
         
-        print("Analysis:", result_json['analysis'])
-        print("Start Phrase:", result_json['start_phrase'])
+        self.logger.debug("Insert position analysis: %s", result_json['analysis'], extra=fields(start_phrase=result_json['start_phrase']))
 
         return result_json['start_phrase']
     
-    def _save_new_project(self, doc: Document, new_project: str, insert_phrase: str):
+    def _save_new_project(self, doc: "Document", new_project: str, insert_phrase: str):
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.shared import Pt
+
 
-        print(f"Inserting new project: {new_project}")
         json_project = json.loads(new_project)
+        self.logger.debug("Inserting new project: %s", json_project['title'])
         for para in doc.paragraphs:
             if insert_phrase in para.text:
                 # Insert the new project before the paragraph containing the insert phrase
@@ -1105,24 +1704,30 @@ class ResumeUpdateProcessor:
         
         return doc
     
+    @tracing.traced()
     def _update_resume_index(self, resume: dict, resume_content: str):
         """Update the search index with the new resume content."""
         try:
-            search_client = SearchClient(
-                endpoint=os.environ.get("AZURE_SEARCH_ENDPOINT"),
-                index_name=os.environ.get("AZURE_SEARCH_INDEX_RESUMES"),
-                credential=self.ai_search_credential  # Using instance variable instead of global
-            )
-
             current_time_iso = datetime.now(timezone.utc).isoformat()
             resume["content"] = resume_content
-            resume["searchVector"] = primary_embedding_llm.embed_query(resume_content)
+            with tracing.span("openai.embeddings", attributes={
+                "gen_ai.system": "az.ai.openai",
+                "gen_ai.operation.name": "embeddings",
+                "gen_ai.request.model": aoai_embedding_deployment or "",
+                "payload.request_bytes": tracing.payload_size(resume_content)
+            }):
+                resume["searchVector"] = primary_embedding_llm.embed_query(resume_content)
             resume["date"] = current_time_iso
-            result = search_client.upload_documents(documents=[resume])
+            with tracing.span("search.upload", attributes={"search.index": self.search_client_resumes._index_name}) as span:
+                if tracing.records_payloads():
+                    span.set_attribute("payload.request_bytes", tracing.payload_size(resume))
+                result = self.search_client_resumes.upload_documents(documents=[resume])
+            # The next read must see the new content, not a cached copy
+            self.resume_cache.invalidate(resume.get('employee_id'))
             return True
             
         except Exception as e:
-            self.logger.error(f"Error updating resume index: {str(e)}")
+            self.logger.error("Error updating resume index: %s", e)
             return False
     
     
@@ -1141,37 +1746,25 @@ class ResumeUpdateProcessor:
         try:
             # Create the tracker ID using the combination
             tracker_id = f"{project_number}-{employee_id}"
-            self.logger.info(f"Discarding update for tracker ID: {tracker_id}")
+            self.logger.info("Discarding update for tracker ID: %s", tracker_id)
             
-            # Query the tracker directly by ID
-            results = self.trackers_container.query_items(
-                query="SELECT * FROM c WHERE c.id = @id",
-                parameters=[{"name": "@id", "value": tracker_id}],
-                partition_key="resumeupdatestatus"
-            )
-            
-            results_list = list(results)
-            if not results_list:
-                self.logger.error(f"No tracker found with ID: {tracker_id}")
-                return False
-                
-            tracker = results_list[0]
-                    
             # Update the status to 'discarded'
-            tracker['added_to_resume'] = 'discarded'
-            tracker['last_updated'] = datetime.utcnow().isoformat()
-            tracker['version'] += 1
-            
-            # Save the updated tracker
-            self.trackers_container.update_item(tracker)
+            tracker = self._patch_tracker(tracker_id, employee_id, [
+                {"op": "set", "path": "/added_to_resume", "value": "discarded"}
+            ])
+            if not tracker:
+                self.logger.error("No tracker found with ID: %s", tracker_id)
+                return False
+            self._record_pending(tracker)
             
-            self.logger.info(f"Successfully discarded update for tracker: {tracker_id}")
+            self.logger.info("Successfully discarded update for tracker: %s", tracker_id)
             return True
             
         except Exception as e:
-            self.logger.error(f"Error discarding update: {str(e)}")
+            self.logger.error("Error discarding update: %s", e)
             return False
     
+    @tracing.traced()
     def recurring_notification(self) -> Dict[str, Any]:
         """
         Process recurring notifications for pending resume updates.
@@ -1183,71 +1776,93 @@ class ResumeUpdateProcessor:
                 "total_employees_processed": 0,  # Added this field
                 "notifications_sent": 0,
                 "skipped_cooldown": 0,
-                "errors": 0
+                "errors": 0,
+                "email": {}
             }
 
-            # Get all employees with pending updates
-            pending_updates = self.get_pending_updates()
-            
-            # Get unique employee IDs
-            employees_to_notify = {update['employee_id'] for update in pending_updates}
+            # Get all employees with pending updates with a point read per pending-updates index shard
+            employees_to_notify = self.pending_view.get_employees_with_pending()
             summary["total_employees_processed"] = len(employees_to_notify)
-            
-            # Process each employee
-            for employee_id in employees_to_notify:
+            if employees_to_notify:
+                # One query loads every email for the run instead of one per employee
+                self.employee_cache.warm_if_stale()
+
+            # Records and emails are loaded per chunk of employees rather than per employee
+            for start in range(0, len(employees_to_notify), self.NOTIFICATION_BATCH_SIZE):
+                chunk = employees_to_notify[start:start + self.NOTIFICATION_BATCH_SIZE]
                 try:
-                    if self._should_send_notification(employee_id):
-                        if self._send_notification(employee_id):
-                            self._update_notification_record(employee_id)
-                            summary["notifications_sent"] += 1
-                    else:
-                        summary["skipped_cooldown"] += 1
+                    self._notify_employees(chunk, summary)
                 except Exception as e:
-                    self.logger.error(f"Error processing notifications for employee {employee_id}: {str(e)}")
-                    summary["errors"] += 1
-
-            self.logger.info(f"Recurring notification process completed: {summary}")
+                    self.logger.error("Error processing notifications for %s employees: %s", len(chunk), e)
+                    summary["errors"] += len(chunk)
+
+            email_stats = summary["email"]
+            if email_stats.get("elapsed_seconds"):
+                email_stats["throughput_per_second"] = round(email_stats["sent"] / email_stats["elapsed_seconds"], 2)
+            summary["employee_cache"] = self.employee_cache.stats()
+            self.logger.info("Recurring notification process completed: %s", summary)
             return summary
 
         except Exception as e:
-            self.logger.error(f"Error in recurring notification process: {str(e)}")
+            self.logger.error("Error in recurring notification process: %s", e)
             raise
 
 
+    def _notify_employees(self, employee_ids: List[str], summary: Dict[str, int]) -> None:
+        """Send notifications to one chunk of employees and record them, updating the summary."""
+        records = self._get_notification_records(employee_ids)
+
+        due = []
+        for employee_id in employee_ids:
+            if self._cooldown_elapsed(records.get(employee_id)):
+                due.append(employee_id)
+            else:
+                summary["skipped_cooldown"] += 1
+        if not due:
+            return
+
+        emails = self._get_employee_emails(due)
+        messages = []
+        for employee_id in due:
+            if not emails[employee_id]:
+                self.logger.error("Could not send notification - no email found for employee %s", employee_id)
+                continue
+            messages.append((employee_id, self._build_notification_message(emails[employee_id])))
+
+        # Sends run concurrently; the summary accumulates the dispatcher's stats over the run
+        results = self.email_dispatcher.send_all(messages)
+        for name in ("sent", "failed", "retries", "rate_limited", "elapsed_seconds"):
+            summary["email"][name] = summary["email"].get(name, 0) + self.email_dispatcher.stats[name]
+        sent = [employee_id for employee_id, _ in messages if results.get(employee_id)]
+        if not sent:
+            return
+
+        failed = self._update_notification_records(sent, records)
+        summary["notifications_sent"] += len(sent) - len(failed)
+        summary["errors"] += len(failed)
+
+    def _cooldown_elapsed(self, notification_record: Optional[Dict]) -> bool:
+        """True if the employee has never been notified or the cooldown period has passed."""
+        if not notification_record:
+            return True
+        try:
+            last_notification = datetime.fromisoformat(notification_record['last_notification'])
+            return datetime.utcnow() - last_notification > self.notification_cooldown
+        except Exception as e:
+            self.logger.error("Error checking notification eligibility: %s", e)
+            return False
+
     def _should_send_notification(self, employee_id: str) -> bool:
         """
         Check if notification should be sent based on cooldown period.
         Returns True if last notification was more than cooldown period ago.
         """
         try:
-            query = """
-                SELECT * FROM c 
-                WHERE c.partitionKey = 'notifications'
-                AND c.id = @notification_id
-            """
-            parameters = [
-                {"name": "@notification_id", "value": f"notification-{employee_id}"}
-            ]
-            results = list(self.notification_container.query_items(
-                query=query,
-                parameters=parameters,
-                partition_key="notifications"
-            ))
-
-            if not results:
-                return True
-
-            notification_record = results[0]
-            last_notification = datetime.fromisoformat(notification_record['last_notification'])
-            
-            return datetime.utcnow() - last_notification > self.notification_cooldown
-
-        except Exception as e:
-            self.logger.error(f"Error checking notification eligibility: {str(e)}")
-            return False
+            notification_record = self.partition_router.read_item(self.notification_container, f"notification-{employee_id}", employee_id)
+            return self._cooldown_elapsed(notification_record)
 
         except Exception as e:
-            self.logger.error(f"Error checking notification eligibility: {str(e)}")
+            self.logger.error("Error checking notification eligibility: %s", e)
             return False
 
     def store_feedback(self, feedback_data: dict) -> dict:
@@ -1275,15 +1890,17 @@ class ResumeUpdateProcessor:
             }
             
             stored_feedback = self.feedback_container.create_item(feedback_doc)
-            self.logger.info(f"Stored feedback document with id: {stored_feedback['id']}")
+            self.logger.info("Stored feedback document with id: %s", stored_feedback['id'])
             
             return stored_feedback
             
         except Exception as e:
-            self.logger.error(f"Error storing feedback: {str(e)}")
+            self.logger.error("Error storing feedback: %s", e)
             raise
     
 
+    @tracing.traced()
+    @search_cache.scoped
     def reset_resume(self, employee_id: str) -> bool:
         """
         Reset the search index to match the original resume in the /processed folder.
@@ -1298,18 +1915,18 @@ class ResumeUpdateProcessor:
             # Get the resume metadata from search index
             resume = self._get_resume(employee_id)
             if not resume:
-                self.logger.error(f"No resume found for employee {employee_id}")
+                self.logger.error("No resume found for employee %s", employee_id)
                 return False
             
             resume_name = resume.get('sourceFileName')
             if not resume_name:
-                self.logger.error(f"No resume filename found for employee {employee_id}")
+                self.logger.error("No resume filename found for employee %s", employee_id)
                 return False
 
             # Download the original resume from /processed folder
             doc = self._get_resume_document(resume_name)
             if not doc:
-                self.logger.error(f"Failed to download original resume: {resume_name}")
+                self.logger.error("Failed to download original resume: %s", resume_name)
                 return False
 
             # Convert document to string
@@ -1317,12 +1934,12 @@ class ResumeUpdateProcessor:
             
             # Update the search index with original content
             if self._update_resume_index(resume, document_content):
-                self.logger.info(f"Successfully reset search index for employee {employee_id}")
+                self.logger.info("Successfully reset search index for employee %s", employee_id)
                 return True
             else:
-                self.logger.error(f"Failed to update search index for employee {employee_id}")
+                self.logger.error("Failed to update search index for employee %s", employee_id)
                 return False
 
         except Exception as e:
-            self.logger.error(f"Error resetting resume: {str(e)}")
+            self.logger.error("Error resetting resume: %s", e)
             return False
\ No newline at end of file
@@ -4,16 +4,17 @@ import io
 from datetime import datetime
 # Third-party imports
 from dotenv import load_dotenv
-from flask import Flask, jsonify, request, make_response, send_file
+from flask import Flask, g, jsonify, request, make_response, send_file
 from flask_cors import CORS
-from azure.storage.blob import BlobServiceClient
-from azure.identity import DefaultAzureCredential
 
 # Local imports
 from ResumeUpdateProcessor import ResumeUpdateProcessor
+import search_cache
+from structured_logging import configure_logging
 
 # Load environment variables
 load_dotenv()
+configure_logging()
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -22,6 +23,15 @@ CORS(app)
 # Initialize processor
 processor = ResumeUpdateProcessor()
 
+# Each request fetches a resume from the search index at most once
+@app.before_request
+def open_lookup_scope():
+    g.lookup_scope = search_cache.begin_scope()
+
+@app.teardown_request
+def close_lookup_scope(exception=None):
+    search_cache.end_scope(g.pop('lookup_scope', None))
+
 def get_current_user_id():
     """
     Placeholder function to get the current user's ID.
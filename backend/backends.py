@@ -0,0 +1,194 @@
+"""
+### backends.py ###
+
+Builds the clients for every external service the processor talks to: Cosmos DB, Azure AI
+Search, Blob Storage, Azure OpenAI (chat, structured output and embeddings) and Communication
+Services email.
+
+BACKEND_MODE selects the implementation:
+    azure   the real Azure services (default)
+    fake    the in-memory fakes in fake_backends.py, with injectable latency and failures, for
+            offline runs of testing.py and for benchmarks. No credentials or network are needed.
+
+SDK packages are imported inside each factory, and LazyClient defers building a client until it
+is first used, so importing a module that declares clients stays cheap.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from cosmosdb import CosmosDBManager
+
+logger = logging.getLogger(__name__)
+
+AOAI_API_VERSION = "2024-08-01-preview"
+
+_fake_cosmos_client = None
+_fake_cosmos_client_lock = threading.Lock()
+
+
+class LazyClient:
+    """
+    Stands in for a client that is built on first attribute access, e.g.
+    primary_llm = LazyClient(chat_model, temperature=0) at module scope. Thread-safe: the
+    factory runs once.
+    """
+
+    def __init__(self, factory: Callable[..., Any], *args: Any, **kwargs: Any):
+        self._factory = factory
+        self._args = args
+        self._kwargs = kwargs
+        self._client = None
+        self._lock = threading.Lock()
+
+    def resolve(self) -> Any:
+        """Get the client, building it if needed."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory(*self._args, **self._kwargs)
+        return self._client
+
+    def reset(self) -> None:
+        """Drop the client so the next use builds a new one."""
+        with self._lock:
+            self._client = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found on the LazyClient itself
+        return getattr(self.resolve(), name)
+
+
+def backend_mode() -> str:
+    mode = os.environ.get("BACKEND_MODE", "azure")
+    if mode not in ("azure", "fake"):
+        raise ValueError(f"Unknown BACKEND_MODE '{mode}', expected 'azure' or 'fake'")
+    return mode
+
+
+def use_fake_backends() -> bool:
+    return backend_mode() == "fake"
+
+
+def _get_fake_cosmos_client():
+    """One in-memory Cosmos account per process, shared like the real client registry."""
+    global _fake_cosmos_client
+    from fake_backends import FakeCosmosClient
+
+    with _fake_cosmos_client_lock:
+        if _fake_cosmos_client is None:
+            _fake_cosmos_client = FakeCosmosClient()
+        return _fake_cosmos_client
+
+
+def cosmos_container(container_id: str, database_id: str = "ResumeAutomation") -> CosmosDBManager:
+    """Get a CosmosDBManager for a container of the configured account."""
+    if use_fake_backends():
+        return CosmosDBManager(cosmos_database_id=database_id, cosmos_container_id=container_id, client=_get_fake_cosmos_client())
+    return CosmosDBManager(cosmos_database_id=database_id, cosmos_container_id=container_id)
+
+
+def search_client(index_name: str):
+    """Get a SearchClient for an index of the configured search service."""
+    if use_fake_backends():
+        from fake_backends import FakeSearchClient
+        return FakeSearchClient(index_name)
+
+    from azure.core.credentials import AzureKeyCredential
+    from azure.search.documents import SearchClient
+    return SearchClient(
+        endpoint=os.environ.get("AZURE_SEARCH_ENDPOINT"),
+        index_name=index_name,
+        credential=AzureKeyCredential(os.environ.get("AZURE_SEARCH_KEY"))
+    )
+
+
+def blob_service_client():
+    """Get a BlobServiceClient, from the connection string if set, else with DefaultAzureCredential."""
+    if use_fake_backends():
+        from fake_backends import FakeBlobServiceClient
+        return FakeBlobServiceClient()
+
+    from azure.storage.blob import BlobServiceClient
+    connect_str = os.getenv("STORAGE_ACCOUNT_CONNECTION_STRING")
+    if connect_str:
+        logger.info("Initializing blob storage with connection string")
+        return BlobServiceClient.from_connection_string(connect_str)
+
+    from azure.identity import DefaultAzureCredential
+    logger.info("No connection string found, using DefaultAzureCredential")
+    storage_account_name = os.getenv("STORAGE_ACCOUNT_NAME")
+    account_url = f"https://{storage_account_name}.blob.core.windows.net"
+    return BlobServiceClient(account_url=account_url, credential=DefaultAzureCredential())
+
+
+def email_client():
+    """Get the Communication Services EmailClient, or a LocalEmailSink when EMAIL_SINK_DIR is set."""
+    if os.environ.get("EMAIL_SINK_DIR"):
+        from email_dispatch import LocalEmailSink
+        return LocalEmailSink()
+    if use_fake_backends():
+        from fake_backends import FakeEmailClient
+        return FakeEmailClient()
+
+    from azure.communication.email import EmailClient
+    return EmailClient.from_connection_string(os.environ.get("COMMUNICATION_SERVICES_CONNECTION_STRING"))
+
+
+def chat_model(temperature: float, api_version: str = AOAI_API_VERSION, json_schema: Optional[Dict[str, Any]] = None):
+    """
+    Get a langchain chat model for the configured deployment.
+
+    Args:
+        temperature: Sampling temperature
+        api_version: Azure OpenAI API version
+        json_schema: Optional {"name": ..., "schema": {...}} to request structured JSON output
+    """
+    if use_fake_backends():
+        from fake_backends import FakeChatModel
+        return FakeChatModel(temperature=temperature, json_schema=json_schema)
+
+    from langchain_openai import AzureChatOpenAI
+    model_kwargs = {"response_format": {"type": "json_schema", "json_schema": json_schema}} if json_schema else {}
+    return AzureChatOpenAI(
+        azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
+        api_version=api_version,
+        temperature=temperature,
+        max_tokens=None,
+        timeout=None,
+        max_retries=2,
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        model_kwargs=model_kwargs
+    )
+
+
+def openai_client():
+    """Get the AzureOpenAI client used for structured-output parsing."""
+    if use_fake_backends():
+        from fake_backends import FakeOpenAIClient
+        return FakeOpenAIClient()
+
+    from openai import AzureOpenAI
+    return AzureOpenAI(
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        api_version=AOAI_API_VERSION
+    )
+
+
+def embedding_model():
+    """Get the langchain embeddings model used for the resume index vectors."""
+    if use_fake_backends():
+        from fake_backends import FakeEmbeddings
+        return FakeEmbeddings()
+
+    from langchain_openai import AzureOpenAIEmbeddings
+    return AzureOpenAIEmbeddings(
+        model=os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME"),
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        openai_api_version=AOAI_API_VERSION
+    )
@@ -0,0 +1,407 @@
+"""
+### benchmark.py ###
+
+End-to-end pipeline benchmark on the in-memory backends (BACKEND_MODE=fake).
+
+Scenarios:
+    ingest          synthetic key member events, shaped like sample_data/events, replayed one by
+                    one through process_key_member with drafts generated inline
+    ingest_batch    the same stream through process_key_members in batches
+    save_updates    save_updates for one employee with 1 to 50 pending projects, with the LLM
+                    response cache emptied before every call, so every model call is made
+    save_updates_cached
+                    the same with the cache kept across calls after one untimed warm-up call,
+                    so repeated project descriptions are answered from the cache
+
+Every scenario reports throughput and per-stage timings (count, mean, p50/p95/p99). Ingestion
+stages are store_event, tracker_upsert (plus tracker_lookup in batches), on_resume_check,
+draft_generation and notification. save_updates stages are get_resume, download_resume,
+find_insert_position, parse_project, insert_project, update_resume_index and save_resume.
+
+Backend latency comes from a latency profile (see fake_backends.py); the default
+benchmark_latency_profile.json holds per-call samples for each Azure service and should be
+refreshed from production traces when they shift. --latency-scale shrinks it for quick CI runs.
+
+Results are written as JSON. With --baseline, the run fails (exit code 1) if any scenario's
+throughput dropped by more than --max-regression compared with the baseline results.
+
+Usage:
+    python benchmark.py --output results.json
+    python benchmark.py --latency-scale 0.05 --baseline baseline.json --max-regression 0.15
+    python benchmark.py --scenarios save_updates --project-counts 1 10 50
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from event_loader import LatencyRecorder
+
+DEFAULT_PROFILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_latency_profile.json")
+
+INGEST_STAGES = {
+    "store_event": "_store_event",
+    "tracker_upsert": "_get_or_create_tracker",
+    "on_resume_check": "_is_project_on_resume",
+    "draft_generation": "_generate_project_experience",
+    "notification": "_send_notification",
+}
+
+SAVE_UPDATES_STAGES = {
+    "get_resume": "_get_resume",
+    "download_resume": "_get_resume_document",
+    "find_insert_position": "_find_insert_position",
+    "parse_project": "_parse_project_title_and_description",
+    "insert_project": "_save_new_project",
+    "update_resume_index": "_update_resume_index",
+    "save_resume": "_save_resume_document",
+}
+
+ROLES = ["PMCL", "ENGR", "DSGN", "PMGR"]
+JOB_FAMILIES = ["ENCE", "ENME", "ARCH"]
+
+
+BATCH_STAGES = {
+    "store_event": ("events_container", "upsert_items"),
+    "tracker_lookup": (None, "_get_trackers"),
+    "tracker_upsert": ("trackers_container", "execute_in_batches"),
+    "on_resume_check": (None, "_is_project_on_resume"),
+    "draft_generation": (None, "_generate_project_experience"),
+    "notification": (None, "_send_notification"),
+}
+
+
+class StageTimer:
+    """
+    Times processor methods by wrapping them on the instance, leaving the class untouched.
+    A stage maps to a processor method name, or to (container attribute, method name) for
+    calls made directly on one of the processor's containers.
+    """
+
+    def __init__(self, processor, stages: Dict):
+        self.processor = processor
+        self.stages = stages
+        self.latencies = LatencyRecorder()
+        self._wrapped = []
+
+    def _wrap(self, stage: str, method: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.latencies.record(stage, time.perf_counter() - started)
+        return timed
+
+    def __enter__(self) -> "StageTimer":
+        for stage, method in self.stages.items():
+            attribute, method_name = method if isinstance(method, tuple) else (None, method)
+            target = getattr(self.processor, attribute) if attribute else self.processor
+            setattr(target, method_name, self._wrap(stage, getattr(target, method_name)))
+            self._wrapped.append((target, method_name))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for target, method_name in self._wrapped:
+            target.__dict__.pop(method_name, None)
+        self._wrapped = []
+
+
+def load_profile(path: str, latency_scale: float) -> Dict[str, Dict]:
+    with open(path, "r") as f:
+        profile = json.load(f)
+    for settings in profile.values():
+        latency = settings.get("latency_ms", 0)
+        if isinstance(latency, list):
+            settings["latency_ms"] = [sample * latency_scale for sample in latency]
+        else:
+            settings["latency_ms"] = latency * latency_scale
+    return profile
+
+
+def synthetic_events(run_id: str, employees: int, projects_per_employee: int, weeks: int, rng: random.Random) -> List[Dict]:
+    """
+    Weekly cumulative-hours events for every employee/project pair, interleaved across
+    employees like a real export. Most pairs cross the 40 hour threshold partway through.
+    """
+    events = []
+    assignments = []
+    for employee in range(employees):
+        employee_id = f"{run_id}{employee:05d}"
+        display_name = f"Employee{employee}, Synthetic - {employee_id}"
+        for project in range(projects_per_employee):
+            assignments.append({
+                "employee_display_name": display_name,
+                "project_number": f"{run_id}P{employee:05d}{project:02d}",
+                "project_role_name": rng.choice(ROLES),
+                "employee_job_family_function_code": rng.choice(JOB_FAMILIES),
+                "hours": 0.0,
+            })
+
+    for week in range(weeks):
+        for assignment in assignments:
+            assignment["hours"] += float(rng.choice([5, 10, 15, 20]))
+            events.append({
+                "subject_area": "fsu",
+                "project_number": assignment["project_number"],
+                "project_role_name": assignment["project_role_name"],
+                "employee_display_name": assignment["employee_display_name"],
+                "job_hours": assignment["hours"],
+                "employee_job_family_function_code": assignment["employee_job_family_function_code"],
+            })
+    return events
+
+
+def seed_for_events(processor, events: List[Dict], project_text: str) -> None:
+    from fake_backends import seed_employee, seed_project
+
+    seeded_employees = set()
+    seeded_projects = set()
+    for event in events:
+        employee_id = event["employee_display_name"].split(" - ")[1]
+        if employee_id not in seeded_employees:
+            seed_employee(processor, employee_id, event["employee_display_name"].split(" - ")[0], f"{employee_id}@example.com")
+            seeded_employees.add(employee_id)
+        if event["project_number"] not in seeded_projects:
+            seed_project(processor, event["project_number"], project_text)
+            seeded_projects.add(event["project_number"])
+
+
+def _request_charge_total(processor) -> float:
+    return sum(
+        totals["request_charge"]
+        for operations in processor.get_request_charges().values()
+        for totals in operations.values()
+    )
+
+
+def _reset_request_charges(processor) -> None:
+    for container in processor._cosmos_containers():
+        container.reset_request_charges()
+
+
+def run_ingest(processor, events: List[Dict], batch_size: Optional[int] = None) -> Dict:
+    _reset_request_charges(processor)
+    statuses: Dict[str, int] = {}
+    with StageTimer(processor, BATCH_STAGES if batch_size else INGEST_STAGES) as timer:
+        started = time.perf_counter()
+        if batch_size:
+            for start in range(0, len(events), batch_size):
+                for result in processor.process_key_members(events[start:start + batch_size]):
+                    statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+        else:
+            for event in events:
+                started_event = time.perf_counter()
+                result = processor.process_key_member(event)
+                timer.latencies.record("process_key_member", time.perf_counter() - started_event)
+                statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+        elapsed = time.perf_counter() - started
+
+    return {
+        "events": len(events),
+        "batch_size": batch_size,
+        "elapsed_seconds": elapsed,
+        "throughput": len(events) / elapsed if elapsed else 0.0,
+        "throughput_unit": "events/sec",
+        "statuses": statuses,
+        "request_charge": _request_charge_total(processor),
+        "stages": timer.latencies.summary(),
+    }
+
+
+def seed_pending_projects(processor, run_id: str, project_count: int, project_text: str) -> Dict:
+    """Create an employee with project_count drafted, pending updates."""
+    from fake_backends import seed_employee, seed_project
+
+    employee_id = f"{run_id}S{project_count:03d}"
+    display_name = f"Saver{project_count}, Synthetic - {employee_id}"
+    seed_employee(processor, employee_id, display_name.split(" - ")[0], f"{employee_id}@example.com")
+
+    projects = []
+    for index in range(project_count):
+        project_number = f"{run_id}Q{project_count:03d}{index:02d}"
+        seed_project(processor, project_number, project_text)
+        tracker = processor._new_tracker({
+            "subject_area": "fsu",
+            "project_number": project_number,
+            "project_role_name": "PMCL",
+            "employee_display_name": display_name,
+            "job_hours": 60.0,
+            "employee_job_family_function_code": "ENCE",
+        })
+        tracker.update({"total_hours": 60.0, "added_to_resume": "in_progress", "draft_status": "ready"})
+        processor.trackers_container.create_item(tracker)
+        projects.append({
+            "project_number": project_number,
+            "description": f"Project Engineer, Synthetic Project {index}, Denver, CO (2024 to Present). Delivered design and site work for project {index}.",
+        })
+    return {"employee_id": employee_id, "projects": projects}
+
+
+def _llm_cache_lookups(processor) -> Dict[str, int]:
+    stats = processor.llm_cache.stats()
+    return {"hits": stats["memory_hits"] + stats["store_hits"], "misses": stats["misses"]}
+
+
+def run_save_updates(processor, run_id: str, project_counts: List[int], iterations: int, project_text: str,
+                     cached: bool = False) -> Dict:
+    """
+    Time save_updates per project count. Uncached runs empty the LLM response cache before
+    every call; cached runs keep it and make one untimed warm-up call first.
+    """
+    results = {}
+    for project_count in project_counts:
+        if cached:
+            case = seed_pending_projects(processor, f"{run_id}W{project_count}", project_count, project_text)
+            processor.save_updates(case["employee_id"], case["projects"])
+        _reset_request_charges(processor)
+        lookups_before = _llm_cache_lookups(processor)
+        with StageTimer(processor, SAVE_UPDATES_STAGES) as timer:
+            elapsed = 0.0
+            succeeded = 0
+            for iteration in range(iterations):
+                case = seed_pending_projects(processor, f"{run_id}I{iteration}", project_count, project_text)
+                if not cached:
+                    processor.llm_cache.clear_memory()
+                started = time.perf_counter()
+                succeeded += bool(processor.save_updates(case["employee_id"], case["projects"]))
+                duration = time.perf_counter() - started
+                elapsed += duration
+                timer.latencies.record("save_updates", duration)
+
+        lookups_after = _llm_cache_lookups(processor)
+        hits = lookups_after["hits"] - lookups_before["hits"]
+        misses = lookups_after["misses"] - lookups_before["misses"]
+        results[str(project_count)] = {
+            "projects": project_count,
+            "iterations": iterations,
+            "succeeded": succeeded,
+            "elapsed_seconds": elapsed,
+            "throughput": project_count * iterations / elapsed if elapsed else 0.0,
+            "throughput_unit": "projects/sec",
+            "request_charge": _request_charge_total(processor),
+            "llm_cache_hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "stages": timer.latencies.summary(),
+        }
+    return results
+
+
+def throughputs(results: Dict) -> Dict[str, float]:
+    """Flatten results into {metric_name: throughput} for regression comparison."""
+    flattened = {}
+    for scenario, result in results["scenarios"].items():
+        if "throughput" in result:
+            flattened[scenario] = result["throughput"]
+        else:
+            for case, case_result in result.items():
+                flattened[f"{scenario}[{case}]"] = case_result["throughput"]
+    return flattened
+
+
+def compare_with_baseline(results: Dict, baseline: Dict, max_regression: float) -> List[str]:
+    """Return a message for every metric whose throughput fell more than max_regression below the baseline."""
+    current = throughputs(results)
+    regressions = []
+    for metric, baseline_value in throughputs(baseline).items():
+        if metric not in current or not baseline_value:
+            continue
+        change = (current[metric] - baseline_value) / baseline_value
+        if change < -max_regression:
+            regressions.append(f"{metric}: {current[metric]:.2f} vs baseline {baseline_value:.2f} ({change:+.1%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resume update pipeline on in-memory backends.")
+    parser.add_argument("--scenarios", nargs="+", choices=["ingest", "ingest_batch", "save_updates", "save_updates_cached"],
+                        default=["ingest", "ingest_batch", "save_updates", "save_updates_cached"])
+    parser.add_argument("--employees", type=int, default=20)
+    parser.add_argument("--projects-per-employee", type=int, default=3)
+    parser.add_argument("--weeks", type=int, default=6)
+    parser.add_argument("--batch-size", type=int, default=100, help="Rows per process_key_members call in ingest_batch")
+    parser.add_argument("--project-counts", type=int, nargs="+", default=[1, 5, 10, 25, 50], help="Projects per save_updates call")
+    parser.add_argument("--iterations", type=int, default=3, help="save_updates calls per project count")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, help="Latency profile JSON")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiply every profile latency, e.g. 0.05 for CI")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", help="Earlier JSON results to compare throughput against")
+    parser.add_argument("--max-regression", type=float, default=0.10, help="Allowed throughput drop vs baseline, as a fraction")
+    parser.add_argument("--verbose", action="store_true", help="Keep the processor's log output (LOG_LEVEL, default INFO)")
+    args = parser.parse_args()
+
+    # Must be set before the processor module builds its clients
+    os.environ["BACKEND_MODE"] = "fake"
+    os.environ["DRAFT_GENERATION_MODE"] = "inline"
+    os.environ.setdefault("COSMOS_PARTITION_MODE", "employee")
+    # Cached LLM answers from an earlier run on disk would skew the timings
+    os.environ.setdefault("LLM_CACHE_STORE", "none")
+    # Report request and response bytes per call even without an exporter
+    os.environ.setdefault("TRACING_PAYLOAD_SIZES", "true")
+
+    import fake_backends
+    import tracing
+    from ResumeUpdateProcessor import ResumeUpdateProcessor
+    from structured_logging import configure_logging
+
+    # The processor's per-event logs would drown the results; injected failures still log errors
+    configure_logging(None if args.verbose else "ERROR")
+
+    fake_backends.configure_fakes(load_profile(args.profile, args.latency_scale), seed=args.seed)
+    processor = ResumeUpdateProcessor()
+    rng = random.Random(args.seed)
+
+    sample_project = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample_data", "projects", "project_1.txt")
+    with open(sample_project, "r") as f:
+        project_text = f.read()
+
+    results = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "parameters": {key: value for key, value in vars(args).items() if key not in ("output", "baseline", "verbose")},
+        "scenarios": {},
+    }
+
+    for scenario in args.scenarios:
+        run_id = f"B{scenario[:2].upper()}{rng.randrange(10 ** 6):06d}"
+        if scenario in ("ingest", "ingest_batch"):
+            events = synthetic_events(run_id, args.employees, args.projects_per_employee, args.weeks, rng)
+            seed_for_events(processor, events, project_text)
+            batch_size = args.batch_size if scenario == "ingest_batch" else None
+            results["scenarios"][scenario] = run_ingest(processor, events, batch_size)
+        else:
+            results["scenarios"][scenario] = run_save_updates(processor, run_id, args.project_counts, args.iterations, project_text,
+                                                              cached=scenario == "save_updates_cached")
+
+    results["injected"] = fake_backends.get_injection_stats()
+    # Per-call timings, RU charges and tokens from the tracing spans, seeding included
+    results["calls"] = tracing.get_metrics_snapshot()
+    results["llm_cache"] = processor.llm_cache.stats()
+
+    for metric, value in throughputs(results).items():
+        print(f"{metric}: {value:.2f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.max_regression)
+        if regressions:
+            print("Throughput regressions beyond threshold:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No throughput regression beyond {args.max_regression:.0%}")
+
+
+if __name__ == "__main__":
+    main()
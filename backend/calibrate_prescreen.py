@@ -0,0 +1,153 @@
+"""
+### calibrate_prescreen.py ###
+
+Calibrates the thresholds of the project-on-resume pre-screen (project_screening.py).
+
+Each case is an (employee, project) pair. The tool scores it with the embedding screen and
+labels it with the LLM's answer to the same question, then reports, for a grid of thresholds,
+how many checks the screen would answer on its own (coverage) and how often it would disagree
+with the LLM:
+
+    false yes   the screen says "yes" where the LLM says "no"; the draft is never generated,
+                so the recommended yes threshold allows none of these
+    false no    the screen says "no" where the LLM says "yes"; an unneeded draft is generated
+                and the employee can reject it, so a small rate (--max-false-no) is accepted
+
+Scored cases can be written out (--output) and fed back in (--cases) to try other limits
+without calling the LLM again. Run it against the real services before switching
+ON_RESUME_PRESCREEN from shadow to on, and again whenever the embedding deployment changes.
+
+Usage:
+    python calibrate_prescreen.py --sample 300 --output prescreen_cases.jsonl
+    python calibrate_prescreen.py --cases prescreen_cases.jsonl --max-false-no 0.02
+"""
+
+import argparse
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from project_screening import ProjectScreen
+
+GRID_STEP = 0.01
+
+
+def sample_cases(processor, limit: int) -> List[Dict[str, Any]]:
+    """Take (employee, project) pairs from the trackers container."""
+    trackers = processor.trackers_container.query_items(
+        query=f"SELECT TOP {int(limit)} * FROM c WHERE c.type = 'resume_update_tracker'"
+    )
+    return [{"employee_id": tracker["employee_id"], "project_number": tracker["project_number"]} for tracker in trackers]
+
+
+def load_cases(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def score_case(processor, screen: ProjectScreen, case: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Add the screen's score and, unless the case has one, the LLM's label."""
+    if "score" in case and "label" in case:
+        return case
+    resume = processor._get_resume(case["employee_id"])
+    project_description = processor._get_project_description(case["project_number"])
+    if not resume or not project_description:
+        print(f"Skipping {case['project_number']}-{case['employee_id']}: resume or project description not found")
+        return None
+    resume_content = resume.get("content", "")
+    result = screen.score(resume_content, project_description)
+    label = case.get("label") or processor._ask_llm_project_on_resume(resume_content, project_description)
+    return {**case, "score": round(result.score, 4), "label": label, "best_paragraph": result.best_paragraph[:200]}
+
+
+def _percentiles(scores: List[float]) -> Dict[str, float]:
+    if not scores:
+        return {}
+    ordered = sorted(scores)
+    pick = lambda fraction: ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+    return {"min": ordered[0], "p10": pick(0.10), "p50": pick(0.50), "p90": pick(0.90), "max": ordered[-1]}
+
+
+def evaluate(cases: List[Dict[str, Any]], yes_threshold: float, no_threshold: float) -> Dict[str, Any]:
+    """Coverage and disagreement rates of a pair of thresholds on labelled cases."""
+    decided_yes = [case for case in cases if case["score"] >= yes_threshold]
+    decided_no = [case for case in cases if case["score"] < no_threshold]
+    positives = sum(1 for case in cases if case["label"] == "yes")
+    false_yes = sum(1 for case in decided_yes if case["label"] != "yes")
+    false_no = sum(1 for case in decided_no if case["label"] == "yes")
+    return {
+        "yes_threshold": round(yes_threshold, 4),
+        "no_threshold": round(no_threshold, 4),
+        "coverage": round((len(decided_yes) + len(decided_no)) / len(cases), 4) if cases else 0.0,
+        "false_yes": false_yes,
+        "false_no": false_no,
+        # Share of the LLM's "yes" answers the screen would turn into "no"
+        "false_no_rate": round(false_no / positives, 4) if positives else 0.0,
+    }
+
+
+def recommend(cases: List[Dict[str, Any]], max_false_no: float) -> Dict[str, Any]:
+    """
+    The lowest yes threshold with no false yes, and the highest no threshold whose false-no
+    rate stays within max_false_no, evaluated on a grid of GRID_STEP.
+    """
+    grid = [round(step * GRID_STEP, 4) for step in range(int(1 / GRID_STEP) + 1)]
+    yes_threshold = next(
+        (t for t in grid if evaluate(cases, t, 0.0)["false_yes"] == 0 and any(case["score"] >= t for case in cases)),
+        1.0
+    )
+    no_threshold = 0.0
+    for t in grid:
+        if t > yes_threshold or evaluate(cases, yes_threshold, t)["false_no_rate"] > max_false_no:
+            break
+        no_threshold = t
+    return evaluate(cases, yes_threshold, no_threshold)
+
+
+def build_report(cases: List[Dict[str, Any]], max_false_no: float) -> Dict[str, Any]:
+    grid_step = 0.05
+    return {
+        "cases": len(cases),
+        "llm_yes": sum(1 for case in cases if case["label"] == "yes"),
+        "scores_when_llm_yes": _percentiles([case["score"] for case in cases if case["label"] == "yes"]),
+        "scores_when_llm_no": _percentiles([case["score"] for case in cases if case["label"] != "yes"]),
+        "yes_thresholds": [evaluate(cases, 0.5 + step * grid_step, 0.0) for step in range(11)],
+        "no_thresholds": [evaluate(cases, 1.01, 0.5 + step * grid_step) for step in range(11)],
+        "recommended": recommend(cases, max_false_no),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate the project-on-resume embedding pre-screen against LLM answers.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--cases", help="JSONL of cases: employee_id and project_number, optionally label and score")
+    source.add_argument("--sample", type=int, help="Sample this many (employee, project) pairs from the trackers")
+    parser.add_argument("--output", help="Write the scored, labelled cases to this JSONL file")
+    parser.add_argument("--max-false-no", type=float, default=0.02, help="Accepted share of LLM 'yes' answers screened as 'no'")
+    parser.add_argument("--workers", type=int, default=8, help="Cases scored and labelled concurrently")
+    args = parser.parse_args()
+
+    from ResumeUpdateProcessor import ResumeUpdateProcessor, primary_embedding_llm
+
+    processor = ResumeUpdateProcessor()
+    # Thresholds do not matter here; scores are compared with the grid
+    screen = ProjectScreen(primary_embedding_llm, mode="shadow")
+    cases = load_cases(args.cases) if args.cases else sample_cases(processor, args.sample)
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        scored = [case for case in executor.map(lambda case: score_case(processor, screen, case), cases) if case]
+
+    if args.output:
+        with open(args.output, "w") as f:
+            for case in scored:
+                f.write(json.dumps(case) + "\n")
+
+    report = build_report(scored, args.max_false_no)
+    print(json.dumps(report, indent=2))
+    recommended = report["recommended"]
+    print(f"Recommended: ON_RESUME_YES_THRESHOLD={recommended['yes_threshold']} ON_RESUME_NO_THRESHOLD={recommended['no_threshold']} "
+          f"(coverage {recommended['coverage']:.0%}, false yes {recommended['false_yes']}, false no {recommended['false_no']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+### check_import_time.py ###
+
+Import-time budget check for the modules loaded on every cold start: the Flask app's and the
+notification function's ResumeUpdateProcessor.
+
+Each target is imported in a fresh interpreter under `python -X importtime`; the median
+cumulative import time over several runs must stay within the target's budget, and none of the
+heavy packages that are supposed to load on first use (langchain_openai, openai, python-docx,
+the search/blob/email SDKs, azure.identity) may appear in the import log.
+
+Exits with code 1 when a target is over budget or imports a deferred package, so it can run as
+a CI step. Budgets are generous multiples of the measured times to absorb slower CI machines.
+
+Usage:
+    python check_import_time.py
+    python check_import_time.py --runs 10 --scale 2.0
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFERRED_PACKAGES = [
+    "langchain_openai",
+    "openai",
+    "docx",
+    "azure.search.documents",
+    "azure.storage.blob",
+    "azure.communication.email",
+    "azure.identity",
+]
+
+# (directory, module, budget in ms)
+TARGETS = [
+    ("backend", "ResumeUpdateProcessor", 800),
+    ("notifications_func", "ResumeUpdateProcessor", 500),
+]
+
+
+def measure_import(directory: str, module: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        (cumulative import time of the module in ms, {imported module: cumulative ms})
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.join(REPO_ROOT, directory),
+        capture_output=True,
+        text=True,
+        env={**os.environ, "BACKEND_MODE": os.environ.get("BACKEND_MODE", "azure")}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} from {directory} failed:\n{result.stderr}")
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imports[name.strip()] = int(cumulative) / 1000
+    return imports[module], imports
+
+
+def check_target(directory: str, module: str, budget_ms: float, runs: int) -> List[str]:
+    """Return the problems found for one target; an empty list means it passed."""
+    # The first import compiles bytecode; do not count it
+    measure_import(directory, module)
+    timings = []
+    imports: Dict[str, float] = {}
+    for _ in range(runs):
+        elapsed, imports = measure_import(directory, module)
+        timings.append(elapsed)
+    median = statistics.median(timings)
+    print(f"{directory}/{module}: median {median:.0f} ms over {runs} runs (budget {budget_ms:.0f} ms)")
+
+    problems = []
+    if median > budget_ms:
+        slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[1:11]
+        problems.append(
+            f"{directory}/{module} takes {median:.0f} ms to import, over its {budget_ms:.0f} ms budget. Slowest imports:\n"
+            + "\n".join(f"    {name}: {elapsed:.0f} ms" for name, elapsed in slowest)
+        )
+    for package in DEFERRED_PACKAGES:
+        if package in imports:
+            problems.append(f"{directory}/{module} imports {package} ({imports[package]:.0f} ms) at import time; import it on first use instead")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if cold-start imports exceed their time budget.")
+    parser.add_argument("--runs", type=int, default=5, help="Measured imports per target")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget, e.g. 2.0 on slow machines")
+    args = parser.parse_args()
+
+    problems = []
+    for directory, module, budget_ms in TARGETS:
+        problems.extend(check_target(directory, module, budget_ms * args.scale, args.runs))
+
+    if problems:
+        print("\nImport-time check failed:")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+    print("Import-time check passed")
+
+
+if __name__ == "__main__":
+    main()
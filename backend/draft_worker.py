@@ -0,0 +1,240 @@
+"""
+### draft_worker.py ###
+
+Generates resume drafts outside of ingestion. process_key_member(s) only mark a tracker
+'in_progress' with draft_status 'pending'; this worker reads the resume_trackers change feed,
+generates drafts for those trackers concurrently and then marks them 'ready'.
+
+The change feed is read per partition key range. Each range has a lease document in the
+"leases" container holding its owner, lease expiry and continuation token. A worker renews the
+leases it owns and takes over ranges whose lease has expired, so several worker instances can
+run side by side and a crashed instance's ranges are picked up by the others. The continuation
+is only advanced after every draft from a page has completed, so a restart replays unfinished
+changes instead of losing them; replays are harmless because a draft is only completed once.
+Leases are renewed every third of --lease-seconds while a page's drafts are generating, so a
+slow page does not let another worker take over its range.
+
+A draft that still fails after max_attempts is marked draft_status 'failed' and is not retried
+by the change feed. `--requeue-failed` sets those trackers back to 'pending' (after the cause is
+fixed), which delivers them to the worker again.
+
+Run with DRAFT_GENERATION_MODE=worker (the default) in the ingestion processes.
+
+Usage:
+    python draft_worker.py
+    python draft_worker.py --workers 8 --poll-interval 2
+    python draft_worker.py --once
+    python draft_worker.py --requeue-failed
+"""
+
+import argparse
+import logging
+import os
+import socket
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import backends
+from cosmosdb import PreconditionFailedError
+from structured_logging import configure_logging
+
+LEASE_PARTITION_KEY = "draft-worker"
+
+
+class DraftWorker:
+    def __init__(self, processor, workers: int = 4, lease_seconds: int = 300, page_size: int = 100,
+                 max_attempts: int = 3, owner: Optional[str] = None):
+        self.processor = processor
+        self.workers = workers
+        self.lease_duration = timedelta(seconds=lease_seconds)
+        self.renew_interval = lease_seconds / 3
+        self.page_size = page_size
+        self.max_attempts = max_attempts
+        self.owner = owner or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self.trackers_container = processor.trackers_container
+        self.leases_container = backends.cosmos_container("leases")
+        self.logger = logging.getLogger(__name__)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.leases: Dict[str, Dict] = {}
+        self.stats = {"changes_read": 0, "drafts_generated": 0, "drafts_skipped": 0, "drafts_failed": 0}
+
+    def provision(self) -> None:
+        """Create the leases container if it does not exist."""
+        self.leases_container.provision()
+
+    def _lease_id(self, partition_key_range_id: str) -> str:
+        return f"draft-worker-{self.trackers_container.cosmos_container_id}-{partition_key_range_id}"
+
+    def _acquire_leases(self) -> None:
+        """Renew the leases this worker owns and take over ranges that are unowned or expired."""
+        now = datetime.utcnow()
+        for partition_key_range_id in self.trackers_container.read_partition_key_ranges():
+            lease_id = self._lease_id(partition_key_range_id)
+            lease = self.leases_container.read_item(lease_id, LEASE_PARTITION_KEY)
+            if lease is None:
+                lease = self.leases_container.create_item({
+                    "id": lease_id,
+                    "partitionKey": LEASE_PARTITION_KEY,
+                    "partition_key_range_id": partition_key_range_id,
+                    "owner": self.owner,
+                    "expires_at": (now + self.lease_duration).isoformat(),
+                    "continuation": None
+                })
+                if lease is not None:
+                    self.leases[partition_key_range_id] = lease
+                continue
+
+            if lease['owner'] != self.owner and lease['expires_at'] > now.isoformat():
+                self.leases.pop(partition_key_range_id, None)
+                continue
+
+            lease['owner'] = self.owner
+            lease['expires_at'] = (now + self.lease_duration).isoformat()
+            try:
+                self.leases[partition_key_range_id] = self.leases_container.update_item(lease, etag=lease['_etag'])
+            except PreconditionFailedError:
+                # Another worker renewed or took it first
+                self.leases.pop(partition_key_range_id, None)
+
+    def _renew_leases(self) -> None:
+        """Extend the leases this worker owns, dropping any that another worker has taken over."""
+        expires_at = (datetime.utcnow() + self.lease_duration).isoformat()
+        for partition_key_range_id, lease in list(self.leases.items()):
+            lease['expires_at'] = expires_at
+            try:
+                self.leases[partition_key_range_id] = self.leases_container.update_item(lease, etag=lease['_etag'])
+            except PreconditionFailedError:
+                self.logger.warning("Lost lease on partition key range %s; changes will be replayed by its new owner", partition_key_range_id)
+                self.leases.pop(partition_key_range_id, None)
+
+    def _checkpoint(self, partition_key_range_id: str, continuation: str) -> bool:
+        """Save the continuation of a range. Returns False if the lease was lost in the meantime."""
+        lease = self.leases.get(partition_key_range_id)
+        if lease is None:
+            return False
+        lease['continuation'] = continuation
+        lease['expires_at'] = (datetime.utcnow() + self.lease_duration).isoformat()
+        try:
+            self.leases[partition_key_range_id] = self.leases_container.update_item(lease, etag=lease['_etag'])
+            return True
+        except PreconditionFailedError:
+            self.logger.warning("Lost lease on partition key range %s; changes will be replayed by its new owner", partition_key_range_id)
+            self.leases.pop(partition_key_range_id, None)
+            return False
+
+    def _generate(self, tracker: Dict) -> str:
+        """Generate one draft with retries. Returns the outcome for the stats."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                if self.processor.generate_draft(tracker) is None:
+                    return "drafts_skipped"
+                return "drafts_generated"
+            except Exception as e:
+                self.logger.error("Draft generation for tracker %s failed (attempt %s/%s): %s", tracker['id'], attempt, self.max_attempts, e)
+                if attempt == self.max_attempts:
+                    self.processor.mark_draft_failed(tracker, str(e))
+                    return "drafts_failed"
+                time.sleep(2 ** attempt)
+
+    def run_once(self) -> int:
+        """
+        Read one page of changes from every owned range, generate their drafts concurrently
+        and checkpoint each range once its drafts are done.
+
+        Returns:
+            int: Number of changes read
+        """
+        self._acquire_leases()
+
+        pages: List = []
+        for partition_key_range_id, lease in list(self.leases.items()):
+            changes, continuation = self.trackers_container.read_change_feed(
+                partition_key_range_id,
+                continuation=lease.get('continuation'),
+                max_item_count=self.page_size
+            )
+            if not changes:
+                continue
+            trackers = [tracker for tracker in changes if self.processor.needs_draft(tracker)]
+            # A few bulk search queries instead of a resume and a project lookup per draft
+            self.processor.prefetch_search_documents(trackers)
+            futures = [self.executor.submit(self._generate, tracker) for tracker in trackers]
+            pages.append((partition_key_range_id, continuation, len(changes), futures))
+
+        # Keep the leases alive while the drafts are generating
+        outstanding = {future for _, _, _, futures in pages for future in futures}
+        while outstanding:
+            _, outstanding = wait(outstanding, timeout=self.renew_interval)
+            if outstanding:
+                self._renew_leases()
+
+        changes_read = 0
+        for partition_key_range_id, continuation, change_count, futures in pages:
+            completed = True
+            for future in futures:
+                try:
+                    self.stats[future.result()] += 1
+                except Exception as e:
+                    # e.g. mark_draft_failed could not record the failure
+                    completed = False
+                    self.logger.error("Draft from partition key range %s failed: %s", partition_key_range_id, e)
+            changes_read += change_count
+            if completed:
+                self._checkpoint(partition_key_range_id, continuation)
+            else:
+                # Not checkpointed, so the page is replayed; the other ranges still advance
+                self.logger.warning("Partition key range %s not checkpointed; its page will be replayed", partition_key_range_id)
+
+        self.stats["changes_read"] += changes_read
+        return changes_read
+
+    def run(self, poll_interval: float = 5.0) -> None:
+        """Process changes until interrupted, sleeping between polls when there is nothing new."""
+        self.logger.info("Draft worker %s started with %s workers", self.owner, self.workers)
+        try:
+            while True:
+                try:
+                    if self.run_once() == 0:
+                        time.sleep(poll_interval)
+                except Exception as e:
+                    self.logger.error("Error in draft worker loop: %s", e)
+                    time.sleep(poll_interval)
+        finally:
+            self.executor.shutdown(wait=True)
+
+
+def main():
+    # Imported first: it loads .env, which the defaults below and configure_logging() read
+    from ResumeUpdateProcessor import ResumeUpdateProcessor
+
+    parser = argparse.ArgumentParser(description="Generate resume drafts from the resume_trackers change feed.")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("DRAFT_WORKER_CONCURRENCY", 4)), help="Drafts generated concurrently")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="Seconds to wait when there are no new changes")
+    parser.add_argument("--lease-seconds", type=int, default=300, help="How long a range stays owned without renewal")
+    parser.add_argument("--once", action="store_true", help="Process one page per range and exit")
+    parser.add_argument("--requeue-failed", action="store_true", help="Set failed drafts back to pending and exit")
+    args = parser.parse_args()
+
+    configure_logging()
+
+    if args.requeue_failed:
+        # requeue_failed_drafts logs the count
+        ResumeUpdateProcessor().requeue_failed_drafts()
+        return
+
+    worker = DraftWorker(ResumeUpdateProcessor(), workers=args.workers, lease_seconds=args.lease_seconds)
+    worker.provision()
+
+    if args.once:
+        worker.run_once()
+        worker.executor.shutdown(wait=True)
+        worker.logger.info("Draft worker stats: %s", worker.stats)
+    else:
+        worker.run(poll_interval=args.poll_interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+### employee_cache.py ###
+
+In-process cache of employee metadata (email, name, department), shared by every processor in
+the process: the Flask app's request handlers and the notification function's warm processor.
+
+Email addresses rarely change, but they were read from the employee_metadata container once per
+notification. The cache keeps each employee's metadata document for a TTL, evicts the least
+recently used entry beyond max_entries, and also remembers employees without a metadata document
+so they are not queried again on every run. warm() loads the whole container with one query
+(a single-partition read in legacy mode) at the start of a notification job; after that, lookups
+for a run cost no Cosmos DB requests at all.
+
+Anything that writes employee metadata must call invalidate() (or invalidate_all()) so readers
+do not keep a stale address until the TTL expires.
+
+Configuration (environment):
+    EMPLOYEE_CACHE_TTL_SECONDS     how long an entry is trusted (default 3600)
+    EMPLOYEE_CACHE_MAX_ENTRIES     entries kept before evicting (default 50000)
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from cosmosdb import CosmosDBManager
+from partitioning import PartitionRouter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 3600.0
+DEFAULT_MAX_ENTRIES = 50000
+
+# Cached in place of a document for employees that have no metadata
+_MISSING: Dict[str, Any] = {}
+
+
+class EmployeeMetadataCache:
+    def __init__(self, container: CosmosDBManager, partition_router: PartitionRouter,
+                 ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.container = container
+        self.partition_router = partition_router
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.environ.get("EMPLOYEE_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        self.max_entries = max_entries or int(os.environ.get("EMPLOYEE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        # employee_id -> (expires at, metadata document or _MISSING), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._warmed_until = 0.0
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0, "warmups": 0}
+
+    def get(self, employee_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an employee's metadata document, reading it from Cosmos DB on a miss.
+
+        Returns:
+            The metadata document, or None if the employee has none
+        """
+        return self.get_many([employee_id]).get(employee_id)
+
+    def get_many(self, employee_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the metadata of many employees; all misses are loaded with one query per chunk of ids.
+
+        Returns:
+            Dict mapping employee_id to its metadata document; employees without one are omitted
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        misses = []
+        now = time.monotonic()
+        with self._lock:
+            for employee_id in employee_ids:
+                entry = self._entries.get(employee_id)
+                if entry is not None and entry[0] <= now:
+                    del self._entries[employee_id]
+                    self._counters["expired"] += 1
+                    entry = None
+                if entry is None:
+                    self._counters["misses"] += 1
+                    misses.append(employee_id)
+                    continue
+                self._counters["hits"] += 1
+                self._entries.move_to_end(employee_id)
+                if entry[1] is not _MISSING:
+                    found[employee_id] = entry[1]
+
+        if misses:
+            loaded = self.partition_router.query_items_for_employees(self.container, misses)
+            with self._lock:
+                for employee_id in misses:
+                    documents = loaded.get(employee_id)
+                    self._store(employee_id, documents[0] if documents else _MISSING)
+            for employee_id in misses:
+                if loaded.get(employee_id):
+                    found[employee_id] = loaded[employee_id][0]
+        return found
+
+    def warm(self) -> int:
+        """
+        Load every employee's metadata with a single query, replacing the cached entries.
+
+        Returns:
+            int: The number of employees loaded
+        """
+        started = time.perf_counter()
+        loaded = self.partition_router.query_all_employee_items(self.container)
+        with self._lock:
+            self._entries.clear()
+            for employee_id, documents in loaded.items():
+                self._store(employee_id, documents[0])
+            self._warmed_until = time.monotonic() + self.ttl_seconds
+            self._counters["warmups"] += 1
+        logger.info("Warmed employee metadata cache with %d employees in %.2fs", len(loaded), time.perf_counter() - started)
+        return len(loaded)
+
+    def warm_if_stale(self) -> bool:
+        """Warm the cache unless a warm-up is still within its TTL. Returns True if it warmed."""
+        if time.monotonic() < self._warmed_until:
+            return False
+        self.warm()
+        return True
+
+    def put(self, employee_id: str, metadata: Dict[str, Any]) -> None:
+        """Cache a metadata document the caller has just written."""
+        with self._lock:
+            self._store(employee_id, metadata)
+
+    def invalidate(self, employee_id: str) -> None:
+        """Drop one employee's entry, e.g. after their metadata was written or deleted."""
+        with self._lock:
+            if self._entries.pop(employee_id, None) is not None:
+                self._counters["invalidations"] += 1
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            self._counters["invalidations"] += len(self._entries)
+            self._entries.clear()
+            self._warmed_until = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss, expiry and eviction counters, plus the current size and hit rate."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _store(self, employee_id: str, metadata: Dict[str, Any]) -> None:
+        # Caller holds the lock
+        self._entries[employee_id] = (time.monotonic() + self.ttl_seconds, metadata)
+        self._entries.move_to_end(employee_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+
+# One cache per metadata container and partition mode, shared by every processor in the process
+_caches: Dict[Tuple[str, str, str], EmployeeMetadataCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_employee_cache(container: CosmosDBManager, partition_router: PartitionRouter) -> EmployeeMetadataCache:
+    """Get the process-wide cache for a metadata container, creating it on first use."""
+    key = (container.cosmos_database_id, container.cosmos_container_id, partition_router.mode)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = EmployeeMetadataCache(container, partition_router)
+            _caches[key] = cache
+        else:
+            # Cached documents stay valid across processors, but misses should use the newest
+            # container, whose client may have been rebuilt after an auth failure
+            cache.container = container
+        return cache
+
+
+def invalidate_employee(employee_id: str) -> None:
+    """Drop an employee from every cache in the process; call after writing their metadata."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.invalidate(employee_id)
+
+
+def reset_employee_caches() -> None:
+    with _caches_lock:
+        _caches.clear()
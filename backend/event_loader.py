@@ -0,0 +1,288 @@
+"""
+### event_loader.py ###
+
+Command-line loader that streams a large JSONL or CSV export of key member rows into
+ResumeUpdateProcessor.process_key_members. Rows are read lazily and handed to the processor
+in batches, with at most --max-in-flight batches outstanding, so memory stays flat no matter
+how large the input file is.
+
+After every batch completes (in input order) the byte offset of its last row is written to a
+checkpoint file, so a crashed run can be restarted and will resume where it left off. The
+checkpoint records a fingerprint of the input, and a resume against a different file is refused.
+
+Each row's event id is derived from the input fingerprint and the row's offset, so rows replayed
+after a crash (those of batches in flight when it happened) overwrite their events instead of
+storing them twice.
+
+Usage:
+    python event_loader.py exports/key_members.jsonl
+    python event_loader.py exports/key_members.csv --batch-size 500 --max-in-flight 2
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_FIELDS = {"job_hours": float}
+
+# Bytes of the input hashed into its fingerprint, together with its size
+FINGERPRINT_BYTES = 1024 * 1024
+
+
+class LatencyRecorder:
+    """Fixed-size reservoir of latency samples per stage, so memory does not grow with input size."""
+
+    def __init__(self, reservoir_size: int = 10000):
+        self.reservoir_size = reservoir_size
+        self.samples: Dict[str, List[float]] = {}
+        self.counts: Dict[str, int] = {}
+        self.totals: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._record(stage, seconds)
+
+    def _record(self, stage: str, seconds: float) -> None:
+        samples = self.samples.setdefault(stage, [])
+        count = self.counts.get(stage, 0) + 1
+        self.counts[stage] = count
+        self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+        if len(samples) < self.reservoir_size:
+            samples.append(seconds)
+        else:
+            index = random.randrange(count)
+            if index < self.reservoir_size:
+                samples[index] = seconds
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        summary = {}
+        for stage, samples in self.samples.items():
+            ordered = sorted(samples)
+            summary[stage] = {
+                "count": self.counts[stage],
+                "total_ms": self.totals[stage] * 1000,
+                "mean_ms": self.totals[stage] / self.counts[stage] * 1000,
+                "p50_ms": _percentile(ordered, 0.50) * 1000,
+                "p95_ms": _percentile(ordered, 0.95) * 1000,
+                "p99_ms": _percentile(ordered, 0.99) * 1000,
+            }
+        return summary
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def read_checkpoint(checkpoint_path: str) -> Dict:
+    """Return the saved checkpoint, or an empty one if none exists."""
+    if not os.path.exists(checkpoint_path):
+        return {"offset": 0, "rows": 0}
+    with open(checkpoint_path, "r") as f:
+        return json.load(f)
+
+
+def write_checkpoint(checkpoint_path: str, input_path: str, fingerprint: str, offset: int, rows: int) -> None:
+    """Atomically replace the checkpoint file so a crash never leaves it half written."""
+    temp_path = f"{checkpoint_path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump({"input": os.path.abspath(input_path), "fingerprint": fingerprint, "offset": offset, "rows": rows}, f)
+    os.replace(temp_path, checkpoint_path)
+
+
+def input_fingerprint(input_path: str) -> str:
+    """Hash of the input's size and first FINGERPRINT_BYTES, cheap even for very large exports."""
+    digest = hashlib.sha256(str(os.path.getsize(input_path)).encode("ascii"))
+    with open(input_path, "rb") as f:
+        digest.update(f.read(FINGERPRINT_BYTES))
+    return digest.hexdigest()
+
+
+def event_id(fingerprint: str, end_offset: int) -> str:
+    """Deterministic event id of the row ending at end_offset."""
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, f"{fingerprint}:{end_offset}"))
+
+
+def iter_rows(input_path: str, input_format: str, start_offset: int, latencies: LatencyRecorder) -> Iterator[Tuple[Dict, int]]:
+    """
+    Lazily yield (member_entry, end_offset) pairs from a JSONL or CSV export.
+
+    end_offset is the byte offset just past the row, which is what gets checkpointed. A CSV
+    row may span several lines (quoted fields can contain newlines), so CSV is read with one
+    csv.reader over the file's lines and the offset is taken after each complete row.
+    """
+    with open(input_path, "rb") as f:
+        offset = 0
+
+        def lines() -> Iterator[str]:
+            nonlocal offset
+            for raw_line in iter(f.readline, b""):
+                offset = f.tell()
+                yield raw_line.decode("utf-8")
+
+        if input_format == "csv":
+            reader = csv.reader(lines())
+            header = next(reader, None)
+            if header is None:
+                return
+            header[0] = header[0].lstrip("\ufeff")
+            if start_offset:
+                # The reader pulls lines from f lazily, so it continues from here
+                f.seek(start_offset)
+            while True:
+                started = time.perf_counter()
+                values = next(reader, None)
+                if values is None:
+                    break
+                if not values:
+                    continue
+                member_entry = dict(zip(header, values))
+                for field, convert in NUMERIC_FIELDS.items():
+                    if field in member_entry:
+                        member_entry[field] = convert(member_entry[field])
+                latencies.record("parse", time.perf_counter() - started)
+                yield member_entry, offset
+            return
+
+        if start_offset:
+            f.seek(start_offset)
+        for line in lines():
+            started = time.perf_counter()
+            line = line.strip()
+            if not line:
+                continue
+            member_entry = json.loads(line)
+            latencies.record("parse", time.perf_counter() - started)
+            yield member_entry, offset
+
+
+def iter_batches(rows: Iterator[Tuple[Dict, int]], batch_size: int) -> Iterator[Tuple[List[Dict], int]]:
+    """Group rows into (entries, end_offset) batches."""
+    batch = []
+    end_offset = 0
+    for member_entry, end_offset in rows:
+        batch.append(member_entry)
+        if len(batch) >= batch_size:
+            yield batch, end_offset
+            batch = []
+    if batch:
+        yield batch, end_offset
+
+
+def load_events(processor, input_path: str, input_format: str, batch_size: int = 500,
+                max_in_flight: int = 1, checkpoint_path: Optional[str] = None, restart: bool = False) -> Dict:
+    """
+    Stream an export into the processor and return a run summary.
+
+    Batches complete in input order before their offset is checkpointed. Keep max_in_flight at 1
+    unless the export has at most one row per tracker in any window of batches, otherwise two
+    in-flight batches can apply hours for the same tracker out of order.
+    """
+    checkpoint_path = checkpoint_path or f"{input_path}.checkpoint"
+    checkpoint = {"offset": 0, "rows": 0} if restart else read_checkpoint(checkpoint_path)
+    fingerprint = input_fingerprint(input_path)
+    if checkpoint["offset"] and checkpoint.get("fingerprint") != fingerprint:
+        raise ValueError(
+            f"Checkpoint {checkpoint_path} was written for a different input than {input_path}; "
+            "pass --restart to load this file from the beginning"
+        )
+    if checkpoint["offset"]:
+        logger.info("Resuming %s from byte offset %s (%s rows already loaded)", input_path, checkpoint['offset'], checkpoint['rows'])
+
+    latencies = LatencyRecorder()
+    status_counts: Dict[str, int] = {}
+    rows_loaded = checkpoint["rows"]
+    rows_this_run = 0
+
+    def process_batch(batch: List[Dict]) -> List[Dict]:
+        started = time.perf_counter()
+        results = processor.process_key_members(batch)
+        latencies.record("process_batch", time.perf_counter() - started)
+        return results
+
+    started = time.perf_counter()
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        def complete_oldest():
+            nonlocal rows_loaded, rows_this_run
+            future, batch_size_done, end_offset = in_flight.popleft()
+            for result in future.result():
+                status_counts[result['status']] = status_counts.get(result['status'], 0) + 1
+            rows_loaded += batch_size_done
+            rows_this_run += batch_size_done
+            write_checkpoint(checkpoint_path, input_path, fingerprint, end_offset, rows_loaded)
+
+        def rows_with_event_ids():
+            for member_entry, row_end_offset in iter_rows(input_path, input_format, checkpoint["offset"], latencies):
+                member_entry["event_id"] = event_id(fingerprint, row_end_offset)
+                yield member_entry, row_end_offset
+
+        for batch, end_offset in iter_batches(rows_with_event_ids(), batch_size):
+            if len(in_flight) >= max_in_flight:
+                complete_oldest()
+            in_flight.append((executor.submit(process_batch, batch), len(batch), end_offset))
+        while in_flight:
+            complete_oldest()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows_this_run,
+        "total_rows": rows_loaded,
+        "elapsed_seconds": elapsed,
+        "rows_per_second": rows_this_run / elapsed if elapsed else 0.0,
+        "statuses": status_counts,
+        "stages": latencies.summary(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a JSONL or CSV export of key member rows into the resume processor.")
+    parser.add_argument("input", help="Path to the JSONL or CSV export")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (defaults to the file extension)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows passed to process_key_members per call")
+    parser.add_argument("--max-in-flight", type=int, default=1, help="Batches processed concurrently")
+    parser.add_argument("--checkpoint", help="Checkpoint file (defaults to <input>.checkpoint)")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start from the beginning")
+    args = parser.parse_args()
+
+    input_format = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+
+    # Imported first: it loads .env, which configure_logging() reads
+    from ResumeUpdateProcessor import ResumeUpdateProcessor
+    from structured_logging import configure_logging
+    configure_logging()
+
+    processor = ResumeUpdateProcessor()
+
+    summary = load_events(
+        processor,
+        args.input,
+        input_format,
+        batch_size=args.batch_size,
+        max_in_flight=args.max_in_flight,
+        checkpoint_path=args.checkpoint,
+        restart=args.restart
+    )
+
+    logger.info("Load completed: %s rows (%s including previous runs), %.1f rows/sec, statuses %s",
+                summary['rows'], summary['total_rows'], summary['rows_per_second'], summary['statuses'])
+    for stage, stats in summary["stages"].items():
+        logger.info("Stage %s: count=%s p50=%.2fms p95=%.2fms", stage, stats['count'], stats['p50_ms'], stats['p95_ms'])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1317 @@
+"""
+### fake_backends.py ###
+
+In-memory stand-ins for Cosmos DB, Azure AI Search, Blob Storage, Azure OpenAI and Azure
+Communication Services email, so the processor can run and be benchmarked with no network.
+backends.py returns these instead of the real clients when BACKEND_MODE=fake.
+
+Each fake mimics the slice of its SDK the processor uses, down to the exception types, so the
+processor's own error handling runs unchanged. The Cosmos fake works at the ContainerProxy level:
+CosmosDBManager, its batching and RU accounting are exercised as in production, and queries are
+evaluated by a small interpreter for the SQL subset this repo uses.
+
+Every fake passes through a FaultInjector that adds latency and random failures. Injectors are
+configured per backend ("cosmos", "search", "blob", "openai", "embeddings", "email") from:
+    FAKE_LATENCY_MS / FAKE_FAILURE_RATE       defaults for every backend
+    FAKE_BACKEND_PROFILE                      JSON file, e.g.
+        {"openai": {"latency_ms": [850, 1200, 4100], "failure_rate": 0.01}, "cosmos": {"latency_ms": 6}}
+or at runtime with configure_fakes(profile). A list of latencies is sampled uniformly, so a
+recorded latency profile reproduces the real distribution including its tail.
+
+Seed data for the testing.py scenarios and the benchmarks is loaded with seed_sample_data().
+"""
+
+import copy
+import glob
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from azure.core.exceptions import HttpResponseError, ResourceExistsError, ResourceNotFoundError
+from azure.cosmos import exceptions as cosmos_exceptions
+
+BACKEND_NAMES = ("cosmos", "search", "blob", "openai", "embeddings", "email")
+
+
+class FakeServiceError(Exception):
+    """Injected failure of a fake service that has no more specific SDK exception."""
+
+
+class FaultInjector:
+    """Adds latency and random failures to calls of one fake backend."""
+
+    def __init__(self, name: str, latency_ms: Union[float, List[float]] = 0.0, failure_rate: float = 0.0, seed: Optional[int] = None):
+        self.name = name
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.configure(latency_ms, failure_rate)
+
+    def configure(self, latency_ms: Union[float, List[float]] = 0.0, failure_rate: float = 0.0, seed: Optional[int] = None) -> None:
+        with self._lock:
+            self.latency_samples_ms = list(latency_ms) if isinstance(latency_ms, (list, tuple)) else [float(latency_ms)]
+            self.failure_rate = float(failure_rate)
+            if seed is not None:
+                self._random.seed(seed)
+            self.calls = 0
+            self.failures = 0
+
+    def __call__(self, operation: str, error_factory: Callable[[str], Exception]) -> None:
+        with self._lock:
+            self.calls += 1
+            latency_ms = self._random.choice(self.latency_samples_ms) if self.latency_samples_ms else 0.0
+            fail = self._random.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+        if latency_ms > 0:
+            time.sleep(latency_ms / 1000.0)
+        if fail:
+            raise error_factory(f"Injected {self.name} failure during {operation}")
+
+
+_injectors: Dict[str, FaultInjector] = {}
+_injectors_lock = threading.Lock()
+
+
+def _default_profile() -> Dict[str, Dict[str, Any]]:
+    defaults = {
+        "latency_ms": float(os.environ.get("FAKE_LATENCY_MS", 0)),
+        "failure_rate": float(os.environ.get("FAKE_FAILURE_RATE", 0)),
+    }
+    profile = {name: dict(defaults) for name in BACKEND_NAMES}
+    profile_path = os.environ.get("FAKE_BACKEND_PROFILE")
+    if profile_path:
+        with open(profile_path, "r") as f:
+            for name, settings in json.load(f).items():
+                profile.setdefault(name, dict(defaults)).update(settings)
+    return profile
+
+
+def get_injector(name: str) -> FaultInjector:
+    """Get the shared fault injector of a backend, configured from the environment on first use."""
+    with _injectors_lock:
+        if not _injectors:
+            for backend_name, settings in _default_profile().items():
+                _injectors[backend_name] = FaultInjector(backend_name, **settings)
+        return _injectors.setdefault(name, FaultInjector(name))
+
+
+def configure_fakes(profile: Dict[str, Dict[str, Any]], seed: Optional[int] = None) -> None:
+    """
+    Reconfigure latency and failure injection at runtime.
+
+    Args:
+        profile: {backend_name: {"latency_ms": float or [samples], "failure_rate": float}}
+        seed: Optional seed for reproducible latency sampling and failures
+    """
+    for name, settings in profile.items():
+        get_injector(name).configure(seed=seed, **settings)
+
+
+def get_injection_stats() -> Dict[str, Dict[str, int]]:
+    """Get the number of calls and injected failures per backend."""
+    return {name: {"calls": injector.calls, "failures": injector.failures} for name, injector in _injectors.items()}
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _payload_size(document: Any) -> int:
+    return len(json.dumps(document, default=str).encode("utf-8"))
+
+
+###########################################################################
+# Cosmos DB
+###########################################################################
+
+def _cosmos_error(status_code: int, message: str) -> cosmos_exceptions.CosmosHttpResponseError:
+    error_types = {
+        404: cosmos_exceptions.CosmosResourceNotFoundError,
+        409: cosmos_exceptions.CosmosResourceExistsError,
+        412: cosmos_exceptions.CosmosAccessConditionFailedError,
+    }
+    return error_types.get(status_code, cosmos_exceptions.CosmosHttpResponseError)(status_code=status_code, message=message)
+
+
+def _injected_cosmos_error(message: str) -> cosmos_exceptions.CosmosHttpResponseError:
+    return _cosmos_error(503, message)
+
+
+class _QueryParser:
+    """
+    Recursive-descent interpreter for the Cosmos DB SQL subset used in this repo:
+    SELECT [TOP n] * | c.field, ... FROM c [WHERE ...] [ORDER BY c.path [ASC|DESC]] with AND/OR/NOT, comparisons,
+    parameters, and the ARRAY_CONTAINS, CONTAINS, STARTSWITH, IS_DEFINED, LOWER and UPPER functions.
+    """
+
+    TOKEN_PATTERN = re.compile(r"\s*(?:(@\w+)|('(?:[^'\\]|\\.)*')|(\d+(?:\.\d+)?)|(<=|>=|!=|<>|[=<>(),\[\]*.])|(\w+))")
+    KEYWORDS = {"SELECT", "TOP", "FROM", "WHERE", "AND", "OR", "NOT", "ORDER", "BY", "ASC", "DESC", "TRUE", "FALSE", "NULL"}
+    UNDEFINED = object()
+
+    def __init__(self, query: str, parameters: Optional[List[Dict[str, Any]]]):
+        self.tokens = self._tokenize(query)
+        self.position = 0
+        self.parameters = {parameter['name']: parameter['value'] for parameter in (parameters or [])}
+
+    def _tokenize(self, query: str) -> List[tuple]:
+        tokens = []
+        position = 0
+        query = query.strip()
+        while position < len(query):
+            match = self.TOKEN_PATTERN.match(query, position)
+            if not match or match.end() == position:
+                raise _cosmos_error(400, f"Unsupported query syntax near: {query[position:position + 20]}")
+            parameter, string, number, symbol, word = match.groups()
+            if parameter:
+                tokens.append(("param", parameter))
+            elif string is not None:
+                tokens.append(("value", string[1:-1].replace("\\'", "'")))
+            elif number:
+                tokens.append(("value", float(number) if "." in number else int(number)))
+            elif symbol:
+                tokens.append(("symbol", symbol))
+            elif word.upper() in self.KEYWORDS:
+                tokens.append(("keyword", word.upper()))
+            else:
+                tokens.append(("name", word))
+            position = match.end()
+        return tokens
+
+    def _peek(self, kind: Optional[str] = None, value: Any = None) -> bool:
+        if self.position >= len(self.tokens):
+            return False
+        token_kind, token_value = self.tokens[self.position]
+        return (kind is None or token_kind == kind) and (value is None or token_value == value)
+
+    def _take(self, kind: Optional[str] = None, value: Any = None):
+        if not self._peek(kind, value):
+            found = self.tokens[self.position] if self.position < len(self.tokens) else "end of query"
+            raise _cosmos_error(400, f"Expected {value or kind}, found {found}")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token[1]
+
+    def parse(self):
+        """
+        Parse a full query into (top, predicate, order_by, fields) where predicate maps a document
+        to a bool and fields lists the projected top-level fields (None for SELECT *).
+        """
+        top = None
+        fields = None
+        if self._peek("keyword", "SELECT"):
+            self._take("keyword", "SELECT")
+            if self._peek("keyword", "TOP"):
+                self._take("keyword", "TOP")
+                top = int(self._take("value"))
+            if self._peek("symbol", "*"):
+                self._take("symbol", "*")
+            else:
+                fields = []
+                while True:
+                    self._take("name")
+                    if self._peek("symbol", "."):
+                        self._take("symbol", ".")
+                        fields.append(self._take("name"))
+                    else:
+                        self._take("symbol", "[")
+                        fields.append(self._take("value"))
+                        self._take("symbol", "]")
+                    if not self._peek("symbol", ","):
+                        break
+                    self._take("symbol", ",")
+        self._take("keyword", "FROM")
+        self.alias = self._take("name")
+        predicate = lambda document: True
+        if self._peek("keyword", "WHERE"):
+            self._take("keyword", "WHERE")
+            predicate = self._parse_or()
+        order_by = None
+        if self._peek("keyword", "ORDER"):
+            self._take("keyword", "ORDER")
+            self._take("keyword", "BY")
+            path = self._parse_operand()
+            descending = False
+            if self._peek("keyword", "DESC") or self._peek("keyword", "ASC"):
+                descending = self._take("keyword") == "DESC"
+            order_by = (path, descending)
+        if self.position != len(self.tokens):
+            raise _cosmos_error(400, f"Unsupported query syntax at token {self.tokens[self.position]}")
+        return top, (lambda document: predicate(document) is True), order_by, fields
+
+    def _parse_or(self):
+        left = self._parse_and()
+        while self._peek("keyword", "OR"):
+            self._take()
+            right = self._parse_and()
+            left = (lambda l, r: lambda document: l(document) is True or r(document) is True)(left, right)
+        return left
+
+    def _parse_and(self):
+        left = self._parse_not()
+        while self._peek("keyword", "AND"):
+            self._take()
+            right = self._parse_not()
+            left = (lambda l, r: lambda document: l(document) is True and r(document) is True)(left, right)
+        return left
+
+    def _parse_not(self):
+        if self._peek("keyword", "NOT"):
+            self._take()
+            operand = self._parse_not()
+            return lambda document: not (operand(document) is True)
+        return self._parse_comparison()
+
+    def _parse_comparison(self):
+        left = self._parse_operand()
+        comparisons = {
+            "=": lambda a, b: a == b,
+            "!=": lambda a, b: a != b,
+            "<>": lambda a, b: a != b,
+            "<": lambda a, b: a < b,
+            ">": lambda a, b: a > b,
+            "<=": lambda a, b: a <= b,
+            ">=": lambda a, b: a >= b,
+        }
+        if self._peek("symbol") and self.tokens[self.position][1] in comparisons:
+            compare = comparisons[self._take("symbol")]
+            right = self._parse_operand()
+
+            def evaluate(document):
+                a, b = left(document), right(document)
+                if a is self.UNDEFINED or b is self.UNDEFINED:
+                    return self.UNDEFINED
+                try:
+                    return compare(a, b)
+                except TypeError:
+                    return self.UNDEFINED
+            return evaluate
+        return left
+
+    def _parse_operand(self):
+        if self._peek("symbol", "("):
+            self._take()
+            expression = self._parse_or()
+            self._take("symbol", ")")
+            return expression
+        if self._peek("param"):
+            name = self._take()
+            if name not in self.parameters:
+                raise _cosmos_error(400, f"Parameter {name} was not provided")
+            value = self.parameters[name]
+            return lambda document: value
+        if self._peek("value"):
+            value = self._take()
+            return lambda document: value
+        if self._peek("keyword", "TRUE") or self._peek("keyword", "FALSE") or self._peek("keyword", "NULL"):
+            value = {"TRUE": True, "FALSE": False, "NULL": None}[self._take()]
+            return lambda document: value
+
+        name = self._take("name")
+        if self._peek("symbol", "("):
+            return self._parse_function(name.upper())
+        if name != self.alias:
+            raise _cosmos_error(400, f"Unknown identifier {name}")
+        path: List[str] = []
+        while self._peek("symbol", ".") or self._peek("symbol", "["):
+            if self._take() == ".":
+                path.append(self._take("name"))
+            else:
+                path.append(self._take("value"))
+                self._take("symbol", "]")
+
+        def resolve(document):
+            value = document
+            for key in path:
+                if not isinstance(value, dict) or key not in value:
+                    return self.UNDEFINED
+                value = value[key]
+            return value
+        return resolve
+
+    def _parse_function(self, name: str):
+        self._take("symbol", "(")
+        arguments = []
+        if not self._peek("symbol", ")"):
+            arguments.append(self._parse_or())
+            while self._peek("symbol", ","):
+                self._take()
+                arguments.append(self._parse_or())
+        self._take("symbol", ")")
+
+        undefined = self.UNDEFINED
+
+        def string_function(function):
+            def evaluate(document):
+                values = [argument(document) for argument in arguments]
+                if any(not isinstance(value, str) for value in values[:2]):
+                    return undefined
+                return function(*values)
+            return evaluate
+
+        functions = {
+            "ARRAY_CONTAINS": lambda document: isinstance(arguments[0](document), list) and arguments[1](document) in arguments[0](document),
+            "IS_DEFINED": lambda document: arguments[0](document) is not undefined,
+            "CONTAINS": string_function(lambda value, sub, *rest: (sub.lower() in value.lower()) if rest and rest[0] else sub in value),
+            "STARTSWITH": string_function(lambda value, prefix, *rest: value.lower().startswith(prefix.lower()) if rest and rest[0] else value.startswith(prefix)),
+            "LOWER": string_function(lambda value: value.lower()),
+            "UPPER": string_function(lambda value: value.upper()),
+        }
+        if name not in functions:
+            raise _cosmos_error(400, f"Unsupported function {name}")
+        return functions[name]
+
+
+def _compile_query(query: str, parameters: Optional[List[Dict[str, Any]]] = None):
+    return _QueryParser(query, parameters).parse()
+
+
+class _FakePaged:
+    """Minimal ItemPaged: iterate items, or iterate pages with by_page()."""
+
+    def __init__(self, fetch_pages: Callable[[], Iterator[List[Dict[str, Any]]]]):
+        self._fetch_pages = fetch_pages
+
+    def by_page(self, continuation_token=None) -> Iterator[Iterator[Dict[str, Any]]]:
+        return (iter(page) for page in self._fetch_pages())
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for page in self._fetch_pages():
+            yield from page
+
+
+class FakeContainerProxy:
+    """In-memory container with the ContainerProxy methods CosmosDBManager calls."""
+
+    PAGE_SIZE = 100
+
+    def __init__(self, database_id: str, container_id: str):
+        self.id = container_id
+        self.container_link = f"dbs/{database_id}/colls/{container_id}"
+        self.client_connection = self
+        self.last_response_headers: Dict[str, Any] = {}
+        self._items: Dict[tuple, Dict[str, Any]] = {}
+        self._changes: Dict[tuple, int] = {}
+        self._lsn = 0
+        self._lock = threading.RLock()
+        self._inject = get_injector("cosmos")
+
+    # --- helpers -----------------------------------------------------------
+
+    def _respond(self, operation: str, request_charge: float, response_hook=None, result: Any = None, etag: Optional[str] = None) -> Dict[str, Any]:
+        headers = {"x-ms-request-charge": f"{request_charge:.2f}", "x-ms-activity-id": str(uuid.uuid4())}
+        if etag is not None:
+            headers["etag"] = etag
+        self.last_response_headers = headers
+        if response_hook:
+            response_hook(headers, result if result is not None else {})
+        return headers
+
+    @staticmethod
+    def _write_charge(document: Dict[str, Any]) -> float:
+        return round(5.5 * max(1.0, _payload_size(document) / 1024.0), 2)
+
+    @staticmethod
+    def _read_charge(document: Dict[str, Any]) -> float:
+        return round(max(1.0, _payload_size(document) / 1024.0), 2)
+
+    def _store(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        stored = copy.deepcopy(document)
+        stored["_etag"] = f'"{uuid.uuid4()}"'
+        stored["_ts"] = int(time.time())
+        stored.setdefault("_rid", uuid.uuid4().hex[:16])
+        stored["_self"] = f"{self.container_link}/docs/{stored['_rid']}"
+        key = (stored.get("partitionKey"), stored["id"])
+        self._items[key] = stored
+        self._lsn += 1
+        self._changes[key] = self._lsn
+        return copy.deepcopy(stored)
+
+    def _get(self, item_id: str, partition_key: Any) -> Dict[str, Any]:
+        document = self._items.get((partition_key, item_id))
+        if document is None:
+            raise _cosmos_error(404, f"Entity with the specified id {item_id} does not exist in the system.")
+        return document
+
+    @staticmethod
+    def _check_etag(document: Dict[str, Any], etag: Optional[str], match_condition) -> None:
+        if etag and match_condition is not None and document["_etag"] != etag:
+            raise _cosmos_error(412, "Operation cannot be performed because one of the specified precondition is not met.")
+
+    @staticmethod
+    def _apply_patch(document: Dict[str, Any], patch_operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        patched = copy.deepcopy(document)
+        for operation in patch_operations:
+            keys = [key for key in operation["path"].split("/") if key]
+            parent = patched
+            for key in keys[:-1]:
+                parent = parent[int(key)] if isinstance(parent, list) else parent.setdefault(key, {})
+            last = keys[-1]
+            op = operation["op"]
+            if isinstance(parent, list):
+                index = len(parent) if last == "-" else int(last)
+                if op == "add":
+                    parent.insert(index, operation["value"])
+                elif op in ("set", "replace"):
+                    parent[index] = operation["value"]
+                elif op == "remove":
+                    del parent[index]
+                elif op == "incr":
+                    parent[index] += operation["value"]
+                continue
+            if op in ("set", "add"):
+                parent[last] = operation["value"]
+            elif op == "replace":
+                if last not in parent:
+                    raise _cosmos_error(400, f"Path {operation['path']} does not exist")
+                parent[last] = operation["value"]
+            elif op == "remove":
+                if last not in parent:
+                    raise _cosmos_error(400, f"Path {operation['path']} does not exist")
+                del parent[last]
+            elif op == "incr":
+                parent[last] = parent.get(last, 0) + operation["value"]
+            else:
+                raise _cosmos_error(400, f"Unsupported patch operation {op}")
+        return patched
+
+    # --- ContainerProxy surface ---------------------------------------------
+
+    def read(self, **kwargs) -> Dict[str, Any]:
+        return {"id": self.id}
+
+    def read_item(self, item: str, partition_key: Any, response_hook=None, **kwargs) -> Dict[str, Any]:
+        self._inject("read_item", _injected_cosmos_error)
+        with self._lock:
+            try:
+                document = copy.deepcopy(self._get(item, partition_key))
+            except cosmos_exceptions.CosmosResourceNotFoundError as e:
+                e.headers = self._respond("read", 1.0)
+                raise
+        self._respond("read", self._read_charge(document), response_hook, document, document["_etag"])
+        return document
+
+    def create_item(self, body: Dict[str, Any], response_hook=None, **kwargs) -> Dict[str, Any]:
+        self._inject("create_item", _injected_cosmos_error)
+        with self._lock:
+            if (body.get("partitionKey"), body["id"]) in self._items:
+                raise _cosmos_error(409, f"Entity with the specified id {body['id']} already exists in the system.")
+            created = self._store(body)
+        self._respond("create", self._write_charge(created), response_hook, created, created["_etag"])
+        return created
+
+    def replace_item(self, item: str, body: Dict[str, Any], etag: Optional[str] = None, match_condition=None, response_hook=None, **kwargs) -> Dict[str, Any]:
+        self._inject("replace_item", _injected_cosmos_error)
+        with self._lock:
+            existing = self._get(item, body.get("partitionKey"))
+            self._check_etag(existing, etag, match_condition)
+            replaced = self._store(body)
+        self._respond("replace", self._write_charge(replaced), response_hook, replaced, replaced["_etag"])
+        return replaced
+
+    def upsert_item(self, body: Dict[str, Any], response_hook=None, **kwargs) -> Dict[str, Any]:
+        self._inject("upsert_item", _injected_cosmos_error)
+        with self._lock:
+            upserted = self._store(body)
+        self._respond("upsert", self._write_charge(upserted), response_hook, upserted, upserted["_etag"])
+        return upserted
+
+    def patch_item(self, item: str, partition_key: Any, patch_operations: List[Dict[str, Any]], filter_predicate: Optional[str] = None,
+                   etag: Optional[str] = None, match_condition=None, response_hook=None, **kwargs) -> Dict[str, Any]:
+        self._inject("patch_item", _injected_cosmos_error)
+        if len(patch_operations) > 10:
+            raise _cosmos_error(400, "Patch request has more than 10 operations")
+        with self._lock:
+            existing = self._get(item, partition_key)
+            self._check_etag(existing, etag, match_condition)
+            if filter_predicate:
+                _, predicate, _, _ = _compile_query(filter_predicate)
+                if not predicate(existing):
+                    raise _cosmos_error(412, "Precondition of the patch filter predicate is not met.")
+            patched = self._store(self._apply_patch(existing, patch_operations))
+        self._respond("patch", self._write_charge(patched), response_hook, patched, patched["_etag"])
+        return patched
+
+    def delete_item(self, item: str, partition_key: Any, response_hook=None, **kwargs) -> None:
+        self._inject("delete_item", _injected_cosmos_error)
+        with self._lock:
+            self._get(item, partition_key)
+            del self._items[(partition_key, item)]
+            self._changes.pop((partition_key, item), None)
+        self._respond("delete", 5.0, response_hook)
+
+    def execute_item_batch(self, batch_operations: List[tuple], partition_key: Any, response_hook=None, **kwargs) -> List[Dict[str, Any]]:
+        self._inject("execute_item_batch", _injected_cosmos_error)
+        if len(batch_operations) > 100:
+            raise _cosmos_error(400, "Batch request has more than 100 operations")
+        with self._lock:
+            # Run against a snapshot and only commit if every operation succeeds
+            items_before = dict(self._items)
+            changes_before = dict(self._changes)
+            lsn_before = self._lsn
+            results = []
+            charge = 0.0
+            for index, operation in enumerate(batch_operations):
+                kind, arguments = operation[0], operation[1]
+                options = operation[2] if len(operation) > 2 else {}
+                try:
+                    body = self._execute_batch_operation(kind, arguments, options, partition_key)
+                except cosmos_exceptions.CosmosHttpResponseError as e:
+                    self._items, self._changes, self._lsn = items_before, changes_before, lsn_before
+                    raise cosmos_exceptions.CosmosBatchOperationError(
+                        error_index=index,
+                        headers={},
+                        status_code=e.status_code,
+                        message=f"There was an error in the transactional batch on index {index}: {e.http_error_message}",
+                        operation_responses=results
+                    )
+                charge += self._write_charge(body) if body else 1.0
+                results.append({"statusCode": 200, "resourceBody": body})
+        self._respond("batch", charge, response_hook, results)
+        return results
+
+    def _execute_batch_operation(self, kind: str, arguments: tuple, options: Dict[str, Any], partition_key: Any) -> Optional[Dict[str, Any]]:
+        if_match = options.get("if_match_etag")
+        if kind == "create":
+            body = arguments[0]
+            if (partition_key, body["id"]) in self._items:
+                raise _cosmos_error(409, f"Entity with the specified id {body['id']} already exists in the system.")
+            return self._store(body)
+        if kind == "upsert":
+            return self._store(arguments[0])
+        if kind == "replace":
+            existing = self._get(arguments[0], partition_key)
+            self._check_etag(existing, if_match, True)
+            return self._store(arguments[1])
+        if kind == "patch":
+            existing = self._get(arguments[0], partition_key)
+            self._check_etag(existing, if_match, True)
+            return self._store(self._apply_patch(existing, arguments[1]))
+        if kind == "read":
+            return copy.deepcopy(self._get(arguments[0], partition_key))
+        if kind == "delete":
+            self._get(arguments[0], partition_key)
+            del self._items[(partition_key, arguments[0])]
+            return None
+        raise _cosmos_error(400, f"Unsupported batch operation {kind}")
+
+    def query_items(self, query: str, parameters: Optional[List[Dict[str, Any]]] = None, partition_key: Any = None,
+                    enable_cross_partition_query: Optional[bool] = None, max_item_count: Optional[int] = None,
+                    response_hook=None, **kwargs) -> _FakePaged:
+        top, predicate, order_by, fields = _compile_query(query, parameters)
+        page_size = max_item_count or self.PAGE_SIZE
+
+        def fetch_pages():
+            self._inject("query_items", _injected_cosmos_error)
+            with self._lock:
+                documents = [
+                    copy.deepcopy(document) for (document_partition_key, _), document in self._items.items()
+                    if (partition_key is None or document_partition_key == partition_key) and predicate(document)
+                ]
+            if order_by:
+                path, descending = order_by
+                documents.sort(key=lambda document: (path(document) is _QueryParser.UNDEFINED, str(path(document))), reverse=descending)
+            if top is not None:
+                documents = documents[:top]
+            if fields is not None:
+                documents = [{field: document[field] for field in fields if field in document} for document in documents]
+            cross_partition_charge = 0.0 if partition_key is not None else 2.0
+            for start in range(0, max(1, len(documents)), page_size):
+                page = documents[start:start + page_size]
+                self._respond("query", 2.8 + cross_partition_charge + 0.1 * len(page), response_hook, {"Documents": page})
+                yield page
+
+        paged = _FakePaged(fetch_pages)
+        if response_hook:
+            # Like the SDK, also called once with the iterator itself
+            response_hook(self.last_response_headers, paged)
+        return paged
+
+    def query_items_change_feed(self, partition_key_range_id: Optional[str] = None, is_start_from_beginning: bool = False,
+                                continuation: Optional[str] = None, max_item_count: Optional[int] = None, response_hook=None, **kwargs) -> _FakePaged:
+        page_size = max_item_count or self.PAGE_SIZE
+        with self._lock:
+            if continuation is not None:
+                start_lsn = int(continuation)
+            elif is_start_from_beginning:
+                start_lsn = 0
+            else:
+                start_lsn = self._lsn
+
+        def fetch_pages():
+            self._inject("query_items_change_feed", _injected_cosmos_error)
+            with self._lock:
+                # Like the real change feed, only the latest version of each item is returned
+                changed = sorted(
+                    (lsn, key) for key, lsn in self._changes.items() if lsn > start_lsn
+                )[:page_size]
+                page = [copy.deepcopy(self._items[key]) for _, key in changed]
+            last_lsn = changed[-1][0] if changed else start_lsn
+            headers = self._respond("change_feed", 2.0 + 0.1 * len(page), etag=str(last_lsn))
+            if response_hook:
+                response_hook(headers, {"Documents": page})
+            yield page
+
+        return _FakePaged(fetch_pages)
+
+    def _ReadPartitionKeyRanges(self, collection_link: str, **kwargs) -> List[Dict[str, Any]]:
+        return [{"id": "0", "minInclusive": "", "maxExclusive": "FF"}]
+
+
+class FakeDatabaseProxy:
+    def __init__(self, client: "FakeCosmosClient", database_id: str):
+        self.client = client
+        self.id = database_id
+
+    def get_container_client(self, container_id: str) -> FakeContainerProxy:
+        return self.client._container(self.id, container_id)
+
+    def create_container(self, id: str, partition_key=None, **kwargs) -> FakeContainerProxy:
+        with self.client._lock:
+            if (self.id, id) in self.client._containers:
+                raise _cosmos_error(409, f"Container {id} already exists")
+            return self.client._container(self.id, id)
+
+
+class FakeCosmosClient:
+    """In-memory Cosmos DB account. Containers are created on first use, like after provision()."""
+
+    def __init__(self):
+        self._databases: set = set()
+        self._containers: Dict[tuple, FakeContainerProxy] = {}
+        self._lock = threading.RLock()
+
+    def _container(self, database_id: str, container_id: str) -> FakeContainerProxy:
+        with self._lock:
+            key = (database_id, container_id)
+            if key not in self._containers:
+                self._containers[key] = FakeContainerProxy(database_id, container_id)
+            return self._containers[key]
+
+    def get_database_client(self, database_id: str) -> FakeDatabaseProxy:
+        return FakeDatabaseProxy(self, database_id)
+
+    def create_database(self, id: str, **kwargs) -> FakeDatabaseProxy:
+        with self._lock:
+            if id in self._databases:
+                raise _cosmos_error(409, f"Database {id} already exists")
+            self._databases.add(id)
+        return FakeDatabaseProxy(self, id)
+
+
+###########################################################################
+# Azure AI Search
+###########################################################################
+
+def _search_error(message: str) -> HttpResponseError:
+    return HttpResponseError(message=message)
+
+
+class _FilterParser:
+    """Interpreter for the OData filter subset used here: eq/ne, and/or/not, parentheses and search.in."""
+
+    TOKEN_PATTERN = re.compile(r"\s*(?:('(?:[^']|'')*')|(search\.in)|([(),])|([\w/]+))")
+
+    def __init__(self, expression: str):
+        self.tokens = []
+        position = 0
+        expression = expression.strip()
+        while position < len(expression):
+            match = self.TOKEN_PATTERN.match(expression, position)
+            if not match or match.end() == position:
+                raise _search_error(f"Invalid expression: unsupported filter syntax near '{expression[position:position + 20]}'")
+            string, search_in, symbol, word = match.groups()
+            if string is not None:
+                self.tokens.append(("value", string[1:-1].replace("''", "'")))
+            elif search_in:
+                self.tokens.append(("function", "search.in"))
+            elif symbol:
+                self.tokens.append(("symbol", symbol))
+            else:
+                self.tokens.append(("word", word))
+            position = match.end()
+        self.position = 0
+
+    def _peek_word(self, word: str) -> bool:
+        return self.position < len(self.tokens) and self.tokens[self.position] == ("word", word)
+
+    def _take(self, kind: Optional[str] = None):
+        if self.position >= len(self.tokens) or (kind and self.tokens[self.position][0] != kind):
+            raise _search_error("Invalid expression: unexpected end of filter")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token[1]
+
+    def parse(self) -> Callable[[Dict[str, Any]], bool]:
+        predicate = self._parse_or()
+        if self.position != len(self.tokens):
+            raise _search_error(f"Invalid expression: unexpected token {self.tokens[self.position]}")
+        return predicate
+
+    def _parse_or(self):
+        left = self._parse_and()
+        while self._peek_word("or"):
+            self._take()
+            right = self._parse_and()
+            left = (lambda l, r: lambda document: l(document) or r(document))(left, right)
+        return left
+
+    def _parse_and(self):
+        left = self._parse_term()
+        while self._peek_word("and"):
+            self._take()
+            right = self._parse_term()
+            left = (lambda l, r: lambda document: l(document) and r(document))(left, right)
+        return left
+
+    def _parse_term(self):
+        if self._peek_word("not"):
+            self._take()
+            term = self._parse_term()
+            return lambda document: not term(document)
+        token_kind, token_value = self.tokens[self.position]
+        if token_kind == "symbol" and token_value == "(":
+            self._take()
+            expression = self._parse_or()
+            self._take("symbol")
+            return expression
+        if token_kind == "function":
+            self._take()
+            self._take("symbol")
+            field = self._take("word")
+            self._take("symbol")
+            values = self._take("value")
+            delimiters = " ,"
+            if self.tokens[self.position] == ("symbol", ","):
+                self._take()
+                delimiters = self._take("value")
+            self._take("symbol")
+            allowed = {value for value in re.split("[" + re.escape(delimiters) + "]", values) if value}
+            return lambda document: document.get(field) in allowed
+        field = self._take("word")
+        operator = self._take("word")
+        value = self._take("value")
+        if operator == "eq":
+            return lambda document: document.get(field) == value
+        if operator == "ne":
+            return lambda document: document.get(field) != value
+        raise _search_error(f"Invalid expression: unsupported operator {operator}")
+
+
+class _IndexingResult:
+    def __init__(self, key: str, succeeded: bool = True, status_code: int = 200):
+        self.key = key
+        self.succeeded = succeeded
+        self.status_code = status_code
+
+
+class FakeSearchClient:
+    """In-memory search index with the SearchClient methods the processor calls."""
+
+    _indexes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    _indexes_lock = threading.Lock()
+
+    def __init__(self, index_name: str, key_field: str = "id"):
+        self._index_name = index_name
+        self.key_field = key_field
+        # Fields order_by accepts; None accepts any, an empty set mimics an index without sortable fields
+        self.sortable_fields: Optional[set] = None
+        self._inject = get_injector("search")
+        with self._indexes_lock:
+            self._documents = self._indexes.setdefault(index_name, {})
+
+    def search(self, search_text: Optional[str] = None, filter: Optional[str] = None, select: Optional[Union[str, List[str]]] = None,
+               top: Optional[int] = None, skip: Optional[int] = None, **kwargs) -> Iterator[Dict[str, Any]]:
+        self._inject("search", _search_error)
+        predicate = _FilterParser(filter).parse() if filter else (lambda document: True)
+        fields = [field.strip() for field in select.split(",")] if isinstance(select, str) else select
+        with self._indexes_lock:
+            matches = [copy.deepcopy(document) for document in self._documents.values() if predicate(document)]
+        if search_text and search_text != "*":
+            terms = search_text.lower().split()
+            matches = [document for document in matches if any(term in json.dumps(document).lower() for term in terms)]
+        # Applied last key first, so earlier expressions take precedence
+        for expression in reversed(kwargs.get("order_by") or []):
+            field, _, direction = expression.strip().partition(" ")
+            if self.sortable_fields is not None and field not in self.sortable_fields:
+                error = _search_error(f"Invalid expression: The property '{field}' is not sortable.")
+                error.status_code = 400
+                raise error
+            matches.sort(key=lambda document: (document.get(field) is None, document.get(field)),
+                         reverse=direction.strip().lower() == "desc")
+        if skip:
+            matches = matches[skip:]
+        if top is not None:
+            matches = matches[:top]
+        results = []
+        for document in matches:
+            if fields:
+                document = {field: document.get(field) for field in fields}
+            document["@search.score"] = 1.0
+            results.append(document)
+        return iter(results)
+
+    def get_document(self, key: str, selected_fields: Optional[List[str]] = None, **kwargs) -> Dict[str, Any]:
+        self._inject("get_document", _search_error)
+        with self._indexes_lock:
+            if key not in self._documents:
+                raise ResourceNotFoundError(message=f"Document {key} not found")
+            return copy.deepcopy(self._documents[key])
+
+    def _write(self, operation: str, documents: List[Dict[str, Any]], merge: bool) -> List[_IndexingResult]:
+        self._inject(operation, _search_error)
+        results = []
+        with self._indexes_lock:
+            for document in documents:
+                key = document[self.key_field]
+                if merge and key in self._documents:
+                    self._documents[key].update(copy.deepcopy(document))
+                else:
+                    self._documents[key] = copy.deepcopy(document)
+                results.append(_IndexingResult(key))
+        return results
+
+    def upload_documents(self, documents: List[Dict[str, Any]], **kwargs) -> List[_IndexingResult]:
+        return self._write("upload_documents", documents, merge=False)
+
+    def merge_or_upload_documents(self, documents: List[Dict[str, Any]], **kwargs) -> List[_IndexingResult]:
+        return self._write("merge_or_upload_documents", documents, merge=True)
+
+    def delete_documents(self, documents: List[Dict[str, Any]], **kwargs) -> List[_IndexingResult]:
+        self._inject("delete_documents", _search_error)
+        with self._indexes_lock:
+            for document in documents:
+                self._documents.pop(document[self.key_field], None)
+        return [_IndexingResult(document[self.key_field]) for document in documents]
+
+    def get_document_count(self, **kwargs) -> int:
+        with self._indexes_lock:
+            return len(self._documents)
+
+
+###########################################################################
+# Blob Storage
+###########################################################################
+
+def _blob_error(message: str) -> HttpResponseError:
+    return HttpResponseError(message=message)
+
+
+class _FakeDownloader:
+    def __init__(self, data: bytes):
+        self._data = data
+        self.size = len(data)
+
+    def readall(self) -> bytes:
+        return self._data
+
+    def readinto(self, stream) -> int:
+        stream.write(self._data)
+        return len(self._data)
+
+
+class FakeBlobClient:
+    def __init__(self, store: Dict[str, bytes], lock: threading.Lock, container_name: str, blob_name: str):
+        self._store = store
+        self._lock = lock
+        self.container_name = container_name
+        self.blob_name = blob_name
+        self._inject = get_injector("blob")
+
+    def exists(self, **kwargs) -> bool:
+        self._inject("exists", _blob_error)
+        with self._lock:
+            return self.blob_name in self._store
+
+    def download_blob(self, **kwargs) -> _FakeDownloader:
+        self._inject("download_blob", _blob_error)
+        with self._lock:
+            if self.blob_name not in self._store:
+                raise ResourceNotFoundError(message=f"The specified blob {self.blob_name} does not exist.")
+            return _FakeDownloader(self._store[self.blob_name])
+
+    def upload_blob(self, data, overwrite: bool = False, **kwargs) -> Dict[str, Any]:
+        self._inject("upload_blob", _blob_error)
+        if hasattr(data, "read"):
+            data = data.read()
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        with self._lock:
+            if self.blob_name in self._store and not overwrite:
+                raise ResourceExistsError(message=f"The specified blob {self.blob_name} already exists.")
+            self._store[self.blob_name] = bytes(data)
+        return {"etag": f'"{uuid.uuid4()}"'}
+
+    def delete_blob(self, **kwargs) -> None:
+        self._inject("delete_blob", _blob_error)
+        with self._lock:
+            if self._store.pop(self.blob_name, None) is None:
+                raise ResourceNotFoundError(message=f"The specified blob {self.blob_name} does not exist.")
+
+
+class FakeBlobContainerClient:
+    def __init__(self, store: Dict[str, bytes], lock: threading.Lock, container_name: str):
+        self._store = store
+        self._lock = lock
+        self.container_name = container_name
+
+    def get_blob_client(self, blob: str) -> FakeBlobClient:
+        return FakeBlobClient(self._store, self._lock, self.container_name, blob)
+
+    def upload_blob(self, name: str, data, overwrite: bool = False, **kwargs) -> FakeBlobClient:
+        blob_client = self.get_blob_client(name)
+        blob_client.upload_blob(data, overwrite=overwrite)
+        return blob_client
+
+    def list_blobs(self, name_starts_with: Optional[str] = None, **kwargs) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"name": name, "size": len(data)} for name, data in self._store.items() if not name_starts_with or name.startswith(name_starts_with)]
+
+
+class FakeBlobServiceClient:
+    """In-memory storage account shared by every client in the process."""
+
+    _containers: Dict[str, Dict[str, bytes]] = {}
+    _lock = threading.Lock()
+
+    def get_container_client(self, container: str) -> FakeBlobContainerClient:
+        with self._lock:
+            store = self._containers.setdefault(container, {})
+        return FakeBlobContainerClient(store, self._lock, container)
+
+
+###########################################################################
+# Communication Services email
+###########################################################################
+
+class _FakePoller:
+    def __init__(self, result: Dict[str, Any]):
+        self._result = result
+
+    def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        return self._result
+
+    def done(self) -> bool:
+        return True
+
+
+class FakeEmailClient:
+    """Accepts every message and keeps it in a process-wide outbox instead of sending it."""
+
+    outbox: List[Dict[str, Any]] = []
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self._inject = get_injector("email")
+
+    def begin_send(self, message: Dict[str, Any], **kwargs) -> _FakePoller:
+        self._inject("begin_send", lambda text: HttpResponseError(message=text))
+        message_id = str(uuid.uuid4())
+        with self._lock:
+            self.outbox.append({"id": message_id, "message": copy.deepcopy(message), "sent_at": time.time()})
+        return _FakePoller({"id": message_id, "status": "Succeeded", "error": None})
+
+
+###########################################################################
+# Azure OpenAI
+###########################################################################
+
+def _injected_openai_error(message: str) -> FakeServiceError:
+    return FakeServiceError(message)
+
+
+def _messages_text(messages: List[Any]) -> str:
+    parts = []
+    for message in messages:
+        content = message.get("content") if isinstance(message, dict) else getattr(message, "content", str(message))
+        parts.append(content if isinstance(content, str) else json.dumps(content))
+    return "\n".join(parts)
+
+
+def _user_text(messages: List[Any]) -> str:
+    for message in reversed(messages):
+        role = message.get("role") if isinstance(message, dict) else getattr(message, "type", "")
+        if role in ("user", "human"):
+            return message.get("content") if isinstance(message, dict) else message.content
+    return _messages_text(messages)
+
+
+def _synthetic_text(field: str, prompt: str, length: int = 400) -> str:
+    """Deterministic filler text for a generated field, sized like a real completion."""
+    digest = hashlib.sha256(f"{field}:{prompt}".encode("utf-8")).hexdigest()
+    if field in ("title", "project_name"):
+        return f"Project {digest[:6].upper()}"
+    sentence = f"Delivered {field.replace('_', ' ')} work item {digest[:8]} with measurable outcomes for the client. "
+    return (sentence * (length // len(sentence) + 1))[:length].strip()
+
+
+def _insertion_phrase(document_text: str) -> str:
+    """Pick the line a new project would be inserted before: the first entry under an experience heading."""
+    lines = [line.strip() for line in document_text.splitlines() if line.strip()]
+    for index, line in enumerate(lines):
+        if len(line) < 40 and "experience" in line.lower() and index + 1 < len(lines):
+            return lines[index + 1]
+    return lines[-1] if lines else ""
+
+
+def _generate_fields(field_names: List[str], messages: List[Any]) -> Dict[str, str]:
+    prompt = _messages_text(messages)
+    values = {}
+    for field in field_names:
+        if field == "start_phrase":
+            values[field] = _insertion_phrase(_user_text(messages))
+        else:
+            values[field] = _synthetic_text(field, prompt)
+    return values
+
+
+class _Usage:
+    def __init__(self, prompt: str, completion: str):
+        self.prompt_tokens = _estimate_tokens(prompt)
+        self.completion_tokens = _estimate_tokens(completion)
+        self.total_tokens = self.prompt_tokens + self.completion_tokens
+
+
+class FakeAIMessage:
+    """Shaped like a langchain AIMessage."""
+
+    def __init__(self, content: str, usage: _Usage):
+        self.content = content
+        self.usage_metadata = {"input_tokens": usage.prompt_tokens, "output_tokens": usage.completion_tokens, "total_tokens": usage.total_tokens}
+        self.response_metadata = {"token_usage": {"prompt_tokens": usage.prompt_tokens, "completion_tokens": usage.completion_tokens, "total_tokens": usage.total_tokens}}
+
+
+class FakeChatModel:
+    """
+    Stand-in for AzureChatOpenAI.invoke. With a json_schema response format it returns an object
+    with every required property; otherwise it answers with plain_text_answer ("no" by default,
+    which is what the project-on-resume check expects when a project is new).
+    """
+
+    def __init__(self, temperature: float = 0.0, json_schema: Optional[Dict[str, Any]] = None, plain_text_answer: str = "no",
+                 responder: Optional[Callable[[List[Any]], str]] = None):
+        self.temperature = temperature
+        self.json_schema = json_schema
+        self.plain_text_answer = plain_text_answer
+        self.responder = responder
+        self._inject = get_injector("openai")
+
+    def invoke(self, messages: List[Any], **kwargs) -> FakeAIMessage:
+        self._inject("chat", _injected_openai_error)
+        if self.responder:
+            content = self.responder(messages)
+        elif self.json_schema:
+            schema = self.json_schema.get("schema", {})
+            content = json.dumps(_generate_fields(schema.get("required", list(schema.get("properties", {}))), messages))
+        else:
+            content = self.plain_text_answer
+        return FakeAIMessage(content, _Usage(_messages_text(messages), content))
+
+
+class _ParsedMessage:
+    def __init__(self, content: str, parsed: Any):
+        self.role = "assistant"
+        self.content = content
+        self.parsed = parsed
+        self.refusal = None
+
+
+class _Choice:
+    def __init__(self, message: _ParsedMessage):
+        self.index = 0
+        self.message = message
+        self.finish_reason = "stop"
+
+
+class _Completion:
+    def __init__(self, model: str, message: _ParsedMessage, usage: _Usage):
+        self.id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        self.model = model
+        self.choices = [_Choice(message)]
+        self.usage = usage
+
+
+class _FakeCompletions:
+    def __init__(self, client: "FakeOpenAIClient"):
+        self._client = client
+
+    def parse(self, model: str, messages: List[Dict[str, Any]], response_format: Any = None, **kwargs) -> _Completion:
+        self._client._inject("chat.completions.parse", _injected_openai_error)
+        fields = getattr(response_format, "model_fields", None) or getattr(response_format, "__fields__", {})
+        values = _generate_fields(list(fields), messages)
+        content = json.dumps(values)
+        parsed = response_format(**values) if response_format else None
+        return _Completion(model, _ParsedMessage(content, parsed), _Usage(_messages_text(messages), content))
+
+    def create(self, model: str, messages: List[Dict[str, Any]], **kwargs) -> _Completion:
+        self._client._inject("chat.completions.create", _injected_openai_error)
+        content = "no"
+        return _Completion(model, _ParsedMessage(content, None), _Usage(_messages_text(messages), content))
+
+
+class _FakeChat:
+    def __init__(self, client: "FakeOpenAIClient"):
+        self.completions = _FakeCompletions(client)
+
+
+class _FakeBeta:
+    def __init__(self, client: "FakeOpenAIClient"):
+        self.chat = _FakeChat(client)
+
+
+class FakeOpenAIClient:
+    """Stand-in for openai.AzureOpenAI: chat.completions.create and beta.chat.completions.parse."""
+
+    def __init__(self):
+        self._inject = get_injector("openai")
+        self.chat = _FakeChat(self)
+        self.beta = _FakeBeta(self)
+
+
+class FakeEmbeddings:
+    """
+    Stand-in for AzureOpenAIEmbeddings: deterministic unit vectors built by hashing the text's
+    words into the dimensions, so texts that share words are similar (as the project pre-screen
+    expects) and identical texts have similarity 1.
+    """
+
+    def __init__(self, dimensions: int = 1536):
+        self.dimensions = dimensions
+        self._inject = get_injector("embeddings")
+
+    def _vector(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for word in re.findall(r"\w+", text.lower()):
+            digest = hashlib.sha256(word.encode("utf-8")).digest()
+            index = int.from_bytes(digest[:4], "big") % self.dimensions
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def embed_query(self, text: str) -> List[float]:
+        self._inject("embed_query", _injected_openai_error)
+        return self._vector(text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self._inject("embed_documents", _injected_openai_error)
+        return [self._vector(text) for text in texts]
+
+
+###########################################################################
+# Seed data
+###########################################################################
+
+def build_resume_docx(name: str, projects: List[str]) -> bytes:
+    """Build a small resume document with a Project Experience section."""
+    from docx import Document
+
+    document = Document()
+    document.add_heading(name, level=1)
+    document.add_paragraph("Professional Summary")
+    document.add_paragraph(f"{name} is an engineer with experience delivering public infrastructure projects.")
+    document.add_paragraph("Project Experience")
+    for project in projects:
+        document.add_paragraph(project)
+        document.add_paragraph("")
+    document.add_paragraph("Education")
+    document.add_paragraph("B.S. Civil Engineering")
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def seed_employee(processor, employee_id: str, name: str, email: str, existing_projects: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Give an employee metadata, a resume in the resumes index and its document in blob storage."""
+    existing_projects = existing_projects or [
+        f"Project Engineer, Riverside Transit Hub {index}, Denver, CO (2019 to 2021). Coordinated design reviews and site inspections."
+        for index in range(1, 4)
+    ]
+    resume_name = f"{employee_id}.docx"
+    container_client = processor.blob_service_client.get_container_client(processor.resume_container_name)
+    container_client.upload_blob(f"{processor.input_resumes_folder}/{resume_name}", build_resume_docx(name, existing_projects), overwrite=True)
+
+    resume = {
+        "id": f"resume-{employee_id}",
+        "employee_id": employee_id,
+        "jobTitle": "Engineer",
+        "experienceLevel": "Senior",
+        "content": "\n".join([name, "Project Experience"] + existing_projects),
+        "sourceFileName": resume_name,
+    }
+    processor.search_client_resumes.upload_documents(documents=[resume])
+
+    metadata = {
+        "id": f"metadata-{employee_id}",
+        "partitionKey": processor.partition_router.partition_key("employee_metadata", employee_id),
+        "employee_id": employee_id,
+        "email": email,
+        "name": name,
+    }
+    processor.employee_metadata_container.upsert_item(metadata)
+    processor.employee_cache.invalidate(employee_id)
+    return resume
+
+
+def seed_project(processor, project_number: str, text: str, chunk_size: int = 250) -> None:
+    """Index a project description as pages, the way scripts/project-indexing.py does."""
+    words = text.split()
+    pages = [" ".join(words[start:start + chunk_size]) for start in range(0, len(words), chunk_size)] or [""]
+    indexed_at = datetime.now(timezone.utc).isoformat()
+    processor.search_client_projects.upload_documents(documents=[
+        {
+            "id": f"{project_number}-page-{page_number}",
+            "project_number": project_number,
+            "content": content,
+            "sourcefilename": f"{project_number}.txt",
+            "sourcepage": page_number,
+            "date": indexed_at,
+        }
+        for page_number, content in enumerate(pages, start=1)
+    ])
+
+
+def seed_sample_data(processor, sample_data_dir: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Load sample_data into the fakes: employee metadata, a resume for every employee in the
+    sample events and a description for every project (project_N.txt assigned in order).
+    """
+    sample_data_dir = sample_data_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample_data")
+
+    metadata_by_employee = {}
+    for path in sorted(glob.glob(os.path.join(sample_data_dir, "employee_metadata", "*.json"))):
+        with open(path, "r") as f:
+            metadata = json.load(f)
+        metadata_by_employee[metadata["employee_id"]] = metadata
+
+    events = []
+    for path in sorted(glob.glob(os.path.join(sample_data_dir, "events", "*.json"))):
+        with open(path, "r") as f:
+            events.append(json.load(f))
+
+    employee_ids = []
+    project_numbers = []
+    for event in events:
+        employee_id = event["employee_display_name"].split(" - ")[1]
+        if employee_id not in employee_ids:
+            employee_ids.append(employee_id)
+        if event["project_number"] not in project_numbers:
+            project_numbers.append(event["project_number"])
+
+    for employee_id in employee_ids:
+        metadata = metadata_by_employee.get(employee_id, {})
+        seed_employee(processor, employee_id, metadata.get("name", f"Employee {employee_id}"), metadata.get("email", f"{employee_id}@example.com"))
+
+    project_files = sorted(glob.glob(os.path.join(sample_data_dir, "projects", "*.txt")))
+    for index, project_number in enumerate(project_numbers):
+        with open(project_files[index % len(project_files)], "r") as f:
+            seed_project(processor, project_number, f.read())
+
+    return {"employees": employee_ids, "projects": project_numbers}
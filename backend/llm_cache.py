@@ -0,0 +1,304 @@
+"""
+### llm_cache.py ###
+
+Content-addressed cache of LLM responses for deterministic (temperature 0) prompts.
+
+The insertion-position analysis and the title/description parse are asked the same questions
+over and over: the same resume is analysed on every save, and re-saving an unchanged
+description parses it again. At temperature 0 the answer is a function of the request, so
+it is cached under a hash of everything that determines it:
+
+    deployment, response schema, every message's role and content, and LLM_CACHE_NAMESPACE
+
+Change LLM_CACHE_NAMESPACE to drop every cached answer at once, e.g. after a model upgrade
+behind an unchanged deployment name. Prompt changes need nothing: a new prompt is a new key.
+
+Calls at any other temperature bypass the cache (LLMResponseCache.cached counts them as
+"bypassed"); sampling is what those callers want.
+
+Lookups go through a small in-process LRU, then a store:
+    DiskStore     JSON files under LLM_CACHE_DIR, least recently used removed beyond
+                  LLM_CACHE_MAX_BYTES. Per instance; the default.
+    CosmosStore   the llm_cache container (partition key /partitionKey), shared by every
+                  instance. Entries expire through Cosmos DB's per-item TTL, which needs the
+                  container's default TTL turned on (-1 is enough).
+
+Every lookup runs in an "llm_cache.get" span whose cache.hit attribute sums to "cache_hits"
+in tracing.get_metrics_snapshot(), so the hit rate is cache_hits / count. stats() has the
+per-layer counters.
+
+Configuration (environment):
+    LLM_CACHE_STORE           disk (default), cosmos or none
+    LLM_CACHE_DIR             DiskStore directory (default <tmp>/llm_cache)
+    LLM_CACHE_MAX_BYTES       DiskStore size bound (default 256 MB)
+    LLM_CACHE_TTL_SECONDS     CosmosStore entry lifetime (default 30 days)
+    LLM_CACHE_MEMORY_ENTRIES  in-process LRU entries (default 512)
+    LLM_CACHE_NAMESPACE       mixed into every key (default "v1")
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MEMORY_ENTRIES = 512
+COSMOS_CONTAINER_ID = "llm_cache"
+
+
+def cache_key(deployment: str, schema: Optional[str], messages: List[Dict[str, Any]], namespace: str = "") -> str:
+    """Hash of everything that determines a temperature-0 response."""
+    material = json.dumps({
+        "namespace": namespace,
+        "deployment": deployment or "",
+        "schema": schema or "",
+        "messages": [[message.get("role"), message.get("content")] for message in messages],
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class DiskStore:
+    """One JSON file per key, bounded in total size by evicting the least recently used files."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # key -> size in bytes, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self.evictions = 0
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load_index(self) -> None:
+        # Files from earlier runs, oldest access first
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[:-len(".json")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        try:
+            # The modification time orders eviction across restarts
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # Readers never see a partly written file
+        os.replace(temp_path, self._path(key))
+        evicted = []
+        with self._lock:
+            self._total_bytes += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            while self._total_bytes > self.max_bytes and len(self._index) > 1:
+                old_key, size = self._index.popitem(last=False)
+                self._total_bytes -= size
+                self.evictions += 1
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._index), "bytes": self._total_bytes, "evictions": self.evictions}
+
+
+class CosmosStore:
+    """Entries in a Cosmos DB container, one partition per key, expired by per-item TTL."""
+
+    def __init__(self, container, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        """
+        Args:
+            container: CosmosDBManager of the llm_cache container
+            ttl_seconds: Lifetime of an entry since it was written
+        """
+        self.container = container
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[Any]:
+        item = self.container.read_item(key, key)
+        return item.get("value") if item else None
+
+    def put(self, key: str, value: Any) -> None:
+        self.container.upsert_item({"id": key, "partitionKey": key, "value": value, "ttl": self.ttl_seconds})
+
+    def stats(self) -> Dict[str, Any]:
+        return {"ttl_seconds": self.ttl_seconds}
+
+
+class LLMResponseCache:
+    def __init__(self, store: Optional[Any], memory_entries: int = DEFAULT_MEMORY_ENTRIES, namespace: str = ""):
+        """
+        Args:
+            store: A DiskStore, a CosmosStore or anything with get(key) and put(key, value);
+                   None keeps responses in memory only
+            memory_entries: Size of the in-process LRU in front of the store
+            namespace: Mixed into every key
+        """
+        self.store = store
+        self.memory_entries = memory_entries
+        self.namespace = namespace
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "store_hits": 0, "misses": 0, "bypassed": 0, "store_errors": 0}
+
+    def cached(self, deployment: str, schema: Optional[str], messages: List[Dict[str, Any]], temperature: float,
+               compute: Callable[[], Any]) -> Any:
+        """
+        Get the response to a request from the cache, or compute and cache it.
+
+        Args:
+            deployment: The model deployment the request goes to
+            schema: Name of the structured-output schema, if any
+            messages: The chat messages
+            temperature: The request's temperature; anything but 0 bypasses the cache
+            compute: Makes the call; returns a JSON-serializable response, or None on failure
+                     (which is not cached)
+
+        Returns:
+            The cached or computed response
+        """
+        if temperature != 0:
+            self._count("bypassed")
+            return compute()
+
+        key = cache_key(deployment, schema, messages, self.namespace)
+        with tracing.span("llm_cache.get", kind="internal", attributes={"cache.schema": schema or ""}) as span:
+            found, value = self._lookup(key)
+            span.set_attribute("cache.hit", int(found))
+        if found:
+            return value
+
+        value = compute()
+        if value is not None:
+            self._remember(key, value)
+            if self.store is not None:
+                try:
+                    self.store.put(key, value)
+                except Exception as e:
+                    self._count("store_errors")
+                    logger.warning("Could not write LLM response cache entry: %s", e)
+        return value
+
+    def _lookup(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return True, self._memory[key]
+        value = None
+        if self.store is not None:
+            try:
+                value = self.store.get(key)
+            except Exception as e:
+                self._count("store_errors")
+                logger.warning("Could not read LLM response cache entry: %s", e)
+        if value is None:
+            self._count("misses")
+            return False, None
+        self._count("store_hits")
+        self._remember(key, value)
+        return True, value
+
+    def _remember(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-layer hit counters, the hit rate over cacheable lookups and the store's own stats."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+        hits = stats["memory_hits"] + stats["store_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        if self.store is not None and hasattr(self.store, "stats"):
+            stats["store"] = self.store.stats()
+        return stats
+
+
+def store_from_env() -> Optional[Any]:
+    """Build the store selected by LLM_CACHE_STORE."""
+    kind = os.environ.get("LLM_CACHE_STORE", "disk")
+    if kind == "none":
+        return None
+    if kind == "disk":
+        directory = os.environ.get("LLM_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "llm_cache")
+        return DiskStore(directory, int(os.environ.get("LLM_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)))
+    if kind == "cosmos":
+        import backends
+        return CosmosStore(backends.cosmos_container(COSMOS_CONTAINER_ID),
+                           int(os.environ.get("LLM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)))
+    raise ValueError(f"Unknown LLM_CACHE_STORE '{kind}', expected disk, cosmos or none")
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get the process-wide cache, building it from the environment on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache(
+                store_from_env(),
+                memory_entries=int(os.environ.get("LLM_CACHE_MEMORY_ENTRIES", DEFAULT_MEMORY_ENTRIES)),
+                namespace=os.environ.get("LLM_CACHE_NAMESPACE", "v1"),
+            )
+        return _cache
+
+
+def reset_llm_cache() -> None:
+    global _cache
+    with _cache_lock:
+        _cache = None
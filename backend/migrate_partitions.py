@@ -0,0 +1,185 @@
+"""
+### migrate_partitions.py ###
+
+Online migration of resume_trackers, notifications and employee_metadata from their single
+legacy partition ("resumeupdatestatus", "notifications", "metadata") to per-employee partitions.
+
+Cutover:
+    1. Deploy with COSMOS_PARTITION_MODE=dual. New writes go to employee partitions and reads
+       fall back to the legacy partition, moving documents over as they are touched.
+    2. Run this tool. It copies every remaining legacy document into its employee partition
+       (in parallel, never overwriting a document that already exists there), then verifies
+       counts and per-document checksums.
+    3. Re-run with --delete-source once verification is clean to empty the legacy partitions.
+    4. Switch to COSMOS_PARTITION_MODE=employee.
+
+Usage:
+    python migrate_partitions.py
+    python migrate_partitions.py --containers resume_trackers --workers 32
+    python migrate_partitions.py --verify-only
+    python migrate_partitions.py --delete-source
+"""
+
+import argparse
+import hashlib
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from cosmosdb import CosmosDBManager
+from partitioning import LEGACY_PARTITION_KEYS, PartitionRouter, strip_system_fields
+
+DATABASE_ID = "ResumeAutomation"
+
+
+def document_checksum(item: Dict[str, Any]) -> str:
+    """Checksum of a document's content, ignoring system fields and its partition key."""
+    content = strip_system_fields(item)
+    content.pop('partitionKey', None)
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def run_bounded(function: Callable, items: Iterable, workers: int) -> Iterator:
+    """Map function over items on a thread pool, in order, with at most 2x workers items in flight."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for item in items:
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+            in_flight.append(executor.submit(function, item))
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+class PartitionMigration:
+    def __init__(self, container_id: str, workers: int = 16):
+        self.container_id = container_id
+        self.workers = workers
+        self.legacy_partition_key = LEGACY_PARTITION_KEYS[container_id]
+        self.container = CosmosDBManager(cosmos_database_id=DATABASE_ID, cosmos_container_id=container_id)
+        # The target scheme is always per-employee, whatever mode the services run in
+        self.router = PartitionRouter(mode="employee")
+
+    def _legacy_items(self) -> Iterator[Dict[str, Any]]:
+        return self.container.iter_items(query="SELECT * FROM c", partition_key=self.legacy_partition_key)
+
+    def copy(self) -> Dict[str, int]:
+        """Copy every legacy document into its employee partition."""
+        summary = {"source": 0, "copied": 0, "already_present": 0, "skipped_no_employee_id": 0, "failed": 0}
+
+        def copy_item(item: Dict[str, Any]) -> str:
+            employee_id = item.get('employee_id')
+            if not employee_id:
+                return "skipped_no_employee_id"
+            target = strip_system_fields(item)
+            target['partitionKey'] = self.router.partition_key(self.container_id, employee_id)
+            if self.container.read_item(item['id'], target['partitionKey']) is not None:
+                # Written or promoted by a service running in dual mode; it is newer than ours
+                return "already_present"
+            if self.container.create_item(target) is not None:
+                return "copied"
+            if self.container.read_item(item['id'], target['partitionKey']) is not None:
+                return "already_present"
+            return "failed"
+
+        for outcome in run_bounded(copy_item, self._legacy_items(), self.workers):
+            summary["source"] += 1
+            summary[outcome] += 1
+        return summary
+
+    def verify(self) -> Dict[str, Any]:
+        """
+        Compare every legacy document with its copy. Copies with a higher version were updated
+        through dual mode after the copy and are reported separately, not as mismatches.
+        """
+        summary = {"source": 0, "matched": 0, "changed_since_copy": 0, "mismatched": 0, "missing": 0}
+        source_digest = 0
+        target_digest = 0
+        mismatched_ids: List[str] = []
+
+        def verify_item(item: Dict[str, Any]):
+            employee_id = item.get('employee_id')
+            target = None
+            if employee_id:
+                target = self.container.read_item(item['id'], self.router.partition_key(self.container_id, employee_id))
+            return item, target
+
+        for item, target in run_bounded(verify_item, self._legacy_items(), self.workers):
+            summary["source"] += 1
+            source_checksum = document_checksum(item)
+            source_digest ^= int(source_checksum, 16)
+            if target is None:
+                summary["missing"] += 1
+                mismatched_ids.append(item['id'])
+                continue
+            target_checksum = document_checksum(target)
+            target_digest ^= int(target_checksum, 16)
+            if source_checksum == target_checksum:
+                summary["matched"] += 1
+            elif target.get('version', 0) > item.get('version', 0) or target.get('last_updated', '') > item.get('last_updated', ''):
+                summary["changed_since_copy"] += 1
+            else:
+                summary["mismatched"] += 1
+                mismatched_ids.append(item['id'])
+
+        summary["source_checksum"] = f"{source_digest:064x}"
+        summary["target_checksum"] = f"{target_digest:064x}"
+        summary["mismatched_ids"] = mismatched_ids[:100]
+        summary["ok"] = summary["missing"] == 0 and summary["mismatched"] == 0
+        return summary
+
+    def delete_source(self) -> Dict[str, int]:
+        """Delete legacy documents whose copy exists in the employee partition."""
+        summary = {"deleted": 0, "kept": 0}
+
+        def delete_item(item: Dict[str, Any]) -> str:
+            employee_id = item.get('employee_id')
+            if not employee_id:
+                return "kept"
+            if self.container.read_item(item['id'], self.router.partition_key(self.container_id, employee_id)) is None:
+                return "kept"
+            return "deleted" if self.container.delete_item(item['id'], self.legacy_partition_key) else "kept"
+
+        for outcome in run_bounded(delete_item, self._legacy_items(), self.workers):
+            summary[outcome] += 1
+        return summary
+
+
+def migrate(container_id: str, workers: int, verify_only: bool, delete_source: bool) -> Dict[str, Any]:
+    migration = PartitionMigration(container_id, workers)
+    result: Dict[str, Any] = {"container": container_id}
+    if not verify_only:
+        result["copy"] = migration.copy()
+    result["verify"] = migration.verify()
+    if delete_source:
+        if result["verify"]["ok"]:
+            result["delete"] = migration.delete_source()
+        else:
+            print(f"Verification of {container_id} failed; legacy documents were not deleted")
+    result["request_charges"] = migration.container.get_request_charges()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move employee-scoped documents from legacy partitions to per-employee partitions.")
+    parser.add_argument("--containers", nargs="+", choices=list(LEGACY_PARTITION_KEYS), default=list(LEGACY_PARTITION_KEYS))
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent document operations per container")
+    parser.add_argument("--verify-only", action="store_true", help="Only compare legacy documents with their copies")
+    parser.add_argument("--delete-source", action="store_true", help="Delete legacy documents after a clean verification")
+    args = parser.parse_args()
+
+    # Containers are migrated in parallel, each with its own pool of workers
+    with ThreadPoolExecutor(max_workers=len(args.containers)) as executor:
+        results = list(executor.map(
+            lambda container_id: migrate(container_id, args.workers, args.verify_only, args.delete_source),
+            args.containers
+        ))
+
+    print(json.dumps(results, indent=2))
+    if not all(result["verify"]["ok"] for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+### notification_templates.py ###
+
+Notification email templates, compiled once at import and filled per recipient.
+
+Every notification kind shares one HTML layout (styles, header, footer) and only supplies its
+own subject, heading, paragraphs and button. Compiling a template renders the layout with the
+kind's content and splits the result into literal parts and field slots, so filling it for a
+recipient is a single join over a short list rather than re-rendering the whole document.
+
+Templates use {{ name }} slots; the layout's CSS keeps its single braces. Values are
+HTML-escaped in the HTML body, except fields whose name ends in _html, which are inserted as is.
+The rendered content is cached per set of field values: the review link is the same for every
+recipient, so a notification run renders each kind once and only the recipient address differs
+between messages.
+
+Kinds:
+    first_notice   a new draft is ready for review (sent when a draft is generated)
+    reminder       updates are still waiting for review (recurring notification job)
+    digest         a summary of every pending update; needs pending_count, pending_items_html
+                   and pending_items_text
+"""
+
+import html
+import os
+import re
+from typing import Any, Dict, List, Tuple
+
+# Overridden by EMAIL_SENDER_ADDRESS, read per message so it can be loaded from .env after import
+DEFAULT_SENDER_ADDRESS = "DoNotReply@5fec6054-f6e1-4926-9c37-029ca719c8ae.azurecomm.net"
+
+FOOTER_TEXT = "This is an automated message. Please do not reply to this email."
+
+_SLOT = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+_LAYOUT_HTML = """
+<html>
+    <head>
+        <style>
+            body {
+                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Arial, sans-serif;
+                line-height: 1.6;
+                margin: 0;
+                padding: 0;
+                background-color: #ffffff;
+            }
+            .container {
+                max-width: 600px;
+                margin: 0 auto;
+                background: #ffffff;
+            }
+            .header {
+                background-color: #003087;
+                padding: 20px;
+                text-align: left;
+            }
+            .header h1 {
+                margin: 0;
+                color: #ffffff;
+                font-size: 20px;
+                font-weight: 500;
+            }
+            .content {
+                padding: 40px 20px;
+                color: #333333;
+            }
+            .button {
+                display: inline-block;
+                background-color: #7AC143;
+                color: #ffffff;
+                padding: 10px 24px;
+                text-decoration: none;
+                border-radius: 4px;
+                font-weight: 500;
+                margin-top: 20px;
+            }
+            .footer {
+                padding: 20px;
+                color: #666666;
+                font-size: 14px;
+                border-top: 1px solid #eeeeee;
+            }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>{{ heading }}</h1>
+            </div>
+            <div class="content">
+                <p>Hello,</p>
+{{ content }}
+                <a href="{{ review_link }}" class="button">{{ button }}</a>
+            </div>
+            <div class="footer">
+                {{ footer }}
+            </div>
+        </div>
+    </body>
+</html>"""
+
+# Per-kind content. Paragraphs may contain {{ field }} slots, filled per recipient.
+KINDS: Dict[str, Dict[str, Any]] = {
+    "first_notice": {
+        "subject": "Resume Update Ready for Review",
+        "heading": "📄 New Resume Update Ready",
+        "paragraphs": [
+            "A new update to your resume has been drafted from your recent project work. Please review and approve it to keep your resume current.",
+        ],
+        "text_link": "Review your update here: {{ review_link }}",
+        "button": "Review Update",
+    },
+    "reminder": {
+        "subject": "Resume Update Required",
+        "heading": "📄 Resume Update Review Required",
+        "paragraphs": [
+            "You have a pending resume update that requires your review. Please take a moment to review and approve these updates to keep your resume current.",
+        ],
+        "text_link": "Review your updates here: {{ review_link }}",
+        "button": "Review Updates Now",
+    },
+    "digest": {
+        "subject": "Your Pending Resume Updates",
+        "heading": "📄 Pending Resume Updates",
+        "paragraphs": [
+            "You have {{ pending_count }} resume updates waiting for your review:",
+        ],
+        "extra_html": "{{ pending_items_html }}",
+        "text_paragraphs": [
+            "You have {{ pending_count }} resume updates waiting for your review:",
+            "{{ pending_items_text }}",
+        ],
+        "text_link": "Review them here: {{ review_link }}",
+        "button": "Review Updates",
+    },
+}
+
+# Rendered content per (kind, field values); bounded so per-recipient fields cannot grow it forever
+MAX_CACHED_RENDERINGS = 256
+
+
+class CompiledTemplate:
+    """A template split into literal parts and {{ field }} slots."""
+
+    def __init__(self, source: str, escape_html: bool = False):
+        self.escape_html = escape_html
+        self._parts: List[str] = []
+        self.fields: List[str] = []
+        position = 0
+        for match in _SLOT.finditer(source):
+            self._parts.append(source[position:match.start()])
+            self.fields.append(match.group(1))
+            position = match.end()
+        self._parts.append(source[position:])
+
+    def render(self, values: Dict[str, Any]) -> str:
+        rendered = [self._parts[0]]
+        for field, part in zip(self.fields, self._parts[1:]):
+            if field not in values:
+                raise KeyError(f"Template field '{field}' has no value")
+            value = str(values[field])
+            if self.escape_html and not field.endswith("_html"):
+                value = html.escape(value)
+            rendered.append(value)
+            rendered.append(part)
+        return "".join(rendered)
+
+
+def _fill_layout(source: str, slots: Dict[str, str]) -> str:
+    """Fill compile-time slots, leaving recipient fields in place."""
+    return _SLOT.sub(lambda match: slots.get(match.group(1), match.group(0)), source)
+
+
+class NotificationTemplate:
+    """Subject, plain-text and HTML templates of one notification kind."""
+
+    def __init__(self, kind: str, spec: Dict[str, Any]):
+        self.kind = kind
+        content = [f"                <p>{paragraph}</p>" for paragraph in spec["paragraphs"]]
+        if spec.get("extra_html"):
+            content.append(f"                {spec['extra_html']}")
+        self.html = CompiledTemplate(_fill_layout(_LAYOUT_HTML, {
+            "heading": html.escape(spec["heading"]),
+            "content": "\n".join(content),
+            "button": html.escape(spec["button"]),
+            "footer": FOOTER_TEXT,
+        }), escape_html=True)
+        text_paragraphs = spec.get("text_paragraphs", spec["paragraphs"])
+        self.text = CompiledTemplate("\n\n".join(["Hello,", *text_paragraphs, spec["text_link"], FOOTER_TEXT]))
+        self.subject = CompiledTemplate(spec["subject"])
+        self.fields = sorted(set(self.html.fields) | set(self.text.fields) | set(self.subject.fields))
+        self._rendered: Dict[Tuple, Dict[str, str]] = {}
+
+    def content(self, **values: Any) -> Dict[str, str]:
+        """
+        Render the message content for the given field values. Renderings are cached, so
+        callers must not modify the returned dict.
+        """
+        key = tuple(sorted(values.items()))
+        content = self._rendered.get(key)
+        if content is None:
+            content = {
+                "subject": self.subject.render(values),
+                "plainText": self.text.render(values),
+                "html": self.html.render(values),
+            }
+            if len(self._rendered) >= MAX_CACHED_RENDERINGS:
+                self._rendered.clear()
+            self._rendered[key] = content
+        return content
+
+
+TEMPLATES: Dict[str, NotificationTemplate] = {kind: NotificationTemplate(kind, spec) for kind, spec in KINDS.items()}
+
+
+def build_message(kind: str, recipient: str, **values: Any) -> Dict[str, Any]:
+    """
+    Build an email message of the given kind for one recipient.
+
+    Args:
+        kind: One of KINDS
+        recipient: The recipient's email address
+        **values: Template fields, e.g. review_link
+
+    Returns:
+        Dict: The message in the format EmailClient.begin_send() expects
+    """
+    if kind not in TEMPLATES:
+        raise ValueError(f"Unknown notification kind '{kind}', expected one of {tuple(TEMPLATES)}")
+    return {
+        "senderAddress": os.environ.get("EMAIL_SENDER_ADDRESS", DEFAULT_SENDER_ADDRESS),
+        "recipients": {
+            "to": [{"address": recipient}]
+        },
+        "content": TEMPLATES[kind].content(**values)
+    }
@@ -0,0 +1,329 @@
+"""
+### pending_view.py ###
+
+Materialized view of pending resume updates (added_to_resume = 'in_progress' with a ready
+draft), kept in the resume_trackers container so the review UI and the notification job can read
+it with a single point read instead of querying trackers.
+
+Each employee with pending updates has a pending-<employee_id> summary, stored in the employee's
+tracker partition. It holds the display fields of each pending tracker, the pending count and
+the oldest pending date. Summaries are updated with ETag-conditioned read-modify-write whenever
+a tracker enters or leaves the view. Writes for different employees never touch the same
+document or partition.
+
+The employees with at least one pending update are listed in PENDING_INDEX_SHARDS (default 16)
+pending-index-<n> documents, each in its own partition; an employee belongs to shard
+crc32(employee_id) % PENDING_INDEX_SHARDS. A shard is only written when an employee's summary
+goes from empty to non-empty or back, so the notification job lists every employee with a few
+point reads while index writes stay rare and spread over the shards.
+
+A missing summary (e.g. for data written before this view existed) is built from the trackers
+the first time it is read or updated. reconcile() compares every summary and index shard with
+the trackers and rebuilds those that disagree, e.g. after a view update failed, after data was
+loaded outside the processor, or after PENDING_INDEX_SHARDS changed. It scans every pending
+tracker, so it is a maintenance command (reconcile_pending_view.py), not part of any job.
+"""
+
+import logging
+import os
+import threading
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from cosmosdb import CosmosDBManager, PreconditionFailedError
+from partitioning import PartitionRouter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_SHARDS = 16
+
+SUMMARY_TYPE = "pending_updates_summary"
+INDEX_TYPE = "pending_updates_index"
+
+# Trackers the view lists: in review with a generated draft. Trackers written before drafts
+# were generated asynchronously have no draft_status and always had their draft.
+PENDING_TRACKERS_QUERY = """
+    SELECT *
+    FROM c
+    WHERE c.type = 'resume_update_tracker'
+    AND c.added_to_resume = 'in_progress'
+    AND (NOT IS_DEFINED(c.draft_status) OR c.draft_status = 'ready')
+"""
+
+SUMMARIES_QUERY = f"""
+    SELECT *
+    FROM c
+    WHERE c.type = '{SUMMARY_TYPE}'
+"""
+
+
+def is_listed(tracker: Dict) -> bool:
+    """Whether a tracker belongs in the view; the same condition as PENDING_TRACKERS_QUERY."""
+    return tracker.get('added_to_resume') == 'in_progress' and tracker.get('draft_status', 'ready') == 'ready'
+
+
+class PendingUpdatesView:
+    def __init__(self, trackers_container: CosmosDBManager, partition_router: PartitionRouter, max_conflict_retries: int = 10):
+        self.trackers_container = trackers_container
+        self.partition_router = partition_router
+        self.max_conflict_retries = max_conflict_retries
+        self.conflict_retries = 0
+        self._conflict_retries_lock = threading.Lock()
+        self.index_shards = int(os.environ.get("PENDING_INDEX_SHARDS", DEFAULT_INDEX_SHARDS))
+
+    def _summary_id(self, employee_id: str) -> str:
+        return f"pending-{employee_id}"
+
+    def _summary_partition_key(self, employee_id: str) -> str:
+        return self.partition_router.partition_key("resume_trackers", employee_id)
+
+    def _index_shard(self, employee_id: str) -> int:
+        # crc32 rather than hash(), which differs between processes
+        return zlib.crc32(employee_id.encode("utf-8")) % self.index_shards
+
+    @staticmethod
+    def _index_id(shard: int) -> str:
+        return f"pending-index-{shard}"
+
+    def _new_index_shard(self, shard: int) -> Dict[str, Any]:
+        return {
+            "id": self._index_id(shard),
+            "partitionKey": self._index_id(shard),
+            "type": INDEX_TYPE,
+            "shard": shard,
+            "employees": {},
+            "last_updated": datetime.utcnow().isoformat()
+        }
+
+    def _record_conflict_retry(self) -> None:
+        with self._conflict_retries_lock:
+            self.conflict_retries += 1
+
+    def _mutate_document(self, item_id: str, partition_key: str, mutate: Callable[[Dict], Optional[bool]],
+                         new_document: Callable[[], Dict]) -> Optional[Dict]:
+        """Read-modify-write a view document under its ETag, creating it if it does not exist."""
+        for attempt in range(self.max_conflict_retries + 1):
+            document = self.trackers_container.read_item(item_id, partition_key)
+            if document is None:
+                document = new_document()
+                mutate(document)
+                created = self.trackers_container.create_item(document)
+                if created is not None:
+                    return created
+                # Created concurrently; apply the change on top of the other writer's document
+                self._record_conflict_retry()
+                continue
+
+            if mutate(document) is False:
+                return document
+            document['last_updated'] = datetime.utcnow().isoformat()
+            try:
+                return self.trackers_container.update_item(document, etag=document.get('_etag'))
+            except PreconditionFailedError:
+                self._record_conflict_retry()
+
+        raise RuntimeError(f"View document {item_id} kept changing; gave up after {self.max_conflict_retries} retries")
+
+    def query_pending_trackers(self, employee_id: Optional[str] = None) -> List[Dict]:
+        if employee_id:
+            return self.partition_router.query_employee_items(
+                self.trackers_container,
+                query=PENDING_TRACKERS_QUERY + " AND c.employee_id = @employee_id",
+                parameters=[{"name": "@employee_id", "value": employee_id}],
+                employee_id=employee_id
+            )
+        return self.trackers_container.query_items(query=PENDING_TRACKERS_QUERY, parameters=[])
+
+    def _new_summary(self, employee_id: str) -> Dict[str, Any]:
+        """Build an employee's summary from their in-progress trackers."""
+        summary = {
+            "id": self._summary_id(employee_id),
+            "partitionKey": self._summary_partition_key(employee_id),
+            "type": SUMMARY_TYPE,
+            "employee_id": employee_id,
+            "pending": {
+                tracker['id']: self._pending_entry(tracker, tracker.get('last_updated', ''))
+                for tracker in self.query_pending_trackers(employee_id)
+            },
+            "last_updated": datetime.utcnow().isoformat()
+        }
+        self._refresh_totals(summary)
+        return summary
+
+    @staticmethod
+    def _pending_entry(tracker: Dict, pending_since: str) -> Dict[str, Any]:
+        """The subset of a tracker the review UI displays."""
+        return {
+            "id": tracker['id'],
+            "employee_id": tracker['employee_id'],
+            "project_number": tracker['project_number'],
+            "project_name": tracker.get('project_name', ''),
+            "description": tracker.get('description', ''),
+            "total_hours": tracker.get('total_hours', 0),
+            "role_history": tracker['role_history'][-1:] if tracker.get('role_history') else [],
+            "pending_since": pending_since
+        }
+
+    @staticmethod
+    def _refresh_totals(summary: Dict) -> None:
+        summary['count'] = len(summary['pending'])
+        summary['oldest_pending'] = min((entry['pending_since'] for entry in summary['pending'].values()), default=None)
+
+    def record_tracker(self, tracker: Dict) -> None:
+        """
+        Reflect a tracker's current state in its employee's summary, and in the index if the
+        employee's summary became empty or non-empty.
+        Call after every write that moves a tracker into or out of the view (see is_listed),
+        or that changes the fields of a listed tracker.
+        """
+        employee_id = tracker['employee_id']
+        # Whether the stored summary had entries before this change; None for a new summary,
+        # whose employee may not be indexed yet
+        listed_before: Optional[bool] = None
+
+        def apply(summary: Dict):
+            nonlocal listed_before
+            listed_before = bool(summary['count']) if '_etag' in summary else None
+            existing = summary['pending'].get(tracker['id'])
+            if is_listed(tracker):
+                pending_since = existing['pending_since'] if existing else tracker.get('last_updated', datetime.utcnow().isoformat())
+                entry = self._pending_entry(tracker, pending_since)
+                if entry == existing:
+                    return False
+                summary['pending'][tracker['id']] = entry
+            elif existing:
+                del summary['pending'][tracker['id']]
+            else:
+                return False
+            self._refresh_totals(summary)
+
+        summary = self._mutate_document(
+            self._summary_id(employee_id),
+            self._summary_partition_key(employee_id),
+            apply,
+            lambda: self._new_summary(employee_id)
+        )
+        if listed_before is None or listed_before != bool(summary['count']):
+            self._record_in_index(employee_id, bool(summary['count']))
+
+    def _record_in_index(self, employee_id: str, listed: bool) -> None:
+        """Add an employee to their index shard, or remove them; no write if already so."""
+        shard = self._index_shard(employee_id)
+
+        def apply(index: Dict):
+            if listed and employee_id not in index['employees']:
+                index['employees'][employee_id] = datetime.utcnow().isoformat()
+            elif not listed and employee_id in index['employees']:
+                del index['employees'][employee_id]
+            else:
+                return False
+
+        self._mutate_document(self._index_id(shard), self._index_id(shard), apply, lambda: self._new_index_shard(shard))
+
+    def refresh_employee(self, employee_id: str) -> None:
+        """Rebuild an employee's summary and index entry from their trackers, e.g. after trackers were deleted."""
+        fresh = self._new_summary(employee_id)
+
+        def replace(summary: Dict):
+            # Entries that were already listed keep the date they entered the view
+            for tracker_id, entry in fresh['pending'].items():
+                if tracker_id in summary['pending']:
+                    entry['pending_since'] = summary['pending'][tracker_id]['pending_since']
+            summary['pending'] = fresh['pending']
+            self._refresh_totals(summary)
+
+        summary = self._mutate_document(self._summary_id(employee_id), self._summary_partition_key(employee_id), replace, lambda: fresh)
+        self._record_in_index(employee_id, bool(summary['count']))
+
+    def reconcile(self) -> Dict[str, int]:
+        """
+        Rebuild every summary that disagrees with the trackers (a missing summary, a missing or
+        extra entry, or an entry whose display fields are out of date), then bring every index
+        shard in line with the summaries. Scans every pending tracker and summary.
+
+        Returns:
+            Dict with the number of employees checked, summaries repaired, index shards
+            repaired and failures
+        """
+        expected: Dict[str, Dict[str, Dict]] = {}
+        for tracker in self.query_pending_trackers():
+            expected.setdefault(tracker['employee_id'], {})[tracker['id']] = tracker
+        summaries = {
+            summary['employee_id']: summary
+            for summary in self.trackers_container.query_items(query=SUMMARIES_QUERY, parameters=[])
+        }
+
+        result = {"employees": 0, "repaired": 0, "index_shards_repaired": 0, "failed": 0}
+        listed_employees = set()
+        for employee_id in sorted(set(expected) | set(summaries)):
+            result["employees"] += 1
+            listed = summaries[employee_id]['pending'] if employee_id in summaries else None
+            trackers = expected.get(employee_id, {})
+            if trackers:
+                listed_employees.add(employee_id)
+            if listed is not None and set(listed) == set(trackers) and all(
+                listed[tracker_id] == self._pending_entry(tracker, listed[tracker_id]['pending_since'])
+                for tracker_id, tracker in trackers.items()
+            ):
+                continue
+            try:
+                self.refresh_employee(employee_id)
+                result["repaired"] += 1
+            except Exception as e:
+                result["failed"] += 1
+                logger.error("Could not rebuild pending updates summary for employee %s: %s", employee_id, e)
+
+        for shard in range(self.index_shards):
+            shard_employees = {employee_id for employee_id in listed_employees if self._index_shard(employee_id) == shard}
+
+            def apply(index: Dict, shard_employees=shard_employees):
+                if set(index['employees']) == shard_employees:
+                    return False
+                now = datetime.utcnow().isoformat()
+                index['employees'] = {
+                    employee_id: index['employees'].get(employee_id, now) for employee_id in sorted(shard_employees)
+                }
+
+            try:
+                before = self.trackers_container.read_item(self._index_id(shard), self._index_id(shard))
+                if set(before['employees'] if before else ()) == shard_employees:
+                    continue
+                self._mutate_document(self._index_id(shard), self._index_id(shard), apply, lambda shard=shard: self._new_index_shard(shard))
+                result["index_shards_repaired"] += 1
+            except Exception as e:
+                result["failed"] += 1
+                logger.error("Could not rebuild pending updates index shard %s: %s", shard, e)
+
+        if result["repaired"] or result["index_shards_repaired"] or result["failed"]:
+            logger.warning("Reconciled pending updates view: %s", result)
+        return result
+
+    def get_employee_pending(self, employee_id: str) -> List[Dict]:
+        """Get an employee's pending updates with one point read, oldest first."""
+        summary = self.trackers_container.read_item(self._summary_id(employee_id), self._summary_partition_key(employee_id))
+        if summary is None:
+            summary = self._mutate_document(
+                self._summary_id(employee_id),
+                self._summary_partition_key(employee_id),
+                lambda document: False,
+                lambda: self._new_summary(employee_id)
+            )
+            self._record_in_index(employee_id, bool(summary['count']))
+        return sorted(summary['pending'].values(), key=lambda entry: entry['pending_since'])
+
+    def get_employees_with_pending(self) -> List[str]:
+        """Get every employee with pending updates, sorted, with one point read per index shard."""
+        employees = set()
+        for shard in range(self.index_shards):
+            index = self.trackers_container.read_item(self._index_id(shard), self._index_id(shard))
+            if index is not None:
+                employees.update(index['employees'])
+        return sorted(employees)
+
+    def get_all_pending(self) -> List[Dict]:
+        """Get every employee's pending updates from the index and their summaries, oldest first per employee."""
+        pending = []
+        for employee_id in self.get_employees_with_pending():
+            pending.extend(self.get_employee_pending(employee_id))
+        return pending
@@ -0,0 +1,219 @@
+"""
+### project_screening.py ###
+
+Embedding-similarity pre-screen for "is this project already on the resume?".
+
+_is_project_on_resume used to send the whole resume and the whole project description to the
+chat model on every threshold crossing. ProjectScreen first compares embeddings: the project
+description is split into passages, and the resume into paragraphs. The score is the highest
+cosine similarity between any passage and any paragraph:
+
+    score >= yes_threshold            "yes"        the resume already describes the project
+    score <  no_threshold             "no"         nothing on the resume resembles it
+    anything in between               "ambiguous"  escalated to the chat model as before
+
+Paragraph and passage embeddings are cached per process by content hash, so a resume is only
+embedded again after it changes, and a project shared by many key members is embedded once.
+(The resume index's searchVector embeds the whole resume as one vector, too coarse to tell one
+project paragraph from the rest, so it is not used here.)
+
+Similarity ranges depend on the embedding model, so the thresholds must be calibrated with
+calibrate_prescreen.py, which compares screen scores with the chat model's answers and
+recommends thresholds. Until then, shadow mode scores every check but still asks the chat
+model, logging both.
+
+Configuration (environment):
+    ON_RESUME_PRESCREEN              shadow (default), on or off; switch to on once calibrated
+    ON_RESUME_YES_THRESHOLD          default 0.93
+    ON_RESUME_NO_THRESHOLD           default 0.75
+    PRESCREEN_EMBEDDING_CACHE_SIZE   cached embeddings (default 5000, about 6 KB each)
+"""
+
+import hashlib
+import logging
+import math
+import operator
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+PRESCREEN_MODES = ("on", "shadow", "off")
+DEFAULT_YES_THRESHOLD = 0.93
+DEFAULT_NO_THRESHOLD = 0.75
+DEFAULT_EMBEDDING_CACHE_SIZE = 5000
+
+# Resume lines shorter than this (headings, dates, contact details) are merged into the next paragraph
+MIN_PARAGRAPH_CHARS = 80
+# Project descriptions are split into passages of about this many characters
+PASSAGE_CHARS = 1500
+
+
+class ScreenResult(NamedTuple):
+    decision: str   # "yes", "no" or "ambiguous"
+    score: float
+    # The resume paragraph most similar to the project, for logs and calibration
+    best_paragraph: str
+
+
+def split_paragraphs(text: str, min_chars: int = MIN_PARAGRAPH_CHARS) -> List[str]:
+    """Split resume text into paragraphs, merging short lines into the paragraph that follows."""
+    paragraphs = []
+    pending = ""
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        pending = f"{pending} {line}".strip() if pending else line
+        if len(pending) >= min_chars:
+            paragraphs.append(pending)
+            pending = ""
+    if pending:
+        paragraphs.append(pending)
+    return paragraphs
+
+
+def split_passages(text: str, passage_chars: int = PASSAGE_CHARS) -> List[str]:
+    """Split a project description into passages of about passage_chars, on sentence boundaries."""
+    sentences = re.split(r"(?<=[.!?])\s+", text.strip())
+    passages = []
+    current = ""
+    for sentence in sentences:
+        if current and len(current) + len(sentence) > passage_chars:
+            passages.append(current)
+            current = ""
+        current = f"{current} {sentence}".strip()
+    if current:
+        passages.append(current)
+    return passages
+
+
+def _normalize(vector: List[float]) -> array:
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return array("f", (value / norm for value in vector))
+
+
+def _dot(a: array, b: array) -> float:
+    return sum(map(operator.mul, a, b))
+
+
+class ProjectScreen:
+    def __init__(self, embeddings: Any, mode: Optional[str] = None, yes_threshold: Optional[float] = None,
+                 no_threshold: Optional[float] = None, cache_size: Optional[int] = None):
+        """
+        Args:
+            embeddings: A langchain embeddings client (embed_documents)
+            mode: on, shadow or off; defaults to ON_RESUME_PRESCREEN
+        """
+        self.embeddings = embeddings
+        self.mode = mode or os.environ.get("ON_RESUME_PRESCREEN", "shadow")
+        if self.mode not in PRESCREEN_MODES:
+            raise ValueError(f"Unknown ON_RESUME_PRESCREEN '{self.mode}', expected one of {PRESCREEN_MODES}")
+        self.yes_threshold = yes_threshold if yes_threshold is not None else float(os.environ.get("ON_RESUME_YES_THRESHOLD", DEFAULT_YES_THRESHOLD))
+        self.no_threshold = no_threshold if no_threshold is not None else float(os.environ.get("ON_RESUME_NO_THRESHOLD", DEFAULT_NO_THRESHOLD))
+        if self.no_threshold > self.yes_threshold:
+            raise ValueError(f"ON_RESUME_NO_THRESHOLD ({self.no_threshold}) is above ON_RESUME_YES_THRESHOLD ({self.yes_threshold})")
+        self.cache_size = cache_size or int(os.environ.get("PRESCREEN_EMBEDDING_CACHE_SIZE", DEFAULT_EMBEDDING_CACHE_SIZE))
+        self._vectors: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"yes": 0, "no": 0, "ambiguous": 0, "errors": 0, "embedded_texts": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def score(self, resume_text: str, project_text: str) -> ScreenResult:
+        """Score a project against a resume and classify it with the thresholds."""
+        paragraphs = split_paragraphs(resume_text) or [resume_text]
+        passages = split_passages(project_text) or [project_text]
+        with tracing.span("prescreen.score", kind="internal", attributes={
+            "prescreen.paragraphs": len(paragraphs),
+            "prescreen.passages": len(passages)
+        }) as span:
+            vectors = self._embed(paragraphs + passages)
+            paragraph_vectors = vectors[:len(paragraphs)]
+            best_score, best_paragraph = -1.0, ""
+            for passage_vector in vectors[len(paragraphs):]:
+                for paragraph, paragraph_vector in zip(paragraphs, paragraph_vectors):
+                    similarity = _dot(passage_vector, paragraph_vector)
+                    if similarity > best_score:
+                        best_score, best_paragraph = similarity, paragraph
+            span.set_attribute("prescreen.score", round(best_score, 4))
+
+        if best_score >= self.yes_threshold:
+            decision = "yes"
+        elif best_score < self.no_threshold:
+            decision = "no"
+        else:
+            decision = "ambiguous"
+        return ScreenResult(decision, best_score, best_paragraph)
+
+    def screen(self, resume_text: str, project_text: str) -> Optional[ScreenResult]:
+        """
+        Score a project against a resume, counting the decision. Returns None when the screen
+        is off or fails; the caller then asks the chat model.
+        """
+        if not self.enabled:
+            return None
+        try:
+            result = self.score(resume_text, project_text)
+        except Exception as e:
+            self._count("errors")
+            logger.warning("Project pre-screen failed, asking the chat model: %s", e)
+            return None
+        self._count(result.decision)
+        return result
+
+    def decides(self, result: Optional[ScreenResult]) -> bool:
+        """True if the screen's answer should be used instead of asking the chat model."""
+        return result is not None and self.mode == "on" and result.decision != "ambiguous"
+
+    def _count(self, counter: str) -> None:
+        # The screen is shared by every thread of the process
+        with self._lock:
+            self.stats[counter] += 1
+
+    def _embed(self, texts: List[str]) -> List[array]:
+        """Embed texts, using cached vectors where possible and one request for the rest."""
+        keys = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+        vectors: Dict[str, array] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._vectors:
+                    self._vectors.move_to_end(key)
+                    vectors[key] = self._vectors[key]
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            with tracing.span("openai.embeddings", attributes={
+                "gen_ai.system": "az.ai.openai",
+                "gen_ai.operation.name": "embeddings",
+                "payload.request_bytes": tracing.payload_size(list(missing.values()))
+            }):
+                embedded = self.embeddings.embed_documents(list(missing.values()))
+            with self._lock:
+                self.stats["embedded_texts"] += len(missing)
+                for key, vector in zip(missing, embedded):
+                    vectors[key] = self._vectors[key] = _normalize(vector)
+                while len(self._vectors) > self.cache_size:
+                    self._vectors.popitem(last=False)
+        return [vectors[key] for key in keys]
+
+
+_screens: Dict[int, ProjectScreen] = {}
+_screens_lock = threading.Lock()
+
+
+def get_project_screen(embeddings: Any) -> ProjectScreen:
+    """Get the process-wide screen for an embeddings client, so its embedding cache is shared."""
+    with _screens_lock:
+        screen = _screens.get(id(embeddings))
+        if screen is None:
+            screen = _screens[id(embeddings)] = ProjectScreen(embeddings)
+        return screen
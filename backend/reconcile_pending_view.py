@@ -0,0 +1,33 @@
+"""
+### reconcile_pending_view.py ###
+
+Maintenance command that repairs the pending-updates view (pending_view.py). Every pending
+tracker and every summary is read, summaries that disagree with the trackers are rebuilt, and
+the index shards are brought in line with the summaries.
+
+Run it after loading trackers outside the processor, after changing PENDING_INDEX_SHARDS, when
+"stale until the view is reconciled" errors were logged, or on a schedule well apart from the
+notification job (e.g. nightly). It costs a scan of every pending tracker and summary.
+
+Usage:
+    python reconcile_pending_view.py
+"""
+
+import argparse
+import json
+
+
+def main():
+    argparse.ArgumentParser(description="Rebuild pending-updates summaries and index shards that disagree with the trackers.").parse_args()
+
+    # Imported first: it loads .env, which configure_logging() reads
+    from ResumeUpdateProcessor import ResumeUpdateProcessor
+    from structured_logging import configure_logging
+    configure_logging()
+
+    result = ResumeUpdateProcessor().pending_view.reconcile()
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import logging
 from datetime import datetime
 from ResumeUpdateProcessor import ResumeUpdateProcessor
 
+logger = logging.getLogger(__name__)
 
 
 def run_notifications():
@@ -11,22 +12,23 @@ def run_notifications():
     This function can be scheduled to run periodically.
     """
     try:
-        print("Starting notification runner")
+        logger.info("Starting notification runner")
         processor = ResumeUpdateProcessor()
         
         # Run the recurring notification process
         result = processor.recurring_notification()
         
         # Log the results
-        print("Notification process completed")
-        print(f"Total employees processed: {result['total_employees_processed']}")
-        print(f"Notifications sent: {result['notifications_sent']}")
-        print(f"Skipped (cooldown): {result['skipped_cooldown']}")
-        print(f"Errors: {result['errors']}")
+        logger.info("Notification process completed: %d employees processed, %d notifications sent, "
+                    "%d skipped (cooldown), %d errors", result['total_employees_processed'],
+                    result['notifications_sent'], result['skipped_cooldown'], result['errors'])
+        logger.info("Email dispatch: %s", result['email'])
         
     except Exception as e:
-        print(f"Error in notification runner: {str(e)}")
+        logger.error("Error in notification runner: %s", e)
         raise
 
 if __name__ == "__main__":
+    from structured_logging import configure_logging
+    configure_logging()
     run_notifications()
\ No newline at end of file
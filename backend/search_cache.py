@@ -0,0 +1,206 @@
+"""
+### search_cache.py ###
+
+Caches for documents read from Azure AI Search (resumes, project descriptions).
+
+Two layers:
+    request scope   request_scope() / @scoped memoize lookups for one unit of work (an HTTP
+                    request, one draft generation), so the same resume is fetched from the
+                    index once however many steps ask for it.
+    process cache   a VersionedCache per index, shared by every processor in the process. Each
+                    entry is stored with the index document's `date` field, the version the
+                    processor sets on every upload. An entry younger than revalidate_seconds is
+                    used as is. An older entry is checked against the index with a query that
+                    selects only the version, and the full document is fetched again only when
+                    the version has changed.
+
+Writes in this process invalidate both layers (VersionedCache.invalidate). Writes by another
+process are noticed at the next revalidation.
+
+Configuration (environment), per cache name (RESUMES, PROJECTS):
+    SEARCH_CACHE_<NAME>_MAX_ENTRIES         entries kept before evicting (default 2000)
+    SEARCH_CACHE_<NAME>_REVALIDATE_SECONDS  how long an entry is trusted without checking its
+                                            version (default 60; 3600 for projects, whose
+                                            descriptions do not change once indexed)
+"""
+
+import contextlib
+import copy
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, NamedTuple, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_REVALIDATE_SECONDS = 60.0
+REVALIDATE_SECONDS_BY_CACHE = {"projects": 3600.0}
+
+# Memo of the current unit of work: {(cache name, key): value}; None outside a scope
+_scope: ContextVar[Optional[Dict[Tuple[str, Hashable], Any]]] = ContextVar("search_cache_scope", default=None)
+
+
+def begin_scope():
+    """Start a request scope; returns a token for end_scope(), or None if one is already open."""
+    if _scope.get() is not None:
+        return None
+    return _scope.set({})
+
+
+def end_scope(token) -> None:
+    if token is None:
+        return
+    try:
+        _scope.reset(token)
+    except ValueError:
+        # Ended from a different context than it was started in
+        _scope.set(None)
+
+
+@contextlib.contextmanager
+def request_scope() -> Iterator[None]:
+    """Memoize lookups for the duration of a block. Nested scopes share the outermost memo."""
+    token = begin_scope()
+    try:
+        yield
+    finally:
+        end_scope(token)
+
+
+def scoped(func: Callable) -> Callable:
+    """Decorator that runs a function in a request scope."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with request_scope():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class CachedDocument(NamedTuple):
+    version: Any
+    value: Any
+    # False once revalidate_seconds have passed since the version was last confirmed
+    fresh: bool
+
+
+class VersionedCache:
+    """Process-wide LRU of search documents, each stored with the index version it was read at."""
+
+    def __init__(self, name: str, max_entries: Optional[int] = None, revalidate_seconds: Optional[float] = None):
+        self.name = name
+        env_prefix = f"SEARCH_CACHE_{name.upper()}_"
+        self.max_entries = max_entries or int(os.environ.get(env_prefix + "MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        default_revalidate_seconds = REVALIDATE_SECONDS_BY_CACHE.get(name, DEFAULT_REVALIDATE_SECONDS)
+        self.revalidate_seconds = (revalidate_seconds if revalidate_seconds is not None
+                                   else float(os.environ.get(env_prefix + "REVALIDATE_SECONDS", default_revalidate_seconds)))
+        # key -> (version, value, last confirmed at), least recently used first
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._counters = {"scope_hits": 0, "hits": 0, "revalidated": 0, "misses": 0, "stale": 0, "evictions": 0, "invalidations": 0}
+
+    def get_memo(self, key: Hashable) -> Tuple[bool, Any]:
+        """Look a key up in the current request scope. Returns (found, value)."""
+        memo = _scope.get()
+        if memo is None or (self.name, key) not in memo:
+            return False, None
+        self._count("scope_hits")
+        return True, copy.copy(memo[(self.name, key)])
+
+    def set_memo(self, key: Hashable, value: Any) -> None:
+        memo = _scope.get()
+        if memo is not None:
+            memo[(self.name, key)] = value
+
+    def get(self, key: Hashable) -> Optional[CachedDocument]:
+        """
+        Get the cached document for a key. The caller decides what to do with a stale entry:
+        confirm its version (confirm()) or replace it (put()).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            version, value, confirmed_at = entry
+            fresh = time.monotonic() - confirmed_at < self.revalidate_seconds
+            if fresh:
+                self._counters["hits"] += 1
+        return CachedDocument(version, copy.copy(value), fresh)
+
+    def key_lock(self, key: Hashable) -> threading.Lock:
+        """
+        A lock per key, so concurrent misses for the same document (a hot project shared by
+        many key members in one batch) load it once while the others wait for the result.
+        """
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                if len(self._key_locks) > 2 * self.max_entries:
+                    self._key_locks = {k: l for k, l in self._key_locks.items() if l.locked()}
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def confirm(self, key: Hashable) -> None:
+        """Record that the index still has the cached version of a key."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], entry[1], time.monotonic())
+                self._counters["revalidated"] += 1
+
+    def put(self, key: Hashable, version: Any, value: Any, stale: bool = False) -> None:
+        with self._lock:
+            if stale:
+                self._counters["stale"] += 1
+            self._entries[key] = (version, value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a key from the process cache and the current request scope after a write."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._counters["invalidations"] += 1
+        memo = _scope.get()
+        if memo is not None:
+            memo.pop((self.name, key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["size"] = len(self._entries)
+        return stats
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+
+_caches: Dict[str, VersionedCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str) -> VersionedCache:
+    """Get the process-wide cache with the given name, creating it on first use."""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = VersionedCache(name)
+            _caches[name] = cache
+        return cache
+
+
+def get_all_stats() -> Dict[str, Dict[str, Any]]:
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
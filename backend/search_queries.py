@@ -0,0 +1,129 @@
+"""
+### search_queries.py ###
+
+OData filter building and multi-key lookups for Azure AI Search.
+
+Filters used to be built by concatenating ids into "field eq '<id>'", so an id containing a
+quote broke the query, or changed its meaning. Every filter is now built here. eq_filter()
+and in_filter() quote their values as OData string literals (single quotes doubled).
+in_filter() uses search.in, which matches a field against a delimited list in one clause and
+is far cheaper for the service than a chain of "or" comparisons.
+
+search_by_keys() fetches the documents for many keys (employee ids, project numbers) with one
+search.in query per chunk of keys, following pages of results, and groups them by key. A
+batch of a few hundred resumes or projects costs a handful of round trips instead of one per
+key. Skip paging is only stable over a total sort order; without one, a chunk whose results
+fill a page is split in half and queried again instead of paged.
+"""
+
+import logging
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+# Keys per search.in clause; keeps the filter well under the service's size limits
+DEFAULT_KEYS_PER_QUERY = 500
+# Results per page; 1000 is the most the service returns for one request
+DEFAULT_PAGE_SIZE = 1000
+
+# Tried in order; the first one that appears in no key separates the search.in values
+_DELIMITERS = ("|", ",", ";", "~", "^")
+
+
+def escape_string(value: Any) -> str:
+    """Escape a value for use inside an OData string literal."""
+    return str(value).replace("'", "''")
+
+
+def eq_filter(field: str, value: Any) -> str:
+    """Filter for field equal to value, e.g. employee_id eq '123'."""
+    return f"{field} eq '{escape_string(value)}'"
+
+
+def in_filter(field: str, values: Iterable[Any]) -> str:
+    """
+    Filter for field equal to any of the values, e.g. search.in(employee_id, '1|2|3', '|').
+
+    Raises:
+        ValueError: If no values are given, or every supported delimiter occurs in a value
+    """
+    values = [str(value) for value in values]
+    if not values:
+        raise ValueError("in_filter needs at least one value")
+    for delimiter in _DELIMITERS:
+        if not any(delimiter in value for value in values):
+            break
+    else:
+        raise ValueError(f"Every search.in delimiter {_DELIMITERS} occurs in the values")
+    # search.in splits on the delimiter and does not trim values, so whitespace is kept as is
+    joined = escape_string(delimiter.join(values))
+    return f"search.in({field}, '{joined}', '{escape_string(delimiter)}')"
+
+
+def search_by_keys(search_client: Any, field: str, keys: Iterable[Any], select: Optional[str] = None,
+                   keys_per_query: int = DEFAULT_KEYS_PER_QUERY, page_size: int = DEFAULT_PAGE_SIZE,
+                   order_by: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch every document whose field matches one of the keys.
+
+    Args:
+        search_client: SearchClient of the index
+        field: The filterable field the keys are matched on
+        keys: The keys; duplicates and empty keys are ignored
+        select: Comma-separated fields to return (the key field is always included)
+        keys_per_query: Keys per search.in query
+        page_size: Results requested per page; further pages are fetched with skip
+        order_by: Sort expressions on sortable fields, e.g. ["project_number asc", "sourcepage asc"],
+                  which keep skip paging stable if they order the results totally. Without
+                  it, a chunk whose results fill a page is split until each part fits in one
+                  page; only a single key with more than page_size documents is skip-paged.
+
+    Returns:
+        Dict mapping each key that matched to its documents; keys without documents are omitted
+    """
+    unique_keys = list(dict.fromkeys(str(key) for key in keys if key not in (None, "")))
+    if select and field not in [name.strip() for name in select.split(",")]:
+        select = f"{select},{field}"
+
+    documents: Dict[str, List[Dict[str, Any]]] = {}
+    requests = 0
+    chunks = deque(unique_keys[start:start + keys_per_query] for start in range(0, len(unique_keys), keys_per_query))
+    while chunks:
+        chunk = chunks.popleft()
+        filter_expression = in_filter(field, chunk)
+        chunk_documents: List[Dict[str, Any]] = []
+        skip = 0
+        while True:
+            with tracing.span("search.query", attributes={"search.index": getattr(search_client, "_index_name", ""),
+                                                          "search.keys": len(chunk)}) as span:
+                options = {"order_by": order_by} if order_by else {}
+                page = list(search_client.search(
+                    search_text="*",
+                    filter=filter_expression,
+                    select=select,
+                    top=page_size,
+                    skip=skip,
+                    **options
+                ))
+                span.set_attribute("payload.response_bytes", tracing.payload_size(page))
+            requests += 1
+            if not order_by and len(page) >= page_size and len(chunk) > 1:
+                # Unordered pages may repeat or skip documents; query each half instead
+                middle = len(chunk) // 2
+                chunks.appendleft(chunk[middle:])
+                chunks.appendleft(chunk[:middle])
+                chunk_documents = []
+                break
+            chunk_documents.extend(page)
+            if len(page) < page_size:
+                break
+            skip += page_size
+        for document in chunk_documents:
+            documents.setdefault(str(document.get(field)), []).append(document)
+
+    logger.debug("Fetched %d documents for %d keys of %s in %d requests",
+                 sum(len(group) for group in documents.values()), len(unique_keys), field, requests)
+    return documents
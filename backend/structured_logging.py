@@ -0,0 +1,115 @@
+"""
+### structured_logging.py ###
+
+Leveled, structured logging for the hot paths: Cosmos DB operations, LLM calls and resume edits.
+
+Call sites pass %-style arguments and structured fields instead of pre-formatted strings, so
+nothing is formatted unless the record is actually emitted:
+
+    logger.debug("Item created with id: %s", item_id, extra=fields(container="resume_trackers"))
+
+Records logged once per item (every Cosmos DB write, every search hit) go through log_sampled(),
+which checks the level first and then keeps only LOG_SAMPLE_RATE of them, so debug logging can
+be left on during bulk ingestion without flooding the output.
+
+configure_logging() sets up the root handler once per process from the environment:
+    LOG_LEVEL        DEBUG, INFO (default), WARNING or ERROR
+    LOG_FORMAT       text (default) or json, one JSON object per line for log ingestion
+    LOG_SAMPLE_RATE  fraction of sampled per-item records kept, 0 to 1 (default 1)
+"""
+
+import json
+import logging
+import os
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+# Attributes every LogRecord has; anything else was passed through extra
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Set from LOG_SAMPLE_RATE by configure_logging(), which entry points call after load_dotenv()
+_sample_rate = 1.0
+_configured = False
+
+
+def fields(**values: Any) -> Dict[str, Dict[str, Any]]:
+    """Structured fields for a record, as the extra argument of a logging call."""
+    return {"fields": values}
+
+
+def _record_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    values = dict(getattr(record, "fields", None) or {})
+    for key, value in vars(record).items():
+        if key not in _RECORD_ATTRIBUTES and key != "fields":
+            values[key] = value
+    return values
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: timestamp, level, logger, message and the record's fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(_record_fields(record))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines with the record's fields appended as key=value pairs."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        values = _record_fields(record)
+        if values:
+            line += " " + " ".join(f"{key}={value}" for key, value in values.items())
+        return line
+
+
+def configure_logging(level: Optional[str] = None, log_format: Optional[str] = None, sample_rate: Optional[float] = None) -> None:
+    """
+    Install the root handler and set the sample rate. Later calls are no-ops, so every entry
+    point can call it. Hosts that already attach a root handler (Azure Functions) keep theirs;
+    only the level is set.
+    """
+    global _configured, _sample_rate
+    if _configured:
+        return
+    root = logging.getLogger()
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(JsonFormatter() if (log_format or os.environ.get("LOG_FORMAT", "text")) == "json" else TextFormatter())
+        root.addHandler(handler)
+    root.setLevel((level or os.environ.get("LOG_LEVEL", "INFO")).upper())
+    # The Azure SDKs log every HTTP request at INFO
+    logging.getLogger("azure").setLevel(logging.WARNING)
+    _sample_rate = sample_rate if sample_rate is not None else float(os.environ.get("LOG_SAMPLE_RATE", "1"))
+    _configured = True
+
+
+def set_sample_rate(rate: float) -> None:
+    global _sample_rate
+    _sample_rate = rate
+
+
+def log_sampled(logger: logging.Logger, level: int, msg: str, *args: Any, **values: Any) -> None:
+    """
+    Log a per-item record, keeping only LOG_SAMPLE_RATE of them. Costs one level check when the
+    level is disabled.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if _sample_rate < 1 and random.random() >= _sample_rate:
+        return
+    logger.log(level, msg, *args, extra={"fields": values, "sampled": True})
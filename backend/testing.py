@@ -1,11 +1,20 @@
 from ResumeUpdateProcessor import ResumeUpdateProcessor
+import backends
+from structured_logging import configure_logging
 from pprint import pprint
 import json
 import os
 
+configure_logging()
+
 # Create single processor instance to be used across all tests
 processor = ResumeUpdateProcessor()
 
+if backends.use_fake_backends():
+    # Offline run: load the sample resumes, projects and metadata into the in-memory fakes
+    from fake_backends import seed_sample_data
+    seed_sample_data(processor)
+
 def load_json_file(subfolder, filename):
     """Helper function to load JSON data from sample_data directory"""
     # Get the directory of the current script
@@ -18,9 +27,11 @@ def load_json_file(subfolder, filename):
 def create_employee_metadata():
     """Create metadata entry for test employee"""
     metadata = load_json_file('employee_metadata', 'metadata_1.json')
+    metadata['partitionKey'] = processor.partition_router.partition_key("employee_metadata", metadata['employee_id'])
     
     try:
         processor.employee_metadata_container.create_item(metadata)
+        processor.employee_cache.invalidate(metadata['employee_id'])
         print("Created employee metadata entry")
     except:
         print("Employee metadata already exists")
@@ -92,14 +103,10 @@ def test_case_3_above_threshold_already_processed():
 
 def view_tracker_status(tracker_id: str, detailed=False):
     """Helper function to view current tracker status"""
-    results = processor.trackers_container.query_items(
-        query="SELECT * FROM c WHERE c.id = @id",
-        parameters=[{"name": "@id", "value": tracker_id}],
-        partition_key="resumeupdatestatus"
-    )
+    employee_id = tracker_id.split('-')[-1]
+    tracker = processor.partition_router.read_item(processor.trackers_container, tracker_id, employee_id)
     
-    if results:
-        tracker = results[0]
+    if tracker:
         if detailed:
             print("\nDetailed Tracker Information:")
             pprint(tracker)
@@ -147,15 +154,19 @@ def cleanup_test_data(employee_id: str):
         query = "SELECT * FROM c WHERE c.employee_id = @employee_id"
         parameters = [{"name": "@employee_id", "value": employee_id}]
         
-        trackers = processor.trackers_container.query_items(
+        trackers = processor.partition_router.query_employee_items(
+            processor.trackers_container,
             query=query,
             parameters=parameters,
-            partition_key="resumeupdatestatus"
+            employee_id=employee_id
         )
         
         for tracker in trackers:
             processor.trackers_container.delete_item(tracker['id'], tracker['partitionKey'])
             print(f"Deleted resume tracker: {tracker['id']}")
+
+        # The query above also removed the pending-updates summary; drop the employee from the index
+        processor.pending_view.refresh_employee(employee_id)
     except Exception as e:
         print(f"Error cleaning up trackers: {str(e)}")
 
@@ -170,8 +181,11 @@ def cleanup_test_data(employee_id: str):
     # 4. Clean up employee metadata
     try:
         metadata_id = f"metadata-{employee_id}"
-        processor.employee_metadata_container.delete_item(metadata_id, "metadata")
-        print(f"Deleted employee metadata: {metadata_id}")
+        metadata = processor.partition_router.read_item(processor.employee_metadata_container, metadata_id, employee_id)
+        if metadata:
+            processor.employee_metadata_container.delete_item(metadata_id, metadata['partitionKey'])
+            processor.employee_cache.invalidate(employee_id)
+            print(f"Deleted employee metadata: {metadata_id}")
     except Exception as e:
         print(f"Error cleaning up metadata: {str(e)}")
 
@@ -181,6 +195,9 @@ if __name__ == "__main__":
     try:
         test_employee_id = "718163"
 
+        # First-time setup of the database and containers
+        processor.provision()
+
         processor.reset_resume(test_employee_id)
 
         print("\nCleaning up any existing test data...")
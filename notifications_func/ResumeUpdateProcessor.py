@@ -1,16 +1,25 @@
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import logging
 from cosmosdb import CosmosDBManager
+from partitioning import PartitionRouter, strip_system_fields
+from employee_cache import get_employee_cache
+from pending_view import PendingUpdatesView
+from email_dispatch import EmailDispatcher, LocalEmailSink
+import notification_templates
+import tracing
+from structured_logging import log_sampled
 import uuid
 from dotenv import load_dotenv
 import os
-from azure.communication.email import EmailClient
+from functools import cached_property
 
 class ResumeUpdateProcessor:
     def __init__(self):
         # Constants
         self.NOTIFICATION_COOLDOWN_HOURS = 0
+        # Employees whose notification records and emails are loaded together
+        self.NOTIFICATION_BATCH_SIZE = 500
         self.HOURS_THRESHOLD = 40
         
         self.events_container = CosmosDBManager(
@@ -35,11 +44,40 @@ class ResumeUpdateProcessor:
         )
         self.logger = logging.getLogger(__name__)
         self.notification_cooldown = timedelta(hours=self.NOTIFICATION_COOLDOWN_HOURS)
+
+        # Routes trackers, notification records and employee metadata to their partitions
+        self.partition_router = PartitionRouter()
+
+        # Per-employee pending-updates summaries, kept next to the trackers
+        self.pending_view = PendingUpdatesView(self.trackers_container, self.partition_router)
+
+        # Employee metadata (emails) cached per process, shared with other processors
+        self.employee_cache = get_employee_cache(self.employee_metadata_container, self.partition_router)
         load_dotenv()
-        connection_string = os.environ.get("COMMUNICATION_SERVICES_CONNECTION_STRING")
-        self.email_client = EmailClient.from_connection_string(connection_string)
         self.webapp_url = os.environ.get("WEBAPP_URL")
         
+    def check_health(self) -> None:
+        """
+        Check that the Cosmos DB client can still authenticate and connect. Every container
+        shares one client, so a single cheap request covers them all.
+
+        Raises:
+            The SDK error if the request fails
+        """
+        self.trackers_container.ping()
+
+    @cached_property
+    def email_client(self):
+        if os.environ.get("EMAIL_SINK_DIR"):
+            return LocalEmailSink()
+        # Built on first send; runs without pending updates never import the email SDK
+        from azure.communication.email import EmailClient
+        return EmailClient.from_connection_string(os.environ.get("COMMUNICATION_SERVICES_CONNECTION_STRING"))
+
+    @cached_property
+    def email_dispatcher(self) -> EmailDispatcher:
+        return EmailDispatcher(self.email_client)
+
     def process_key_member(self, member_entry: Dict) -> Dict:
         """Process an incoming key member entry."""
         try:
@@ -75,7 +113,7 @@ class ResumeUpdateProcessor:
             }
 
         except Exception as e:
-            self.logger.error(f"Error processing key member entry: {str(e)}")
+            self.logger.error("Error processing key member entry: %s", e)
             raise
 
     def _get_resume(self, employee_id: str) -> Dict:
@@ -122,122 +160,63 @@ class ResumeUpdateProcessor:
 
 
     def _get_employee_email(self, employee_id: str) -> str:
-        """Get employee email from metadata container."""
+        """Get employee email from the employee metadata cache."""
         try:
-            results = self.employee_metadata_container.query_items(
-                query="SELECT * FROM c WHERE c.employee_id = @employee_id",
-                parameters=[{"name": "@employee_id", "value": employee_id}],
-                partition_key="metadata"
-            )
+            metadata = self.employee_cache.get(employee_id)
             
-            if results:
-                return results[0].get('email')
+            if metadata:
+                return metadata.get('email')
             else:
                 # For testing - return default email if no record exists
-                self.logger.warning(f"No email found for employee {employee_id}, using default")
+                self.logger.warning("No email found for employee %s, using default", employee_id)
                 return "NA"
                 
         except Exception as e:
-            self.logger.error(f"Error getting employee email: {str(e)}")
+            self.logger.error("Error getting employee email: %s", e)
             return None
 
-    def _send_notification(self, employee_id: str) -> bool:
+    def _get_employee_emails(self, employee_ids: List[str]) -> Dict[str, str]:
+        """
+        Get the emails of many employees from the employee metadata cache; misses are loaded
+        with one query per chunk of ids.
+
+        Returns:
+            Dict mapping employee_id to email; employees without a metadata record get the
+            same "NA" default as _get_employee_email
+        """
+        metadata = self.employee_cache.get_many(employee_ids)
+        emails = {}
+        for employee_id in employee_ids:
+            if employee_id in metadata:
+                emails[employee_id] = metadata[employee_id].get('email')
+            else:
+                self.logger.warning("No email found for employee %s, using default", employee_id)
+                emails[employee_id] = "NA"
+        return emails
+
+    def _build_notification_message(self, employee_email: str, kind: str = "reminder") -> Dict[str, Any]:
+        """Build a notification email of the given kind (see notification_templates.KINDS) for one recipient."""
+        return notification_templates.build_message(kind, employee_email, review_link=f"{self.webapp_url}/resume-review")
+
+    @tracing.traced()
+    def _send_notification(self, employee_id: str, employee_email: Optional[str] = None, kind: str = "reminder") -> bool:
         try:
-            employee_email = self._get_employee_email(employee_id)
+            if employee_email is None:
+                employee_email = self._get_employee_email(employee_id)
             if not employee_email:
-                self.logger.error(f"Could not send notification - no email found for employee {employee_id}")
+                self.logger.error("Could not send notification - no email found for employee %s", employee_id)
                 return False
 
-            review_link = f"{self.webapp_url}/resume-review"
-
-            message = {
-                "senderAddress": "DoNotReply@5fec6054-f6e1-4926-9c37-029ca719c8ae.azurecomm.net",
-                "recipients": {
-                    "to": [{"address": employee_email}]
-                },
-                "content": {
-                    "subject": "Resume Update Required",
-                    "plainText": (
-                        "Hello,\n\n"
-                        "You have a pending resume update that requires your review. Please take a moment to review and approve these updates to keep your resume current.\n\n"
-                        f"Review your updates here: {review_link}\n\n"
-                        "This is an automated message. Please do not reply to this email."
-                    ),
-                    "html": f"""
-                    <html>
-                        <head>
-                            <style>
-                                body {{
-                                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Arial, sans-serif;
-                                    line-height: 1.6;
-                                    margin: 0;
-                                    padding: 0;
-                                    background-color: #ffffff;
-                                }}
-                                .container {{
-                                    max-width: 600px;
-                                    margin: 0 auto;
-                                    background: #ffffff;
-                                }}
-                                .header {{
-                                    background-color: #003087;
-                                    padding: 20px;
-                                    text-align: left;
-                                }}
-                                .header h1 {{
-                                    margin: 0;
-                                    color: #ffffff;
-                                    font-size: 20px;
-                                    font-weight: 500;
-                                }}
-                                .content {{
-                                    padding: 40px 20px;
-                                    color: #333333;
-                                }}
-                                .button {{
-                                    display: inline-block;
-                                    background-color: #7AC143;
-                                    color: #ffffff;
-                                    padding: 10px 24px;
-                                    text-decoration: none;
-                                    border-radius: 4px;
-                                    font-weight: 500;
-                                    margin-top: 20px;
-                                }}
-                                .footer {{
-                                    padding: 20px;
-                                    color: #666666;
-                                    font-size: 14px;
-                                    border-top: 1px solid #eeeeee;
-                                }}
-                            </style>
-                        </head>
-                        <body>
-                            <div class="container">
-                                <div class="header">
-                                    <h1>📄 Resume Update Review Required</h1>
-                                </div>
-                                <div class="content">
-                                    <p>Hello,</p>
-                                    <p>You have a pending resume update that requires your review. Please take a moment to review and approve these updates to keep your resume current.</p>
-                                    <a href="{review_link}" class="button">Review Updates Now</a>
-                                </div>
-                                <div class="footer">
-                                    This is an automated message. Please do not reply to this email.
-                                </div>
-                            </div>
-                        </body>
-                    </html>"""
-                }
-            }
+            message = self._build_notification_message(employee_email, kind)
 
-            poller = self.email_client.begin_send(message)
-            result = poller.result()
-            self.logger.info(f"Email sent to {employee_email}: {result}")
+            with tracing.span("email.send", attributes={"payload.request_bytes": tracing.payload_size(message)}):
+                poller = self.email_client.begin_send(message)
+                result = poller.result()
+            log_sampled(self.logger, logging.INFO, "Email sent to employee %s: %s", employee_id, result)
             return True
 
         except Exception as e:
-            self.logger.error(f"Error sending email notification: {str(e)}")
+            self.logger.error("Error sending email notification: %s", e)
             return False
 
     def _update_notification_record(self, employee_id: str) -> Dict:
@@ -245,16 +224,61 @@ class ResumeUpdateProcessor:
         try:
             notification = {
                 "id": f"notification-{employee_id}",
-                "partitionKey": "notifications",
+                "partitionKey": self.partition_router.partition_key("notifications", employee_id),
                 "employee_id": employee_id,
                 "last_notification": datetime.utcnow().isoformat()
             }
             return self.notification_container.update_item(notification)
 
         except Exception as e:
-            self.logger.error(f"Error updating notification record: {str(e)}")
+            self.logger.error("Error updating notification record: %s", e)
             raise
 
+    def _get_notification_records(self, employee_ids: List[str]) -> Dict[str, Dict]:
+        """Load the notification records of many employees with one query per chunk of ids."""
+        records = self.partition_router.query_items_for_employees(self.notification_container, employee_ids)
+        notification_records = {}
+        for employee_id, items in records.items():
+            for item in items:
+                if item['id'] == f"notification-{employee_id}":
+                    notification_records[employee_id] = item
+        return notification_records
+
+    def _update_notification_records(self, employee_ids: List[str], records: Dict[str, Dict]) -> List[str]:
+        """
+        Set last_notification for many employees with batched upserts, one transactional batch
+        per partition. Records still in their legacy partition are written to the employee
+        partition and the legacy copy is removed.
+
+        Args:
+            employee_ids: Employees that were just notified
+            records: Their existing notification records, from _get_notification_records
+
+        Returns:
+            List[str]: Employee ids whose record could not be written
+        """
+        now = datetime.utcnow().isoformat()
+        items = []
+        for employee_id in employee_ids:
+            record = records.get(employee_id)
+            item = strip_system_fields(record) if record else {"id": f"notification-{employee_id}", "employee_id": employee_id}
+            item['partitionKey'] = self.partition_router.partition_key("notifications", employee_id)
+            item['last_notification'] = now
+            items.append(item)
+
+        written = self.notification_container.upsert_items(items)
+        failed = []
+        for employee_id, item, result in zip(employee_ids, items, written):
+            if result is None:
+                failed.append(employee_id)
+                continue
+            record = records.get(employee_id)
+            if record and record['partitionKey'] != item['partitionKey']:
+                self.notification_container.delete_item(record['id'], record['partitionKey'])
+        if failed:
+            self.logger.error("Failed to update notification records for %d employees: %s", len(failed), failed)
+        return failed
+
     def _trigger_draft_creation(self, tracker: Dict) -> Dict:
         """Process resume update for the given tracker."""
         try:
@@ -281,16 +305,17 @@ class ResumeUpdateProcessor:
             
             # Save the updated tracker
             updated_tracker = self.trackers_container.update_item(tracker)
+            self._record_pending(updated_tracker)
 
             # Send notification and update notification record
-            if self._send_notification(tracker['employee_id']):
-                print("Notification sent successfully")
+            if self._send_notification(tracker['employee_id'], kind="first_notice"):
+                self.logger.debug("Notification sent to employee %s", tracker['employee_id'])
                 self._update_notification_record(tracker['employee_id'])
             
             return updated_tracker
             
         except Exception as e:
-            self.logger.error(f"Error in trigger_draft_creation: {str(e)}")
+            self.logger.error("Error in trigger_draft_creation: %s", e)
             raise
 
     def _should_trigger_update(self, tracker: Dict) -> bool:
@@ -331,14 +356,9 @@ class ResumeUpdateProcessor:
         
         try:
             # Try to get existing tracker directly by ID
-            tracker = self.trackers_container.query_items(
-                query="SELECT * FROM c WHERE c.id = @id",
-                parameters=[{"name": "@id", "value": tracker_id}],
-                partition_key="resumeupdatestatus"
-            )
+            existing_tracker = self.partition_router.read_item(self.trackers_container, tracker_id, employee_id)
             
-            if tracker:
-                existing_tracker = tracker[0]
+            if existing_tracker:
                 # Update with latest hours - no need to sum up events anymore
                 existing_tracker['total_hours'] = member_entry['job_hours']
                 existing_tracker['last_updated'] = datetime.utcnow().isoformat()
@@ -352,7 +372,7 @@ class ResumeUpdateProcessor:
             # Create new tracker if not found
             new_tracker = {
                 "id": tracker_id,
-                "partitionKey": "resumeupdatestatus",
+                "partitionKey": self.partition_router.partition_key("resume_trackers", employee_id),
                 "type": "resume_update_tracker",
                 "employee_id": employee_id,
                 "employee_display_name": member_entry['employee_display_name'],
@@ -377,7 +397,7 @@ class ResumeUpdateProcessor:
             return self.trackers_container.create_item(new_tracker)
             
         except Exception as e:
-            self.logger.error(f"Error in get_or_create_tracker: {str(e)}")
+            self.logger.error("Error in get_or_create_tracker: %s", e)
             raise
 
     def _update_role_history(self, tracker: Dict, member_entry: Dict):
@@ -404,27 +424,33 @@ class ResumeUpdateProcessor:
             employee_id: Optional employee ID. If None, returns updates for all employees.
             
         Returns:
-            List[Dict]: List of pending resume update trackers
-        """
-        base_query = """
-            SELECT *
-            FROM c
-            WHERE c.partitionKey = 'resumeupdatestatus'
-            AND c.added_to_resume = 'in_progress'
+            List[Dict]: The display fields of each pending tracker from the pending-updates
+            view, oldest first per employee
         """
-        
         if employee_id:
-            query = base_query + " AND c.employee_id = @employee_id"
-            parameters = [{"name": "@employee_id", "value": employee_id}]
-        else:
-            query = base_query
-            parameters = []
+            # One point read of the employee's pending-updates summary
+            return self.pending_view.get_employee_pending(employee_id)
         
-        return self.trackers_container.query_items(
-            query=query,
-            parameters=parameters,
-            partition_key="resumeupdatestatus"
-        )
+        # A point read per index shard and per employee with pending updates
+        return self.pending_view.get_all_pending()
+
+    def _record_pending(self, tracker: Optional[Dict]) -> None:
+        """
+        Reflect a tracker write in the pending-updates view without failing the write itself. If
+        the update fails, the employee's summary is rebuilt from the trackers; if that fails too,
+        reconcile_pending_view.py repairs it.
+        """
+        if not tracker:
+            return
+        try:
+            self.pending_view.record_tracker(tracker)
+        except Exception as e:
+            self.logger.warning("Error updating pending updates view for tracker %s, rebuilding the summary: %s", tracker['id'], e)
+            try:
+                self.pending_view.refresh_employee(tracker['employee_id'])
+            except Exception as e:
+                self.logger.error("Pending updates summary for employee %s is stale until the view is reconciled: %s",
+                                  tracker['employee_id'], e)
     
     def save_updates(self, employee_id: str, project_numbers: List[str]) -> bool:
         """
@@ -438,25 +464,17 @@ class ResumeUpdateProcessor:
             bool: True if all updates were saved successfully, False otherwise
         """
         try:
-            self.logger.info(f"Saving updates for employee {employee_id}, projects: {project_numbers}")
+            self.logger.info("Saving updates for employee %s, projects: %s", employee_id, project_numbers)
             
             for project_number in project_numbers:
                 # Create the tracker ID using the combination
                 tracker_id = f"{project_number}-{employee_id}"
                 
-                # Query the tracker
-                results = self.trackers_container.query_items(
-                    query="SELECT * FROM c WHERE c.id = @id",
-                    parameters=[{"name": "@id", "value": tracker_id}],
-                    partition_key="resumeupdatestatus"
-                )
-                
-                results_list = list(results)
-                if not results_list:
-                    self.logger.error(f"No tracker found with ID: {tracker_id}")
+                # Point-read the tracker
+                tracker = self.partition_router.read_item(self.trackers_container, tracker_id, employee_id)
+                if not tracker:
+                    self.logger.error("No tracker found with ID: %s", tracker_id)
                     continue
-                    
-                tracker = results_list[0]
                 
                 # For now, just update the tracker status
                 tracker['added_to_resume'] = 'yes'
@@ -464,14 +482,14 @@ class ResumeUpdateProcessor:
                 tracker['version'] += 1
                 
                 # Save the updated tracker
-                self.trackers_container.update_item(tracker)
+                self._record_pending(self.trackers_container.update_item(tracker))
                 
-                self.logger.info(f"Successfully saved update for tracker: {tracker_id}")
+                self.logger.info("Successfully saved update for tracker: %s", tracker_id)
             
             return True
                 
         except Exception as e:
-            self.logger.error(f"Error saving updates: {str(e)}")
+            self.logger.error("Error saving updates: %s", e)
             return False
 
     def discard_update(self, employee_id: str, project_number: str) -> bool:
@@ -488,21 +506,13 @@ class ResumeUpdateProcessor:
         try:
             # Create the tracker ID using the combination
             tracker_id = f"{project_number}-{employee_id}"
-            self.logger.info(f"Discarding update for tracker ID: {tracker_id}")
-            
-            # Query the tracker directly by ID
-            results = self.trackers_container.query_items(
-                query="SELECT * FROM c WHERE c.id = @id",
-                parameters=[{"name": "@id", "value": tracker_id}],
-                partition_key="resumeupdatestatus"
-            )
+            self.logger.info("Discarding update for tracker ID: %s", tracker_id)
             
-            results_list = list(results)
-            if not results_list:
-                self.logger.error(f"No tracker found with ID: {tracker_id}")
+            # Point-read the tracker directly by ID
+            tracker = self.partition_router.read_item(self.trackers_container, tracker_id, employee_id)
+            if not tracker:
+                self.logger.error("No tracker found with ID: %s", tracker_id)
                 return False
-                
-            tracker = results_list[0]
                     
             # Update the status to 'discarded'
             tracker['added_to_resume'] = 'discarded'
@@ -510,15 +520,16 @@ class ResumeUpdateProcessor:
             tracker['version'] += 1
             
             # Save the updated tracker
-            self.trackers_container.update_item(tracker)
+            self._record_pending(self.trackers_container.update_item(tracker))
             
-            self.logger.info(f"Successfully discarded update for tracker: {tracker_id}")
+            self.logger.info("Successfully discarded update for tracker: %s", tracker_id)
             return True
             
         except Exception as e:
-            self.logger.error(f"Error discarding update: {str(e)}")
+            self.logger.error("Error discarding update: %s", e)
             return False
     
+    @tracing.traced()
     def recurring_notification(self) -> Dict[str, Any]:
         """
         Process recurring notifications for pending resume updates.
@@ -530,71 +541,93 @@ class ResumeUpdateProcessor:
                 "total_employees_processed": 0,  # Added this field
                 "notifications_sent": 0,
                 "skipped_cooldown": 0,
-                "errors": 0
+                "errors": 0,
+                "email": {}
             }
 
-            # Get all employees with pending updates
-            pending_updates = self.get_pending_updates()
-            
-            # Get unique employee IDs
-            employees_to_notify = {update['employee_id'] for update in pending_updates}
+            # Get all employees with pending updates with a point read per pending-updates index shard
+            employees_to_notify = self.pending_view.get_employees_with_pending()
             summary["total_employees_processed"] = len(employees_to_notify)
-            
-            # Process each employee
-            for employee_id in employees_to_notify:
+            if employees_to_notify:
+                # One query loads every email for the run instead of one per employee
+                self.employee_cache.warm_if_stale()
+
+            # Records and emails are loaded per chunk of employees rather than per employee
+            for start in range(0, len(employees_to_notify), self.NOTIFICATION_BATCH_SIZE):
+                chunk = employees_to_notify[start:start + self.NOTIFICATION_BATCH_SIZE]
                 try:
-                    if self._should_send_notification(employee_id):
-                        if self._send_notification(employee_id):
-                            self._update_notification_record(employee_id)
-                            summary["notifications_sent"] += 1
-                    else:
-                        summary["skipped_cooldown"] += 1
+                    self._notify_employees(chunk, summary)
                 except Exception as e:
-                    self.logger.error(f"Error processing notifications for employee {employee_id}: {str(e)}")
-                    summary["errors"] += 1
-
-            self.logger.info(f"Recurring notification process completed: {summary}")
+                    self.logger.error("Error processing notifications for %s employees: %s", len(chunk), e)
+                    summary["errors"] += len(chunk)
+
+            email_stats = summary["email"]
+            if email_stats.get("elapsed_seconds"):
+                email_stats["throughput_per_second"] = round(email_stats["sent"] / email_stats["elapsed_seconds"], 2)
+            summary["employee_cache"] = self.employee_cache.stats()
+            self.logger.info("Recurring notification process completed: %s", summary)
             return summary
 
         except Exception as e:
-            self.logger.error(f"Error in recurring notification process: {str(e)}")
+            self.logger.error("Error in recurring notification process: %s", e)
             raise
 
 
+    def _notify_employees(self, employee_ids: List[str], summary: Dict[str, int]) -> None:
+        """Send notifications to one chunk of employees and record them, updating the summary."""
+        records = self._get_notification_records(employee_ids)
+
+        due = []
+        for employee_id in employee_ids:
+            if self._cooldown_elapsed(records.get(employee_id)):
+                due.append(employee_id)
+            else:
+                summary["skipped_cooldown"] += 1
+        if not due:
+            return
+
+        emails = self._get_employee_emails(due)
+        messages = []
+        for employee_id in due:
+            if not emails[employee_id]:
+                self.logger.error("Could not send notification - no email found for employee %s", employee_id)
+                continue
+            messages.append((employee_id, self._build_notification_message(emails[employee_id])))
+
+        # Sends run concurrently; the summary accumulates the dispatcher's stats over the run
+        results = self.email_dispatcher.send_all(messages)
+        for name in ("sent", "failed", "retries", "rate_limited", "elapsed_seconds"):
+            summary["email"][name] = summary["email"].get(name, 0) + self.email_dispatcher.stats[name]
+        sent = [employee_id for employee_id, _ in messages if results.get(employee_id)]
+        if not sent:
+            return
+
+        failed = self._update_notification_records(sent, records)
+        summary["notifications_sent"] += len(sent) - len(failed)
+        summary["errors"] += len(failed)
+
+    def _cooldown_elapsed(self, notification_record: Optional[Dict]) -> bool:
+        """True if the employee has never been notified or the cooldown period has passed."""
+        if not notification_record:
+            return True
+        try:
+            last_notification = datetime.fromisoformat(notification_record['last_notification'])
+            return datetime.utcnow() - last_notification > self.notification_cooldown
+        except Exception as e:
+            self.logger.error("Error checking notification eligibility: %s", e)
+            return False
+
     def _should_send_notification(self, employee_id: str) -> bool:
         """
         Check if notification should be sent based on cooldown period.
         Returns True if last notification was more than cooldown period ago.
         """
         try:
-            query = """
-                SELECT * FROM c 
-                WHERE c.partitionKey = 'notifications'
-                AND c.id = @notification_id
-            """
-            parameters = [
-                {"name": "@notification_id", "value": f"notification-{employee_id}"}
-            ]
-            results = list(self.notification_container.query_items(
-                query=query,
-                parameters=parameters,
-                partition_key="notifications"
-            ))
-
-            if not results:
-                return True
-
-            notification_record = results[0]
-            last_notification = datetime.fromisoformat(notification_record['last_notification'])
-            
-            return datetime.utcnow() - last_notification > self.notification_cooldown
-
-        except Exception as e:
-            self.logger.error(f"Error checking notification eligibility: {str(e)}")
-            return False
+            notification_record = self.partition_router.read_item(self.notification_container, f"notification-{employee_id}", employee_id)
+            return self._cooldown_elapsed(notification_record)
 
         except Exception as e:
-            self.logger.error(f"Error checking notification eligibility: {str(e)}")
+            self.logger.error("Error checking notification eligibility: %s", e)
             return False
 
     def store_feedback(self, feedback_data: dict) -> dict:
@@ -622,11 +655,11 @@ class ResumeUpdateProcessor:
             }
             
             stored_feedback = self.feedback_container.create_item(feedback_doc)
-            self.logger.info(f"Stored feedback document with id: {stored_feedback['id']}")
+            self.logger.info("Stored feedback document with id: %s", stored_feedback['id'])
             
             return stored_feedback
             
         except Exception as e:
-            self.logger.error(f"Error storing feedback: {str(e)}")
+            self.logger.error("Error storing feedback: %s", e)
             raise
         
\ No newline at end of file
@@ -3,77 +3,265 @@
 
 This module handles interactions with Azure Cosmos DB, including database and container creation,
 and CRUD operations on documents. It automatically selects between key-based and DefaultAzureCredential
-authentication based on the presence of COSMOS_MASTER_KEY. Logging is configured to show only
-custom messages.
+authentication based on the presence of COSMOS_MASTER_KEY. Per-item operations log at DEBUG
+through structured_logging.log_sampled(); failures log at ERROR.
+
+Every operation runs in a tracing span (see tracing.py) that records its wall time, RU charge and
+payload size.
+
+CosmosClient instances are shared process-wide through a registry keyed by host and credential, so
+every CosmosDBManager pointing at the same account reuses one client and one HTTP connection pool.
+Database and container proxies are resolved lazily without any network calls; call provision() once
+for first-time setup to create the database and container if they do not exist.
 
 Requirements:
-    azure-cosmos==4.5.1
+    azure-cosmos==4.7.0
     azure-identity==1.12.0
 """
 
+import logging
 import os
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from dotenv import load_dotenv
+from azure.core import MatchConditions
+from azure.core.exceptions import ClientAuthenticationError, ServiceRequestError, ServiceResponseError
 from azure.cosmos import CosmosClient, exceptions, PartitionKey
 from azure.cosmos.container import ContainerProxy
 from azure.cosmos.database import DatabaseProxy
-from azure.identity import DefaultAzureCredential
+
+import tracing
+from structured_logging import log_sampled
+
+logger = logging.getLogger(__name__)
+
+# Cosmos DB rejects transactional batches with more than 100 operations
+MAX_BATCH_OPERATIONS = 100
+
+# Cosmos DB rejects patch requests with more than 10 operations
+MAX_PATCH_OPERATIONS = 10
+
+
+class PreconditionFailedError(Exception):
+    """Raised when a conditional write fails because the item's ETag no longer matches (HTTP 412)."""
+
+
+# Process-wide CosmosClient registry keyed by (host, credential key)
+_client_registry: Dict[Tuple[str, str], CosmosClient] = {}
+_client_registry_lock = threading.Lock()
+
+
+def get_shared_client(cosmos_host: str, tenant_id: str) -> CosmosClient:
+    """
+    Get the process-wide CosmosClient for a host and credential, creating it on first use.
+
+    :param cosmos_host: The Cosmos DB account endpoint
+    :param tenant_id: The tenant the DefaultAzureCredential authenticates against
+    :return: A CosmosClient shared by every caller with the same host and credential
+    """
+    key = (cosmos_host, tenant_id)
+    with _client_registry_lock:
+        client = _client_registry.get(key)
+        if client is None:
+            logger.info("Initializing Cosmos DB client for %s with DefaultAzureCredential", cosmos_host)
+            # azure.identity is only needed here, and is slow to import
+            from azure.identity import DefaultAzureCredential
+            credential = DefaultAzureCredential(
+                interactive_browser_tenant_id=tenant_id,
+                visual_studio_code_tenant_id=tenant_id,
+                workload_identity_tenant_id=tenant_id,
+                shared_cache_tenant_id=tenant_id
+            )
+            client = CosmosClient(cosmos_host, credential=credential)
+            _client_registry[key] = client
+        return client
+
+
+def reset_client_registry() -> None:
+    """Drop every shared client so the next CosmosDBManager builds a fresh one."""
+    with _client_registry_lock:
+        _client_registry.clear()
+
+
+def requires_client_rebuild(error: BaseException) -> bool:
+    """
+    Whether an error means the client itself is unusable (expired or revoked credentials, a
+    broken connection) rather than the request being wrong, so rebuilding clients may help.
+
+    :param error: The exception raised by a Cosmos DB or other Azure SDK call
+    """
+    if isinstance(error, (ClientAuthenticationError, ServiceRequestError, ServiceResponseError, ConnectionError)):
+        return True
+    return isinstance(error, exceptions.CosmosHttpResponseError) and error.status_code in (401, 403)
+
 
 class CosmosDBManager:
-    def __init__(self, cosmos_host=None, cosmos_database_id=None, cosmos_container_id=None):
-        self._load_env_variables(cosmos_host, cosmos_database_id, cosmos_container_id)
-        self.client = self._get_cosmos_client()
-        self.database: Optional[DatabaseProxy] = None
-        self.container: Optional[ContainerProxy] = None
-        self._initialize_database_and_container()
-
-    def _load_env_variables(self, cosmos_host=None, cosmos_database_id=None, cosmos_container_id=None):
+    def __init__(self, cosmos_host=None, cosmos_database_id=None, cosmos_container_id=None, client=None):
+        """
+        :param client: Optional client to use instead of the shared one for the host, e.g. an
+            in-memory fake; COSMOS_HOST is then not required
+        """
+        self._load_env_variables(cosmos_host, cosmos_database_id, cosmos_container_id, require_host=client is None)
+        self.client = client or self._get_cosmos_client()
+        self._database: Optional[DatabaseProxy] = None
+        self._container: Optional[ContainerProxy] = None
+        self._request_charges: Dict[str, Dict[str, float]] = {}
+        self._request_charges_lock = threading.Lock()
+
+    def _load_env_variables(self, cosmos_host=None, cosmos_database_id=None, cosmos_container_id=None, require_host=True):
         load_dotenv()
         self.cosmos_host = cosmos_host or os.environ.get("COSMOS_HOST")
         self.cosmos_database_id = cosmos_database_id or os.environ.get("COSMOS_DATABASE_ID")
         self.cosmos_container_id = cosmos_container_id or os.environ.get("COSMOS_CONTAINER_ID")
         self.tenant_id = os.environ.get("TENANT_ID", '16b3c013-d300-468d-ac64-7eda0820b6d3')
 
-        if not all([self.cosmos_host, self.cosmos_database_id, self.cosmos_container_id]):
+        if not all([self.cosmos_host or not require_host, self.cosmos_database_id, self.cosmos_container_id]):
             raise ValueError("Cosmos DB configuration is incomplete")
 
     def _get_cosmos_client(self) -> CosmosClient:
-        print("Initializing Cosmos DB client")
-        print("Using DefaultAzureCredential for Cosmos DB authentication")
-        credential = DefaultAzureCredential(
-            interactive_browser_tenant_id=self.tenant_id,
-            visual_studio_code_tenant_id=self.tenant_id,
-            workload_identity_tenant_id=self.tenant_id,
-            shared_cache_tenant_id=self.tenant_id
-        )
-        return CosmosClient(self.cosmos_host, credential=credential)
-
-    def _initialize_database_and_container(self) -> None:
+        return get_shared_client(self.cosmos_host, self.tenant_id)
+
+    @property
+    def database(self) -> DatabaseProxy:
+        # Resolving a proxy is local; no request is sent until an operation runs
+        if self._database is None:
+            self._database = self.client.get_database_client(self.cosmos_database_id)
+        return self._database
+
+    @property
+    def container(self) -> ContainerProxy:
+        if self._container is None:
+            self._container = self.database.get_container_client(self.cosmos_container_id)
+        return self._container
+
+    def provision(self) -> None:
+        """
+        Create the database and container if they do not exist. Only needed for first-time
+        setup; regular operations never issue control-plane calls.
+        """
         try:
-            self.database = self._create_or_get_database()
-            self.container = self._create_or_get_container()
+            self._database = self._create_or_get_database()
+            self._container = self._create_or_get_container()
         except exceptions.CosmosHttpResponseError as e:
-            print(f'An error occurred: {e.message}')
+            logger.error("Provisioning %s/%s failed: %s", self.cosmos_database_id, self.cosmos_container_id, e.message)
             raise
 
     def _create_or_get_database(self) -> DatabaseProxy:
         try:
             database = self.client.create_database(id=self.cosmos_database_id)
-            print(f'Database with id \'{self.cosmos_database_id}\' created')
+            logger.info("Database with id '%s' created", self.cosmos_database_id)
         except exceptions.CosmosResourceExistsError:
             database = self.client.get_database_client(self.cosmos_database_id)
-            print(f'Database with id \'{self.cosmos_database_id}\' was found')
+            logger.info("Database with id '%s' was found", self.cosmos_database_id)
         return database
 
     def _create_or_get_container(self) -> ContainerProxy:
         try:
             container = self.database.create_container(id=self.cosmos_container_id, partition_key=PartitionKey(path='/partitionKey'))
-            print(f'Container with id \'{self.cosmos_container_id}\' created')
+            logger.info("Container with id '%s' created", self.cosmos_container_id)
         except exceptions.CosmosResourceExistsError:
             container = self.database.get_container_client(self.cosmos_container_id)
-            print(f'Container with id \'{self.cosmos_container_id}\' was found')
+            logger.info("Container with id '%s' was found", self.cosmos_container_id)
         return container
 
+    def ping(self) -> None:
+        """
+        Send one cheap data-plane request (a point read of an item that does not exist, about
+        1 RU) to check that the client can still authenticate and connect.
+
+        :raises: The SDK error if the request fails for any reason other than the missing item
+        """
+        with self._span("ping"):
+            try:
+                self.container.read_item(item="__health_check__", partition_key="__health_check__", response_hook=self._charge_hook("ping"))
+            except exceptions.CosmosResourceNotFoundError:
+                pass
+
+    def _record_request_charge(self, operation: str, headers: Dict[str, Any]) -> float:
+        """
+        Record the RU charge of a request from the headers of its own response. The client is
+        shared between containers and threads, so its last_response_headers may belong to
+        another request.
+        """
+        charge = float(headers.get('x-ms-request-charge', 0) or 0)
+        tracing.current_span().add("db.cosmosdb.request_charge", charge)
+        with self._request_charges_lock:
+            totals = self._request_charges.setdefault(operation, {"count": 0, "request_charge": 0.0})
+            totals["count"] += 1
+            totals["request_charge"] += charge
+        return charge
+
+    def _span(self, operation: str, request_body: Any = None):
+        """Start the tracing span of one operation against this container."""
+        attributes = {
+            "db.system": "cosmosdb",
+            "db.operation": operation,
+            "db.name": self.cosmos_database_id,
+            "db.cosmosdb.container": self.cosmos_container_id
+        }
+        if request_body is not None and tracing.records_payloads():
+            attributes["payload.request_bytes"] = tracing.payload_size(request_body)
+        return tracing.span(f"cosmos.{operation}", attributes=attributes)
+
+    @staticmethod
+    def _record_response(span, response_body: Any) -> None:
+        if tracing.records_payloads():
+            span.add("payload.response_bytes", tracing.payload_size(response_body))
+
+    def _log_item(self, level: int, msg: str, *args: Any, operation: str) -> None:
+        """Sampled per-item log record tagged with this container and the operation."""
+        log_sampled(logger, level, msg, *args, container=self.cosmos_container_id, operation=operation)
+
+    def _charge_hook(self, operation: str):
+        """Build a response_hook that records the RU charge of a single operation."""
+        def hook(headers, _result):
+            self._record_request_charge(operation, headers)
+        return hook
+
+    def _page_charge_hook(self, operation: str):
+        """Build a response_hook that records the RU charge of each page of a query."""
+        def hook(headers, result):
+            # Also called once when the iterator is created, with unrelated headers; skip that call
+            if isinstance(result, dict):
+                self._record_request_charge(operation, headers)
+        return hook
+
+    def get_request_charges(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the request count and total RU charge recorded per operation type.
+
+        :return: e.g. {"read": {"count": 10, "request_charge": 10.0}, "query": {...}}
+        """
+        with self._request_charges_lock:
+            return {operation: dict(totals) for operation, totals in self._request_charges.items()}
+
+    def reset_request_charges(self) -> None:
+        with self._request_charges_lock:
+            self._request_charges = {}
+
+    def read_item(self, item_id: str, partition_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Point-read an item by id and partition key. This is the cheapest and lowest-latency
+        way to fetch a single document, so prefer it over a query whenever both are known.
+
+        :param item_id: The id of the item
+        :param partition_key: The partition key of the item
+        :return: The item, or None if it does not exist or the read failed
+        """
+        with self._span("read") as span:
+            try:
+                item = self.container.read_item(item=item_id, partition_key=partition_key, response_hook=self._charge_hook("read"))
+                self._record_response(span, item)
+                return item
+            except exceptions.CosmosResourceNotFoundError as e:
+                self._record_request_charge("read", getattr(e, 'headers', None) or {})
+                return None
+            except exceptions.CosmosHttpResponseError as e:
+                span.record_exception(e)
+                logger.error("An error occurred during read in %s: %s", self.cosmos_container_id, e.message)
+                return None
+
     def create_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a new item in the container. Fails if an item with the same ID already exists.
@@ -81,34 +269,90 @@ class CosmosDBManager:
         :param item: The item to create
         :return: The created item, or None if creation failed
         """
-        try:
-            created_item = self.container.create_item(body=item)
-            print(f"Item created with id: {created_item['id']}")
-            return created_item
-        except exceptions.CosmosResourceExistsError:
-            print(f"Item with id {item['id']} already exists. Use update_item or upsert_item to modify.")
-            return None
-        except exceptions.CosmosHttpResponseError as e:
-            print(f"An error occurred during creation: {e.message}")
-            return None
+        with self._span("create", item) as span:
+            try:
+                created_item = self.container.create_item(body=item, response_hook=self._charge_hook("create"))
+                self._log_item(logging.DEBUG, "Item created with id: %s", created_item['id'], operation="create")
+                return created_item
+            except exceptions.CosmosResourceExistsError:
+                self._log_item(logging.DEBUG, "Item with id %s already exists. Use update_item or upsert_item to modify.", item['id'], operation="create")
+                return None
+            except exceptions.CosmosHttpResponseError as e:
+                span.record_exception(e)
+                logger.error("An error occurred during creation in %s: %s", self.cosmos_container_id, e.message)
+                return None
 
-    def update_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+    def update_item(self, item: Dict[str, Any], etag: Optional[str] = None) -> Dict[str, Any]:
         """
         Update an existing item in the container. Fails if the item doesn't exist.
 
         :param item: The item to update (must include 'id' and 'partitionKey')
+        :param etag: If given, only replace the item when its current ETag matches (if-match)
         :return: The updated item, or None if update failed
+        :raises PreconditionFailedError: If etag was given and the item has changed since it was read
         """
-        try:
-            updated_item = self.container.replace_item(item=item['id'], body=item)
-            print(f"Item updated with id: {updated_item['id']}")
-            return updated_item
-        except exceptions.CosmosResourceNotFoundError:
-            print(f"Item with id {item['id']} not found. Unable to update.")
-            return None
-        except exceptions.CosmosHttpResponseError as e:
-            print(f"An error occurred during update: {e.message}")
-            return None
+        with self._span("replace", item) as span:
+            try:
+                conditions = {"etag": etag, "match_condition": MatchConditions.IfNotModified} if etag else {}
+                updated_item = self.container.replace_item(
+                    item=item['id'],
+                    body=item,
+                    response_hook=self._charge_hook("replace"),
+                    **conditions
+                )
+                self._log_item(logging.DEBUG, "Item updated with id: %s", updated_item['id'], operation="replace")
+                return updated_item
+            except exceptions.CosmosAccessConditionFailedError:
+                self._log_item(logging.DEBUG, "Item with id %s was modified concurrently (ETag mismatch)", item['id'], operation="replace")
+                raise PreconditionFailedError(item['id'])
+            except exceptions.CosmosResourceNotFoundError:
+                logger.warning("Item with id %s not found in %s. Unable to update.", item['id'], self.cosmos_container_id)
+                return None
+            except exceptions.CosmosHttpResponseError as e:
+                span.record_exception(e)
+                logger.error("An error occurred during update in %s: %s", self.cosmos_container_id, e.message)
+                return None
+
+    def patch_item(self, item_id: str, partition_key: str, patch_operations: List[Dict[str, Any]],
+                   etag: Optional[str] = None, filter_predicate: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Apply partial-document patch operations (set, incr, add, remove, replace) to an item
+        server-side, so only the changed fields travel over the wire. At most 10 operations
+        may be sent per call.
+
+        :param item_id: The id of the item to patch
+        :param partition_key: The partition key of the item
+        :param patch_operations: e.g. [{"op": "set", "path": "/status", "value": "done"}, {"op": "incr", "path": "/version", "value": 1}]
+        :param etag: If given, only patch the item when its current ETag matches (if-match)
+        :param filter_predicate: If given, only patch the item when it matches, e.g. "FROM c WHERE c.status = 'new'"
+        :return: The patched item, or None if the item doesn't exist or the patch failed
+        :raises PreconditionFailedError: If the ETag or filter predicate did not match
+        """
+        with self._span("patch", patch_operations) as span:
+            try:
+                conditions = {"etag": etag, "match_condition": MatchConditions.IfNotModified} if etag else {}
+                if filter_predicate:
+                    conditions["filter_predicate"] = filter_predicate
+                patched_item = self.container.patch_item(
+                    item=item_id,
+                    partition_key=partition_key,
+                    patch_operations=patch_operations,
+                    response_hook=self._charge_hook("patch"),
+                    **conditions
+                )
+                self._record_response(span, patched_item)
+                self._log_item(logging.DEBUG, "Item patched with id: %s", patched_item['id'], operation="patch")
+                return patched_item
+            except exceptions.CosmosAccessConditionFailedError:
+                self._log_item(logging.DEBUG, "Precondition failed while patching item with id %s", item_id, operation="patch")
+                raise PreconditionFailedError(item_id)
+            except exceptions.CosmosResourceNotFoundError:
+                logger.warning("Item with id %s not found in %s. Unable to patch.", item_id, self.cosmos_container_id)
+                return None
+            except exceptions.CosmosHttpResponseError as e:
+                span.record_exception(e)
+                logger.error("An error occurred during patch in %s: %s", self.cosmos_container_id, e.message)
+                return None
 
     def upsert_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -117,39 +361,205 @@ class CosmosDBManager:
         :param item: The item to upsert
         :return: The upserted item, or None if upsert failed
         """
-        try:
-            upserted_item = self.container.upsert_item(body=item)
-            print(f"Item upserted with id: {upserted_item['id']}")
-            return upserted_item
-        except exceptions.CosmosHttpResponseError as e:
-            print(f"An error occurred during upsert: {e.message}")
-            return None
+        with self._span("upsert", item) as span:
+            try:
+                upserted_item = self.container.upsert_item(body=item, response_hook=self._charge_hook("upsert"))
+                self._log_item(logging.DEBUG, "Item upserted with id: %s", upserted_item['id'], operation="upsert")
+                return upserted_item
+            except exceptions.CosmosHttpResponseError as e:
+                span.record_exception(e)
+                logger.error("An error occurred during upsert in %s: %s", self.cosmos_container_id, e.message)
+                return None
+
+    def execute_batch(self, operations: List[Tuple], partition_key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Execute a transactional batch of operations against a single logical partition.
+        Either every operation succeeds or none of them are applied.
+
+        :param operations: Batch operations, e.g. ("create", (item,)) or ("upsert", (item,))
+        :param partition_key: The partition key shared by every operation in the batch
+        :return: The resource body of each operation in order, or None if the batch failed
+        """
+        with self._span("batch", operations) as span:
+            span.set_attribute("db.cosmosdb.batch_size", len(operations))
+            try:
+                results = self.container.execute_item_batch(
+                    batch_operations=operations,
+                    partition_key=partition_key,
+                    response_hook=self._charge_hook("batch")
+                )
+                self._log_item(logging.DEBUG, "Batch of %d operations executed in partition %s", len(operations), partition_key, operation="batch")
+                return [result.get('resourceBody') for result in results]
+            except exceptions.CosmosBatchOperationError as e:
+                span.record_exception(e)
+                logger.error("Batch in %s failed at operation %s: %s", self.cosmos_container_id, e.error_index, e.message)
+                return None
+            except exceptions.CosmosHttpResponseError as e:
+                span.record_exception(e)
+                logger.error("An error occurred during batch execution in %s: %s", self.cosmos_container_id, e.message)
+                return None
+
+    def create_items(self, items: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Create many items using transactional batches grouped by partition key.
+
+        :param items: The items to create (each must include 'partitionKey')
+        :return: The created items in input order; None for items whose batch failed
+        """
+        return self.execute_in_batches([("create", (item,)) for item in items], [item['partitionKey'] for item in items])
+
+    def upsert_items(self, items: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Upsert many items using transactional batches grouped by partition key.
+
+        :param items: The items to upsert (each must include 'partitionKey')
+        :return: The upserted items in input order; None for items whose batch failed
+        """
+        return self.execute_in_batches([("upsert", (item,)) for item in items], [item['partitionKey'] for item in items])
+
+    def execute_in_batches(self, operations: List[Tuple], partition_keys: List[str], max_concurrency: int = 8) -> List[Optional[Dict[str, Any]]]:
+        """
+        Execute any number of batch operations, grouped by partition key and split into
+        transactional batches of at most MAX_BATCH_OPERATIONS. Batches for different
+        partitions run concurrently.
+
+        :param operations: Batch operations, e.g. ("patch", (id, patch_operations), {"if_match_etag": etag})
+        :param partition_keys: The partition key of each operation
+        :param max_concurrency: Maximum number of batches in flight at once
+        :return: The resource body of each operation in input order; None for operations whose batch failed
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(operations)
+
+        # Transactional batches are scoped to a single logical partition
+        positions_by_partition: Dict[str, List[int]] = {}
+        for position, partition_key in enumerate(partition_keys):
+            positions_by_partition.setdefault(partition_key, []).append(position)
+
+        chunks = []
+        for partition_key, positions in positions_by_partition.items():
+            for start in range(0, len(positions), MAX_BATCH_OPERATIONS):
+                chunks.append((partition_key, positions[start:start + MAX_BATCH_OPERATIONS]))
+
+        def run_chunk(chunk):
+            partition_key, positions = chunk
+            return positions, self.execute_batch([operations[position] for position in positions], partition_key)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(chunks)))) as executor:
+            for positions, written in executor.map(tracing.propagate(run_chunk), chunks):
+                if written is None:
+                    continue
+                for position, item in zip(positions, written):
+                    results[position] = item
+        return results
 
     def query_items(self, query: str, parameters: Optional[List[Dict[str, Any]]] = None, partition_key: Optional[str] = None) -> List[Dict[str, Any]]:
-        try:
-            items = list(self.container.query_items(
-                query=query,
-                parameters=parameters,
-                partition_key=partition_key,
-                enable_cross_partition_query=(partition_key is None)
-            ))
-            print(f"Query returned {len(items)} items")
-            return items
-        except exceptions.CosmosHttpResponseError as e:
-            print(f"An error occurred during query: {e.message}")
-            return []
+        with self._span("query") as span:
+            try:
+                # Each page is a separate request with its own RU charge
+                pages = self.container.query_items(
+                    query=query,
+                    parameters=parameters,
+                    partition_key=partition_key,
+                    enable_cross_partition_query=(partition_key is None),
+                    response_hook=self._page_charge_hook("query")
+                ).by_page()
+                items = []
+                for page in pages:
+                    items.extend(page)
+                self._record_response(span, items)
+                self._log_item(logging.DEBUG, "Query returned %d items", len(items), operation="query")
+                return items
+            except exceptions.CosmosHttpResponseError as e:
+                span.record_exception(e)
+                logger.error("An error occurred during query in %s: %s", self.cosmos_container_id, e.message)
+                return []
+
+    def iter_items(self, query: str, parameters: Optional[List[Dict[str, Any]]] = None, partition_key: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield query results page by page, so large result sets never sit in memory at once.
+        Unlike query_items, errors are raised to the caller. Each page gets its own span.
+        """
+        pages = self.container.query_items(
+            query=query,
+            parameters=parameters,
+            partition_key=partition_key,
+            enable_cross_partition_query=(partition_key is None),
+            response_hook=self._page_charge_hook("query")
+        ).by_page()
+        while True:
+            with self._span("query") as span:
+                page = next(pages, None)
+                if page is None:
+                    return
+                items = list(page)
+                self._record_response(span, items)
+            yield from items
+
+    def read_partition_key_ranges(self) -> List[str]:
+        """
+        Get the ids of the container's physical partition key ranges. The change feed is read
+        per range, each with its own continuation token.
+        """
+        # azure-cosmos 4.7 has no public API for this (read_feed_ranges arrives in 4.8), so the
+        # client's private method is used and requirements.txt pins the SDK exactly. Move to
+        # read_feed_ranges and query_items_change_feed(feed_range=...) when upgrading.
+        read_ranges = getattr(self.container.client_connection, "_ReadPartitionKeyRanges", None)
+        if read_ranges is None:
+            raise RuntimeError("This azure-cosmos version has no _ReadPartitionKeyRanges; "
+                               "read partition key ranges with read_feed_ranges instead")
+        with self._span("read_partition_key_ranges"):
+            ranges = read_ranges(self.container.container_link)
+            return [partition_key_range['id'] for partition_key_range in ranges]
+
+    def read_change_feed(self, partition_key_range_id: str, continuation: Optional[str] = None,
+                         max_item_count: int = 100) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Read the next page of changes from one partition key range.
+
+        :param partition_key_range_id: The range to read, from read_partition_key_ranges()
+        :param continuation: The token returned by the previous call; None starts from the beginning
+        :param max_item_count: Maximum number of changed items to return
+        :return: (items, continuation). The continuation is unchanged when there are no new changes.
+        """
+        # The continuation is the ETag header of the page that returned the items. Capture it
+        # from this request's own headers since the client is shared between threads.
+        page_headers: Dict[str, Any] = {}
+
+        def hook(headers, result):
+            # Also called once when the iterator is created, with unrelated headers; skip that call
+            if not isinstance(result, dict):
+                return
+            page_headers.clear()
+            page_headers.update(headers)
+            self._record_request_charge("change_feed", headers)
+
+        with self._span("change_feed") as span:
+            pages = self.container.query_items_change_feed(
+                partition_key_range_id=partition_key_range_id,
+                is_start_from_beginning=continuation is None,
+                continuation=continuation,
+                max_item_count=max_item_count,
+                response_hook=hook
+            ).by_page()
+            items = list(next(pages, []))
+            self._record_response(span, items)
+        if not items:
+            return [], continuation
+        return items, page_headers.get('etag', continuation)
 
     def delete_item(self, item_id: str, partition_key: str) -> bool:
-        try:
-            self.container.delete_item(item=item_id, partition_key=partition_key)
-            print(f"Item deleted with id: {item_id}")
-            return True
-        except exceptions.CosmosResourceNotFoundError:
-            print(f"Item with id {item_id} not found. Unable to delete.")
-            return False
-        except exceptions.CosmosHttpResponseError as e:
-            print(f"An error occurred during deletion: {e.message}")
-            return False
+        with self._span("delete") as span:
+            try:
+                self.container.delete_item(item=item_id, partition_key=partition_key, response_hook=self._charge_hook("delete"))
+                self._log_item(logging.DEBUG, "Item deleted with id: %s", item_id, operation="delete")
+                return True
+            except exceptions.CosmosResourceNotFoundError:
+                logger.warning("Item with id %s not found in %s. Unable to delete.", item_id, self.cosmos_container_id)
+                return False
+            except exceptions.CosmosHttpResponseError as e:
+                span.record_exception(e)
+                logger.error("An error occurred during deletion in %s: %s", self.cosmos_container_id, e.message)
+                return False
 
 def example_create_item():
     cosmos_db = CosmosDBManager()
@@ -209,6 +619,7 @@ def example_delete_item():
 
 if __name__ == "__main__":
     try:
+        CosmosDBManager().provision()
         example_create_item()
         example_update_item()
         example_upsert_item()
@@ -0,0 +1,310 @@
+"""
+### email_dispatch.py ###
+
+Concurrent sending of notification emails through Azure Communication Services (ACS).
+
+EmailClient.begin_send() returns a poller per message, and notification runs used to block on
+each poller before sending the next message, so a run took recipients x send latency. The
+EmailDispatcher keeps up to max_in_flight operations outstanding: submissions run on a small
+thread pool, and one loop checks every outstanding poller per round instead of waiting on them
+one at a time.
+
+When ACS rejects a send with 429 (too many requests), the dispatcher backs off. It stops
+submitting until the Retry-After time has passed and halves its in-flight limit. The limit
+then grows back by one for every successful send. Other transient failures (5xx responses and
+connection errors) are retried with exponential backoff. A message is given up on after
+max_retries retries, or when its operation does not finish within the send timeout.
+
+Configuration (environment):
+    EMAIL_MAX_IN_FLIGHT          concurrent send operations (default 16)
+    EMAIL_MAX_RETRIES            retries per message (default 5)
+    EMAIL_SEND_TIMEOUT_SECONDS   how long one operation may take to finish (default 300)
+    EMAIL_SINK_DIR               write messages to this directory instead of sending them
+                                 (LocalEmailSink), for local runs and testing
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from azure.core.exceptions import HttpResponseError, ServiceRequestError, ServiceResponseError
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 16
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_SEND_TIMEOUT_SECONDS = 300.0
+
+# Used when a 429 response carries no Retry-After header
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+POLL_INTERVAL_SECONDS = 0.05
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Read the Retry-After (or retry-after-ms) header of a failed response, in seconds."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for header, scale in (("retry-after-ms", 0.001), ("x-ms-retry-after-ms", 0.001), ("Retry-After", 1.0)):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            return float(value) * scale
+        except ValueError:
+            continue
+    return None
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    return isinstance(error, HttpResponseError) and error.status_code == 429
+
+
+def is_transient(error: BaseException) -> bool:
+    """True for errors worth retrying: rate limiting, server errors and connection failures."""
+    if isinstance(error, (ServiceRequestError, ServiceResponseError, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, HttpResponseError):
+        return error.status_code is None or error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+class _Send:
+    """One message on its way through the dispatcher."""
+
+    def __init__(self, key: str, message: Dict[str, Any]):
+        self.key = key
+        self.message = message
+        self.attempts = 0
+        self.not_before = 0.0
+        self.poller = None
+        self.submitted_at = 0.0
+
+
+class EmailDispatcher:
+    """
+    Sends many messages concurrently through one EmailClient, within ACS rate limits.
+
+    Usage:
+        dispatcher = EmailDispatcher(email_client)
+        results = dispatcher.send_all([(employee_id, message), ...])
+        results[employee_id]   # True if the message was accepted and sent
+        dispatcher.stats       # throughput, failures and retries of the last run
+    """
+
+    def __init__(self, email_client: Any, max_in_flight: Optional[int] = None, max_retries: Optional[int] = None,
+                 send_timeout: Optional[float] = None):
+        self.email_client = email_client
+        self.max_in_flight = max_in_flight or int(os.environ.get("EMAIL_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT))
+        self.max_retries = max_retries if max_retries is not None else int(os.environ.get("EMAIL_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+        self.send_timeout = send_timeout or float(os.environ.get("EMAIL_SEND_TIMEOUT_SECONDS", DEFAULT_SEND_TIMEOUT_SECONDS))
+        self.stats: Dict[str, Any] = {}
+
+    def send_all(self, messages: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, bool]:
+        """
+        Send every message and wait for all of them to finish.
+
+        Args:
+            messages: (key, message) pairs; the key identifies the message in the results,
+                      e.g. the employee id
+
+        Returns:
+            Dict[str, bool]: True for each key whose message was sent, False if it failed
+        """
+        started = time.perf_counter()
+        waiting = deque(_Send(key, message) for key, message in messages)
+        submitting: Dict[Future, _Send] = {}
+        outstanding: List[_Send] = []
+        results: Dict[str, bool] = {}
+        failures: Dict[str, str] = {}
+        stats = {"messages": len(waiting), "sent": 0, "failed": 0, "retries": 0, "rate_limited": 0, "peak_in_flight": 0}
+        limit = self.max_in_flight
+        paused_until = 0.0
+
+        def fail(send: _Send, reason: str) -> None:
+            results[send.key] = False
+            failures[send.key] = reason
+            stats["failed"] += 1
+            logger.error("Email for %s failed after %d attempts: %s", send.key, send.attempts, reason)
+
+        def retry(send: _Send, error: BaseException) -> None:
+            nonlocal limit, paused_until
+            if not is_transient(error) or send.attempts > self.max_retries:
+                fail(send, str(error))
+                return
+            stats["retries"] += 1
+            now = time.monotonic()
+            if is_rate_limited(error):
+                # Back off as a whole: nothing is submitted until the service allows it again
+                stats["rate_limited"] += 1
+                delay = retry_after_seconds(error) or DEFAULT_RETRY_AFTER_SECONDS
+                if now >= paused_until:
+                    # Sends rejected in the same burst count as one signal
+                    limit = max(1, limit // 2)
+                    logger.warning("Email sending rate limited, pausing %.1fs and lowering to %d sends in flight", delay, limit)
+                paused_until = max(paused_until, now + delay)
+            else:
+                delay = min(MAX_BACKOFF_SECONDS, retry_after_seconds(error) or 2 ** (send.attempts - 1))
+            send.not_before = now + delay
+            waiting.append(send)
+
+        def succeed(send: _Send) -> None:
+            nonlocal limit
+            results[send.key] = True
+            stats["sent"] += 1
+            limit = min(self.max_in_flight, limit + 1)
+
+        with tracing.span("email.dispatch", attributes={"email.messages": len(waiting)}) as span, \
+                ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            submit = tracing.propagate(self._submit)
+            while waiting or submitting or outstanding:
+                now = time.monotonic()
+
+                # Submit while there is room, unless the service asked us to wait
+                deferred = []
+                while waiting and now >= paused_until and len(submitting) + len(outstanding) < limit:
+                    send = waiting.popleft()
+                    if send.not_before > now:
+                        deferred.append(send)
+                        continue
+                    send.attempts += 1
+                    submitting[executor.submit(submit, send.message)] = send
+                waiting.extend(deferred)
+                stats["peak_in_flight"] = max(stats["peak_in_flight"], len(submitting) + len(outstanding))
+
+                # Collect finished submissions; each accepted message gets a poller
+                for future in [future for future in submitting if future.done()]:
+                    send = submitting.pop(future)
+                    try:
+                        send.poller = future.result()
+                        send.submitted_at = now
+                        outstanding.append(send)
+                    except Exception as e:
+                        retry(send, e)
+
+                # One pass over every outstanding operation
+                still_outstanding = []
+                for send in outstanding:
+                    if not send.poller.done():
+                        if now - send.submitted_at > self.send_timeout:
+                            fail(send, f"operation did not finish within {self.send_timeout:.0f}s")
+                        else:
+                            still_outstanding.append(send)
+                        continue
+                    try:
+                        result = send.poller.result()
+                    except Exception as e:
+                        # The message was accepted; sending it again could deliver it twice
+                        fail(send, str(e))
+                        continue
+                    status = (result or {}).get("status", "Succeeded")
+                    if status == "Succeeded":
+                        succeed(send)
+                    else:
+                        fail(send, f"status {status}: {(result or {}).get('error')}")
+                outstanding = still_outstanding
+
+                if waiting or submitting or outstanding:
+                    time.sleep(POLL_INTERVAL_SECONDS)
+
+            elapsed = time.perf_counter() - started
+            stats["elapsed_seconds"] = round(elapsed, 3)
+            stats["throughput_per_second"] = round(stats["sent"] / elapsed, 2) if elapsed > 0 else 0.0
+            stats["failures"] = failures
+            for name in ("sent", "failed", "retries", "rate_limited"):
+                span.set_attribute(f"email.{name}", stats[name])
+
+        self.stats = stats
+        logger.info("Email dispatch: %d sent, %d failed, %d retries (%d rate limited) in %.2fs, %.1f/s",
+                    stats["sent"], stats["failed"], stats["retries"], stats["rate_limited"], elapsed, stats["throughput_per_second"])
+        return results
+
+    def _submit(self, message: Dict[str, Any]) -> Any:
+        with tracing.span("email.send", attributes={"payload.request_bytes": tracing.payload_size(message)}):
+            return self.email_client.begin_send(message)
+
+
+###########################################################################
+# Local email sink
+###########################################################################
+
+class _SinkResponse:
+    """The parts of an HTTP response HttpResponseError reads."""
+
+    def __init__(self, status_code: int, reason: str, headers: Dict[str, str]):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+
+    def text(self) -> str:
+        return ""
+
+
+class _SinkPoller:
+    def __init__(self, result: Dict[str, Any], ready_at: float):
+        self._result = result
+        self._ready_at = ready_at
+
+    def done(self) -> bool:
+        return time.monotonic() >= self._ready_at
+
+    def status(self) -> str:
+        return self._result["status"] if self.done() else "Running"
+
+    def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        remaining = self._ready_at - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+        return self._result
+
+
+class LocalEmailSink:
+    """
+    Stand-in for EmailClient that writes each message to a JSON file instead of sending it.
+
+    It can also emulate the service's behaviour under load, so the dispatcher's concurrency and
+    backpressure can be exercised locally: operations finish after latency_ms, and sends beyond
+    rate_limit_per_second are rejected with 429 and a Retry-After header.
+    """
+
+    def __init__(self, directory: Optional[str] = None, latency_ms: float = 0.0, rate_limit_per_second: float = 0.0):
+        self.directory = directory or os.environ.get("EMAIL_SINK_DIR")
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        self.latency_ms = latency_ms
+        self.rate_limit_per_second = rate_limit_per_second
+        self.sent: List[Dict[str, Any]] = []
+        self.rejected = 0
+        self._window: deque = deque()
+        self._lock = threading.Lock()
+
+    def begin_send(self, message: Dict[str, Any], **kwargs) -> _SinkPoller:
+        now = time.monotonic()
+        with self._lock:
+            if self.rate_limit_per_second:
+                while self._window and now - self._window[0] >= 1.0:
+                    self._window.popleft()
+                if len(self._window) >= self.rate_limit_per_second:
+                    self.rejected += 1
+                    retry_after = max(0.0, 1.0 - (now - self._window[0]))
+                    raise HttpResponseError(
+                        message="Too many requests",
+                        response=_SinkResponse(429, "Too Many Requests", {"retry-after-ms": str(int(retry_after * 1000) + 1)})
+                    )
+                self._window.append(now)
+
+            message_id = str(uuid.uuid4())
+            self.sent.append({"id": message_id, "message": message, "sent_at": time.time()})
+
+        if self.directory:
+            with open(os.path.join(self.directory, f"{message_id}.json"), "w", encoding="utf-8") as f:
+                json.dump(message, f, indent=2)
+        return _SinkPoller({"id": message_id, "status": "Succeeded", "error": None}, now + self.latency_ms / 1000.0)
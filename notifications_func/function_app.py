@@ -1,14 +1,30 @@
 import logging
-import azure.functions as func
-import logging
-from datetime import datetime
+import threading
+import time
+from typing import Optional
+
 import azure.functions as func
 from ResumeUpdateProcessor import ResumeUpdateProcessor
+from cosmosdb import requires_client_rebuild, reset_client_registry
+import tracing
+from structured_logging import configure_logging
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 app = func.FunctionApp()
 
+# One processor per worker process, reused by every invocation while the host stays warm.
+# Building it creates the Cosmos client (credential, account metadata) and the email client,
+# which is several seconds of setup; it is only rebuilt after an auth or connection failure.
+_processor: Optional[ResumeUpdateProcessor] = None
+_processor_built_at = 0.0
+_processor_runs = 0
+_processor_lock = threading.Lock()
+
+
 @app.timer_trigger(schedule="0 */5 * * * *", arg_name="myTimer", run_on_startup=False,
-              use_monitor=False) 
+              use_monitor=False)
 def timer_trigger(myTimer: func.TimerRequest) -> None:
     if myTimer.past_due:
         logging.info('The timer is past due!')
@@ -16,6 +32,49 @@ def timer_trigger(myTimer: func.TimerRequest) -> None:
     logging.info('Python timer trigger function executed.')
 
 
+def get_processor() -> ResumeUpdateProcessor:
+    """Get the warm processor, building it on the first invocation or after a reset."""
+    global _processor, _processor_built_at, _processor_runs
+    with _processor_lock:
+        if _processor is None:
+            started = time.perf_counter()
+            _processor = ResumeUpdateProcessor()
+            _processor_built_at = time.time()
+            _processor_runs = 0
+            logger.info("Built notification processor in %.2fs", time.perf_counter() - started)
+        else:
+            logger.info("Reusing warm notification processor (%d previous runs, built %.0fs ago)", _processor_runs, time.time() - _processor_built_at)
+        _processor_runs += 1
+        return _processor
+
+
+def reset_processor() -> None:
+    """Drop the processor and the shared Cosmos clients so the next run rebuilds them with fresh credentials."""
+    global _processor
+    with _processor_lock:
+        _processor = None
+    reset_client_registry()
+
+
+def get_healthy_processor() -> ResumeUpdateProcessor:
+    """
+    Get the warm processor after a cheap health check. If the check fails with an auth or
+    connection error, rebuild the clients once and check again; other errors are raised.
+    """
+    processor = get_processor()
+    try:
+        processor.check_health()
+        return processor
+    except Exception as e:
+        if not requires_client_rebuild(e):
+            raise
+        logger.warning("Notification processor health check failed, rebuilding clients: %s", e)
+
+    reset_processor()
+    processor = get_processor()
+    processor.check_health()
+    return processor
+
 
 def run_notifications():
     """
@@ -23,19 +82,26 @@ def run_notifications():
     This function can be scheduled to run periodically.
     """
     try:
-        print("Starting notification runner")
-        processor = ResumeUpdateProcessor()
-        
+        logger.info("Starting notification runner")
+        processor = get_healthy_processor()
+
         # Run the recurring notification process
         result = processor.recurring_notification()
-        
+
         # Log the results
-        print("Notification process completed")
-        print(f"Total employees processed: {result['total_employees_processed']}")
-        print(f"Notifications sent: {result['notifications_sent']}")
-        print(f"Skipped (cooldown): {result['skipped_cooldown']}")
-        print(f"Errors: {result['errors']}")
-        
+        logger.info("Notification process completed: %d employees processed, %d notifications sent, "
+                    "%d skipped (cooldown), %d errors", result['total_employees_processed'],
+                    result['notifications_sent'], result['skipped_cooldown'], result['errors'])
+        logger.info("Email dispatch: %s", result['email'])
+
     except Exception as e:
-        print(f"Error in notification runner: {str(e)}")
-        raise
\ No newline at end of file
+        logger.error("Error in notification runner: %s", e)
+        if requires_client_rebuild(e):
+            # Start the next tick with fresh clients rather than failing again
+            reset_processor()
+        raise
+    finally:
+        # Per-run call timings, RU charges and payload sizes; spans go to TRACING_EXPORTER
+        logger.info("Notification run metrics: %s", tracing.get_metrics_snapshot())
+        tracing.reset_metrics()
+        tracing.flush()
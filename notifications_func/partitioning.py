@@ -0,0 +1,152 @@
+"""
+### partitioning.py ###
+
+Routes employee-scoped documents (resume trackers, notification records and employee metadata)
+to their Cosmos DB partition.
+
+Historically every document in these containers shared one fixed partition key value
+("resumeupdatestatus", "notifications", "metadata"), which made each container a single hot
+logical partition. Documents are now partitioned by employee id. The partition key path is
+still /partitionKey, so no container has to be recreated; only the value changes.
+
+COSMOS_PARTITION_MODE selects how reads and writes are routed:
+    legacy    read and write the fixed legacy partitions (pre-migration behaviour)
+    dual      cutover window: write the employee partition, read it first and fall back to the
+              legacy partition. A document found only in the legacy partition is moved to its
+              employee partition on first read, so it is never updated in two places.
+    employee  read and write only the employee partition (after migrate_partitions.py has run)
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from cosmosdb import CosmosDBManager
+
+LEGACY_PARTITION_KEYS = {
+    "resume_trackers": "resumeupdatestatus",
+    "notifications": "notifications",
+    "employee_metadata": "metadata",
+}
+
+PARTITION_MODES = ("legacy", "dual", "employee")
+
+# Fields Cosmos DB adds to every document; they must not be copied between partitions
+SYSTEM_FIELDS = ("_rid", "_self", "_etag", "_attachments", "_ts")
+
+
+def strip_system_fields(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of the item without Cosmos DB system properties."""
+    return {key: value for key, value in item.items() if key not in SYSTEM_FIELDS}
+
+
+class PartitionRouter:
+    def __init__(self, mode: Optional[str] = None):
+        self.mode = mode or os.environ.get("COSMOS_PARTITION_MODE", "dual")
+        if self.mode not in PARTITION_MODES:
+            raise ValueError(f"Unknown COSMOS_PARTITION_MODE '{self.mode}', expected one of {PARTITION_MODES}")
+
+    def partition_key(self, container_id: str, employee_id: str) -> str:
+        """Get the partition key new writes for an employee's document should use."""
+        if self.mode == "legacy":
+            return LEGACY_PARTITION_KEYS[container_id]
+        return employee_id
+
+    def read_partition_keys(self, container_id: str, employee_id: str) -> List[str]:
+        """Get the partition keys to look in, in order of preference."""
+        if self.mode == "dual":
+            return [employee_id, LEGACY_PARTITION_KEYS[container_id]]
+        return [self.partition_key(container_id, employee_id)]
+
+    def read_item(self, container: CosmosDBManager, item_id: str, employee_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Point-read an employee's document wherever it currently lives.
+
+        In dual mode a document found only in the legacy partition is moved to the employee
+        partition before it is returned, so callers can always write to partition_key().
+
+        :return: The document, or None if it does not exist in any candidate partition
+        """
+        container_id = container.cosmos_container_id
+        item = container.read_item(item_id, self.partition_key(container_id, employee_id))
+        if item is not None or self.mode != "dual":
+            return item
+
+        legacy_item = container.read_item(item_id, LEGACY_PARTITION_KEYS[container_id])
+        if legacy_item is None:
+            return None
+        return self.promote_item(container, legacy_item, employee_id)
+
+    def promote_item(self, container: CosmosDBManager, legacy_item: Dict[str, Any], employee_id: str) -> Optional[Dict[str, Any]]:
+        """Move a document from its legacy partition to its employee partition."""
+        target_partition_key = self.partition_key(container.cosmos_container_id, employee_id)
+        promoted = strip_system_fields(legacy_item)
+        promoted['partitionKey'] = target_partition_key
+
+        # Never overwrite: a concurrent reader or the migration tool may have promoted it first
+        created = container.create_item(promoted)
+        if created is None:
+            created = container.read_item(legacy_item['id'], target_partition_key)
+        if created is not None:
+            container.delete_item(legacy_item['id'], legacy_item['partitionKey'])
+        return created
+
+    def query_employee_items(self, container: CosmosDBManager, query: str, parameters: List[Dict[str, Any]], employee_id: str) -> List[Dict[str, Any]]:
+        """
+        Run a query scoped to one employee's partition. In dual mode the legacy partition is
+        queried too, and documents already present in the employee partition win.
+        """
+        items: Dict[str, Dict[str, Any]] = {}
+        for partition_key in self.read_partition_keys(container.cosmos_container_id, employee_id):
+            for item in container.query_items(query=query, parameters=parameters, partition_key=partition_key):
+                items.setdefault(item['id'], item)
+        return list(items.values())
+
+    def query_items_for_employees(self, container: CosmosDBManager, employee_ids: List[str], chunk_size: int = 1000) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Load the documents of many employees with one query per chunk of ids instead of one
+        query per employee. In legacy mode each chunk is a single-partition query; otherwise it
+        is a cross-partition query, and in dual mode a document in the employee partition wins
+        over its legacy copy.
+
+        :return: {employee_id: [documents]}; employees without documents are omitted
+        """
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(employee_ids), chunk_size):
+            results.extend(container.query_items(
+                query="SELECT * FROM c WHERE ARRAY_CONTAINS(@employee_ids, c.employee_id)",
+                parameters=[{"name": "@employee_ids", "value": employee_ids[start:start + chunk_size]}],
+                partition_key=self._bulk_partition_key(container)
+            ))
+        return self._group_by_employee(results)
+
+    def query_all_employee_items(self, container: CosmosDBManager) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Load every employee's documents in one query, e.g. to warm a cache. In legacy mode this
+        reads the single legacy partition.
+
+        :return: {employee_id: [documents]}
+        """
+        return self._group_by_employee(container.query_items(
+            query="SELECT * FROM c WHERE IS_DEFINED(c.employee_id)",
+            partition_key=self._bulk_partition_key(container)
+        ))
+
+    def _bulk_partition_key(self, container: CosmosDBManager) -> Optional[str]:
+        """The partition a multi-employee query is scoped to; None means cross-partition."""
+        return LEGACY_PARTITION_KEYS[container.cosmos_container_id] if self.mode == "legacy" else None
+
+    def _group_by_employee(self, results: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Group documents by employee, keeping one copy per document as reads would see it."""
+        items: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for item in results:
+            in_employee_partition = item.get('partitionKey') == item['employee_id']
+            if self.mode == "employee" and not in_employee_partition:
+                continue
+            key = (item['employee_id'], item['id'])
+            if in_employee_partition or key not in items:
+                items[key] = item
+
+        by_employee: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items.values():
+            by_employee.setdefault(item['employee_id'], []).append(item)
+        return by_employee
@@ -0,0 +1,458 @@
+"""
+### tracing.py ###
+
+Tracing for the calls the processor makes to external services (Cosmos DB, AI Search, Blob
+Storage, Azure OpenAI and email). Each call runs in a span recording its wall time and, where
+the service reports them, the Cosmos DB request charge, OpenAI prompt/completion tokens and
+request/response payload bytes. Processor steps such as save_updates get their own spans, so a
+slow request can be broken down into the calls it made.
+
+Spans follow the OpenTelemetry data model (trace and span ids, parent links, kind, status and
+semantic-convention attribute names) and are exported as OTLP/JSON, which OpenTelemetry
+collectors and backends accept as-is. Finished spans are also aggregated per span name into a
+metrics snapshot, see get_metrics_snapshot().
+
+TRACING_EXPORTER selects where finished spans go:
+    none      only aggregate metrics (default)
+    console   print each batch of spans as OTLP/JSON
+    file      append OTLP/JSON lines to TRACING_FILE (default traces.jsonl); no collector needed
+    otlp      POST OTLP/JSON to OTEL_EXPORTER_OTLP_ENDPOINT (default http://localhost:4318)
+TRACING_ENABLED=false turns spans off entirely. Payload sizes (json-encoding every request and
+response body) are only computed when an exporter is set or TRACING_PAYLOAD_SIZES=true.
+
+The tracer is built from the environment on first use, not at import, so settings loaded from
+.env by load_dotenv() after the imports take effect.
+
+Usage:
+    with tracing.span("search.query", attributes={"search.index": "resumes"}) as span:
+        results = list(search_client.search(...))
+        span.set_attribute("payload.response_bytes", tracing.payload_size(results))
+"""
+
+import atexit
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import random
+import secrets
+import threading
+import time
+import urllib.request
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SERVICE_NAME = "resume-updates"
+
+# OTLP span kinds and status codes
+SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+# Numeric span attributes summed per span name in the metrics snapshot
+METRIC_ATTRIBUTES = {
+    "db.cosmosdb.request_charge": "request_charge",
+    "gen_ai.usage.input_tokens": "prompt_tokens",
+    "gen_ai.usage.output_tokens": "completion_tokens",
+    "payload.request_bytes": "request_bytes",
+    "payload.response_bytes": "response_bytes",
+    "cache.hit": "cache_hits",
+}
+
+EXPORT_BATCH_SIZE = 256
+METRIC_RESERVOIR_SIZE = 1000
+
+
+class Span:
+    """A timed operation. Ended and exported by the span() context manager."""
+
+    def __init__(self, name: str, kind: str, parent: Optional["Span"], attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent.span_id if parent else None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self.error: Optional[str] = None
+        self._started = time.perf_counter()
+        self.duration = 0.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add(self, key: str, amount: float) -> None:
+        """Add to a numeric attribute, e.g. the RU charge of every page of a query."""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def record_exception(self, error: BaseException) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+
+    def end(self) -> None:
+        self.duration = time.perf_counter() - self._started
+        self.end_time_ns = self.start_time_ns + int(self.duration * 1e9)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": SPAN_KINDS.get(self.kind, 1),
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns or self.start_time_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": STATUS_ERROR, "message": self.error} if self.error else {"code": STATUS_UNSET},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+class _NoopSpan:
+    """Returned when tracing is off or no span is active, so callers never need to check."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add(self, key: str, amount: float) -> None:
+        pass
+
+    def record_exception(self, error: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def otlp_payload(spans: List[Span]) -> Dict[str, Any]:
+    """Wrap spans in an OTLP/JSON ExportTraceServiceRequest."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", os.environ.get("OTEL_SERVICE_NAME", DEFAULT_SERVICE_NAME))]},
+            "scopeSpans": [{
+                "scope": {"name": "resume-updates.tracing"},
+                "spans": [span.to_otlp() for span in spans]
+            }]
+        }]
+    }
+
+
+class ConsoleExporter:
+    def export(self, spans: List[Span]) -> None:
+        print(json.dumps(otlp_payload(spans)))
+
+
+class FileExporter:
+    """Appends one OTLP/JSON line per batch, the format read by the collector's otlpjsonfile receiver."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        line = json.dumps(otlp_payload(spans))
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+
+
+class OtlpHttpExporter:
+    """Sends spans to an OTLP/HTTP endpoint with JSON encoding. Failures are logged and dropped."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(otlp_payload(spans)).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        try:
+            urllib.request.urlopen(request, timeout=self.timeout).close()
+        except Exception as e:
+            logger.warning("Failed to export %s spans to %s: %s", len(spans), self.url, e)
+
+
+class InMemoryExporter:
+    """Keeps finished spans in a list, for benchmarks and ad hoc inspection."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, spans: List[Span]) -> None:
+        self.spans.extend(spans)
+
+
+def _exporter_from_env():
+    exporter = os.environ.get("TRACING_EXPORTER", "none")
+    if exporter == "none":
+        return None
+    if exporter == "console":
+        return ConsoleExporter()
+    if exporter == "file":
+        return FileExporter(os.environ.get("TRACING_FILE", "traces.jsonl"))
+    if exporter == "otlp":
+        return OtlpHttpExporter(os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318"))
+    raise ValueError(f"Unknown TRACING_EXPORTER '{exporter}', expected none, console, file or otlp")
+
+
+class _SpanMetrics:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: List[float] = []
+        self.sums: Dict[str, float] = {}
+
+    def record(self, span: Span) -> None:
+        self.count += 1
+        self.errors += span.error is not None
+        self.total += span.duration
+        self.max = max(self.max, span.duration)
+        if len(self.samples) < METRIC_RESERVOIR_SIZE:
+            self.samples.append(span.duration)
+        else:
+            index = random.randrange(self.count)
+            if index < METRIC_RESERVOIR_SIZE:
+                self.samples[index] = span.duration
+        for attribute, metric in METRIC_ATTRIBUTES.items():
+            value = span.attributes.get(attribute)
+            if isinstance(value, (int, float)):
+                self.sums[metric] = self.sums.get(metric, 0) + value
+
+    def snapshot(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000,
+            "p50_ms": ordered[int(0.50 * (len(ordered) - 1))] * 1000,
+            "p95_ms": ordered[int(0.95 * (len(ordered) - 1))] * 1000,
+            "max_ms": self.max * 1000,
+            **self.sums,
+        }
+
+
+class Tracer:
+    def __init__(self, exporter=None, enabled: bool = True, payload_sizes: Optional[bool] = None):
+        self.exporter = exporter
+        self.enabled = enabled
+        # Payload sizes are only worth their json encoding when spans are exported
+        self.payload_sizes = enabled and (payload_sizes if payload_sizes is not None else exporter is not None)
+        self._current: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+        self._pending: List[Span] = []
+        self._metrics: Dict[str, _SpanMetrics] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str, kind: str = "client", attributes: Optional[Dict[str, Any]] = None) -> Iterator[Span]:
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+        span = Span(name, kind, self._current.get(), attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            self._current.reset(token)
+            span.end()
+            self._finish(span)
+
+    def current_span(self):
+        return self._current.get() or NOOP_SPAN
+
+    def _finish(self, span: Span) -> None:
+        batch = None
+        with self._lock:
+            self._metrics.setdefault(span.name, _SpanMetrics()).record(span)
+            if self.exporter is not None:
+                self._pending.append(span)
+                if len(self._pending) >= EXPORT_BATCH_SIZE:
+                    batch, self._pending = self._pending, []
+        if batch:
+            self._export(batch)
+
+    def _export(self, spans: List[Span]) -> None:
+        try:
+            self.exporter.export(spans)
+        except Exception as e:
+            logger.warning("Failed to export %s spans: %s", len(spans), e)
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch and self.exporter is not None:
+            self._export(batch)
+
+    def get_metrics_snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: metrics.snapshot() for name, metrics in sorted(self._metrics.items())}
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self._metrics = {}
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def _tracer_from_env() -> Tracer:
+    payload_sizes = os.environ.get("TRACING_PAYLOAD_SIZES")
+    return Tracer(
+        _exporter_from_env(),
+        enabled=os.environ.get("TRACING_ENABLED", "true").lower() != "false",
+        payload_sizes=payload_sizes.lower() == "true" if payload_sizes else None
+    )
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer, building it from the environment on first use."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = _tracer_from_env()
+    return _tracer
+
+
+def configure(exporter=None, enabled: bool = True, payload_sizes: Optional[bool] = None) -> Tracer:
+    """Replace the process-wide tracer, e.g. configure(InMemoryExporter()) in a benchmark."""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is not None:
+            _tracer.flush()
+        _tracer = Tracer(exporter, enabled, payload_sizes)
+        return _tracer
+
+
+def _flush_at_exit() -> None:
+    if _tracer is not None:
+        _tracer.flush()
+
+
+atexit.register(_flush_at_exit)
+
+
+def is_enabled() -> bool:
+    """Whether spans are recorded; check before computing expensive attributes."""
+    return get_tracer().enabled
+
+
+def records_payloads() -> bool:
+    """Whether payload sizes are recorded; payload_size() returns 0 otherwise."""
+    return get_tracer().payload_sizes
+
+
+def span(name: str, kind: str = "client", attributes: Optional[Dict[str, Any]] = None):
+    """Run a block in a span. kind is "client" for external calls and "internal" for processor steps."""
+    return get_tracer().span(name, kind, attributes)
+
+
+def current_span():
+    return get_tracer().current_span()
+
+
+def traced(name: Optional[str] = None, kind: str = "internal") -> Callable:
+    """Decorator that runs a function in a span named after its qualified name."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(span_name, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def propagate(func: Callable) -> Callable:
+    """
+    Bind func to the caller's current span, so spans started on an executor thread are
+    children of the span that submitted the work.
+    """
+    tracer = get_tracer()
+    parent = tracer._current.get()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = tracer._current.set(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            tracer._current.reset(token)
+    return wrapper
+
+
+def flush() -> None:
+    get_tracer().flush()
+
+
+def get_metrics_snapshot() -> Dict[str, Dict[str, float]]:
+    """
+    Aggregates per span name since start or the last reset, e.g.
+    {"cosmos.read": {"count": 12, "errors": 0, "total_ms": 80.1, "mean_ms": 6.7, "p50_ms": 6.0,
+    "p95_ms": 12.4, "max_ms": 13.0, "request_charge": 12.0, "response_bytes": 9412}}
+    """
+    return get_tracer().get_metrics_snapshot()
+
+
+def reset_metrics() -> None:
+    get_tracer().reset_metrics()
+
+
+def payload_size(payload: Any) -> int:
+    """Approximate wire size in bytes of a request or response body; 0 unless records_payloads()."""
+    if payload is None or not get_tracer().payload_sizes:
+        return 0
+    if isinstance(payload, (bytes, bytearray)):
+        return len(payload)
+    if isinstance(payload, str):
+        return len(payload.encode("utf-8"))
+    try:
+        return len(json.dumps(payload, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+def record_llm_usage(span, response: Any) -> None:
+    """
+    Record token usage from an openai completion (response.usage) or a langchain message
+    (usage_metadata, or response_metadata["token_usage"] on older versions).
+    """
+    usage = getattr(response, "usage", None)
+    if usage is not None and getattr(usage, "prompt_tokens", None) is not None:
+        prompt_tokens, completion_tokens = usage.prompt_tokens, usage.completion_tokens
+    elif getattr(response, "usage_metadata", None):
+        prompt_tokens = response.usage_metadata.get("input_tokens", 0)
+        completion_tokens = response.usage_metadata.get("output_tokens", 0)
+    else:
+        token_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+        if not token_usage:
+            return
+        prompt_tokens = token_usage.get("prompt_tokens", 0)
+        completion_tokens = token_usage.get("completion_tokens", 0)
+    span.add("gen_ai.usage.input_tokens", prompt_tokens or 0)
+    span.add("gen_ai.usage.output_tokens", completion_tokens or 0)
@@ -49,11 +49,11 @@ def create_index():
 
     fields = [
         SimpleField(name="id", type=SearchFieldDataType.String, key=True, filterable=True),
-        SimpleField(name="project_number", type=SearchFieldDataType.String, filterable=True),
+        SimpleField(name="project_number", type=SearchFieldDataType.String, filterable=True, sortable=True),
         SimpleField(name="date", type=SearchFieldDataType.DateTimeOffset, filterable=True, facetable=True),
         SearchableField(name="content", type=SearchFieldDataType.String),
         SearchableField(name="sourcefilename", type=SearchFieldDataType.String, filterable=True),
-        SimpleField(name="sourcepage", type=SearchFieldDataType.Int32, filterable=True)
+        SimpleField(name="sourcepage", type=SearchFieldDataType.Int32, filterable=True, sortable=True)
     ]
 
     index = SearchIndex(
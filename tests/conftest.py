@@ -0,0 +1,54 @@
+"""
+Shared fixtures. Every test runs against the in-memory fakes (BACKEND_MODE=fake) with no
+injected latency or failures, so no Azure credentials or network are needed:
+
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+os.environ["BACKEND_MODE"] = "fake"
+os.environ["DRAFT_GENERATION_MODE"] = "inline"
+os.environ["LLM_CACHE_STORE"] = "none"
+os.environ["FAKE_LATENCY_MS"] = "0"
+os.environ["FAKE_FAILURE_RATE"] = "0"
+os.environ.pop("FAKE_BACKEND_PROFILE", None)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+import pytest
+
+import backends
+import employee_cache
+import llm_cache
+from fake_backends import FakeBlobServiceClient, FakeCosmosClient, FakeSearchClient
+from ResumeUpdateProcessor import ResumeUpdateProcessor
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    """A processor over empty fakes: a new Cosmos account, search indexes and storage account."""
+    monkeypatch.setattr(backends, "_fake_cosmos_client", FakeCosmosClient())
+    monkeypatch.setattr(FakeSearchClient, "_indexes", {})
+    monkeypatch.setattr(FakeBlobServiceClient, "_containers", {})
+    employee_cache.reset_employee_caches()
+    llm_cache.reset_llm_cache()
+    processor = ResumeUpdateProcessor()
+    processor.resume_cache.clear()
+    processor.project_cache.clear()
+    return processor
+
+
+def key_member(employee_id: str, project_number: str, job_hours: float, role: str = "PMCL", **fields) -> dict:
+    """A key member entry shaped like the rows of the key member export."""
+    entry = {
+        "subject_area": "fsu",
+        "project_number": project_number,
+        "project_role_name": role,
+        "employee_display_name": f"Doe, Jane - {employee_id}",
+        "job_hours": job_hours,
+        "employee_job_family_function_code": "ENCE",
+    }
+    entry.update(fields)
+    return entry
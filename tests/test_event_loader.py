@@ -0,0 +1,95 @@
+"""Streaming event loader: CSV parsing, checkpointed resume and deterministic event ids."""
+
+import json
+
+import pytest
+
+from event_loader import load_events, read_checkpoint
+
+HEADER = "subject_area,project_number,project_role_name,employee_display_name,job_hours,employee_job_family_function_code\n"
+
+
+def _events(processor):
+    return processor.events_container.query_items(query="SELECT * FROM c", parameters=[])
+
+
+def test_csv_quoted_newline_stays_in_its_row(processor, tmp_path):
+    input_path = tmp_path / "export.csv"
+    input_path.write_text(
+        HEADER
+        + '"water\nand sewer",P-1,PMCL,"Doe, Jane - 1001",5,ENCE\n'
+        + 'fsu,P-2,ENGR,"Roe, Rick - 1002",8.5,ENCE\n',
+        encoding="utf-8"
+    )
+
+    summary = load_events(processor, str(input_path), "csv", batch_size=10)
+
+    assert summary['rows'] == 2
+    events = {event['project_number']: event for event in _events(processor)}
+    assert events['P-1']['subject_area'] == "water\nand sewer"
+    assert events['P-2']['job_hours'] == 8.5
+
+
+def test_resume_replays_only_the_unfinished_batch(processor, tmp_path, monkeypatch):
+    input_path = tmp_path / "export.csv"
+    input_path.write_text(
+        HEADER
+        + 'fsu,P-1,PMCL,"Doe, Jane - 1001",5,ENCE\n'
+        + 'fsu,P-1,PMCL,"Doe, Jane - 1001",9,ENCE\n'
+        + '"multi\nline",P-2,PMCL,"Roe, Rick - 1002",4,ENCE\n',
+        encoding="utf-8"
+    )
+    process_key_members = processor.process_key_members
+    calls = []
+
+    def crash_after_second_batch(batch):
+        calls.append(len(batch))
+        results = process_key_members(batch)
+        if len(calls) == 2:
+            raise RuntimeError("loader killed")
+        return results
+
+    monkeypatch.setattr(processor, "process_key_members", crash_after_second_batch)
+    with pytest.raises(RuntimeError):
+        load_events(processor, str(input_path), "csv", batch_size=1)
+    assert read_checkpoint(f"{input_path}.checkpoint")['rows'] == 1
+
+    monkeypatch.setattr(processor, "process_key_members", process_key_members)
+    summary = load_events(processor, str(input_path), "csv", batch_size=1)
+
+    assert summary['rows'] == 2
+    assert summary['total_rows'] == 3
+    # The replayed row overwrote its event instead of adding another
+    assert len(_events(processor)) == 3
+    assert processor._read_tracker("P-1-1001", "1001")['total_hours'] == 9
+    assert processor._read_tracker("P-2-1002", "1002")['subject_area'] == "multi\nline"
+
+
+def test_checkpoint_of_a_changed_input_is_refused(processor, tmp_path):
+    input_path = tmp_path / "export.jsonl"
+    rows = [
+        {"subject_area": "fsu", "project_number": "P-1", "project_role_name": "PMCL",
+         "employee_display_name": f"Doe, Jane - {1000 + index}", "job_hours": index, "employee_job_family_function_code": "ENCE"}
+        for index in range(1, 5)
+    ]
+    input_path.write_text("".join(json.dumps(row) + "\n" for row in rows[:2]), encoding="utf-8")
+    load_events(processor, str(input_path), "jsonl", batch_size=1)
+
+    with open(input_path, "a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(row) + "\n" for row in rows[2:]))
+    # Appending changes the input's fingerprint, so the old checkpoint is refused
+    with pytest.raises(ValueError):
+        load_events(processor, str(input_path), "jsonl", batch_size=1)
+
+    summary = load_events(processor, str(input_path), "jsonl", batch_size=1, restart=True)
+    assert summary['rows'] == 4
+
+
+def test_restart_reuses_event_ids(processor, tmp_path):
+    input_path = tmp_path / "export.csv"
+    input_path.write_text(HEADER + 'fsu,P-1,PMCL,"Doe, Jane - 1001",5,ENCE\n', encoding="utf-8")
+
+    load_events(processor, str(input_path), "csv")
+    load_events(processor, str(input_path), "csv", restart=True)
+
+    assert len(_events(processor)) == 1
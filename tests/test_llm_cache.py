@@ -0,0 +1,109 @@
+"""Content-addressed LLM response cache: keys, temperature bypass, the stores and the processor's cached calls."""
+
+from io import BytesIO
+
+from fake_backends import build_resume_docx
+from llm_cache import DiskStore, LLMResponseCache, cache_key
+
+MESSAGES = [{"role": "system", "content": "Find the insertion point."}, {"role": "user", "content": "Resume text"}]
+
+
+class Calls:
+    def __init__(self, value="answer"):
+        self.value = value
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+        return self.value
+
+
+def test_cache_key_covers_everything_that_determines_the_response():
+    key = cache_key("gpt-4o", "schema", MESSAGES, "v1")
+
+    assert key == cache_key("gpt-4o", "schema", [dict(reversed(list(message.items()))) for message in MESSAGES], "v1")
+    assert key != cache_key("gpt-4o-mini", "schema", MESSAGES, "v1")
+    assert key != cache_key("gpt-4o", "other_schema", MESSAGES, "v1")
+    assert key != cache_key("gpt-4o", "schema", MESSAGES, "v2")
+    assert key != cache_key("gpt-4o", "schema", MESSAGES[:1] + [{"role": "user", "content": "Resume text."}], "v1")
+    assert key != cache_key("gpt-4o", "schema", [{"role": "user", "content": message["content"]} for message in MESSAGES], "v1")
+
+
+def test_temperature_zero_responses_are_computed_once():
+    cache = LLMResponseCache(None)
+    compute = Calls()
+
+    assert cache.cached("gpt-4o", None, MESSAGES, 0, compute) == "answer"
+    assert cache.cached("gpt-4o", None, MESSAGES, 0, compute) == "answer"
+    assert compute.count == 1
+    assert cache.stats()['memory_hits'] == 1
+
+
+def test_sampled_calls_bypass_the_cache():
+    cache = LLMResponseCache(None)
+    compute = Calls()
+
+    cache.cached("gpt-4o", None, MESSAGES, 0.7, compute)
+    cache.cached("gpt-4o", None, MESSAGES, 0.7, compute)
+
+    assert compute.count == 2
+    assert cache.stats()['bypassed'] == 2
+
+
+def test_failed_calls_are_not_cached():
+    cache = LLMResponseCache(None)
+    compute = Calls(value=None)
+
+    cache.cached("gpt-4o", None, MESSAGES, 0, compute)
+    cache.cached("gpt-4o", None, MESSAGES, 0, compute)
+
+    assert compute.count == 2
+
+
+def test_disk_store_answers_after_the_memory_layer_is_cleared(tmp_path):
+    cache = LLMResponseCache(DiskStore(str(tmp_path)))
+    compute = Calls({"start_phrase": "Project Experience"})
+    cache.cached("gpt-4o", None, MESSAGES, 0, compute)
+
+    cache.clear_memory()
+    restarted = LLMResponseCache(DiskStore(str(tmp_path)))
+
+    assert cache.cached("gpt-4o", None, MESSAGES, 0, compute) == {"start_phrase": "Project Experience"}
+    assert restarted.cached("gpt-4o", None, MESSAGES, 0, compute) == {"start_phrase": "Project Experience"}
+    assert compute.count == 1
+    assert cache.stats()['store_hits'] == 1
+
+
+def test_disk_store_evicts_least_recently_used_entries(tmp_path):
+    store = DiskStore(str(tmp_path), max_bytes=40)
+    store.put("old", "x" * 15)
+    store.put("recent", "y" * 15)
+    store.get("old")
+    store.put("new", "z" * 15)
+
+    assert store.get("recent") is None
+    assert store.get("old") == "x" * 15
+    assert store.get("new") == "z" * 15
+
+
+def test_repeated_insertion_analysis_hits_the_cache(processor):
+    from docx import Document
+    resume = build_resume_docx("Jane Doe", ["Project Engineer, Riverside Transit Hub, Denver, CO (2019 to 2021)."])
+
+    first = processor._find_insert_position(Document(BytesIO(resume)))
+    second = processor._find_insert_position(Document(BytesIO(resume)))
+
+    assert first == second
+    stats = processor.llm_cache.stats()
+    assert stats['misses'] == 1
+    assert stats['memory_hits'] == 1
+
+
+def test_repeated_description_parse_hits_the_cache(processor):
+    description = "Project Engineer, Lakeside Water Treatment Plant, Boise, ID (2020 to 2022)\nLed the design of the expansion."
+
+    first = processor._parse_project_title_and_description(description)
+    second = processor._parse_project_title_and_description(description)
+
+    assert first == second
+    assert processor.llm_cache.stats()['memory_hits'] == 1
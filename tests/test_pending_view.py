@@ -0,0 +1,92 @@
+"""Pending-updates view: per-employee summaries, the sharded employee index and reconcile()."""
+
+from conftest import key_member
+
+
+def _make_pending(processor, employee_id, project_number, draft_status="ready"):
+    """Create a tracker and move it to in_progress with the given draft status, as drafting does."""
+    processor.process_key_member(key_member(employee_id, project_number, 5.0))
+    tracker = processor._patch_tracker(f"{project_number}-{employee_id}", employee_id, [
+        {"op": "set", "path": "/added_to_resume", "value": "in_progress"},
+        {"op": "set", "path": "/draft_status", "value": draft_status},
+        {"op": "set", "path": "/project_name", "value": f"Project {project_number}"},
+    ])
+    processor._record_pending(tracker)
+    return tracker
+
+
+def _index_shard(processor, employee_id):
+    view = processor.pending_view
+    shard_id = view._index_id(view._index_shard(employee_id))
+    return processor.trackers_container.read_item(shard_id, shard_id)
+
+
+def test_ready_draft_enters_the_view(processor):
+    _make_pending(processor, "1001", "P-1")
+
+    pending = processor.get_pending_updates("1001")
+    assert [entry['id'] for entry in pending] == ["P-1-1001"]
+    assert pending[0]['project_name'] == "Project P-1"
+    assert processor.pending_view.get_employees_with_pending() == ["1001"]
+    assert [entry['id'] for entry in processor.get_pending_updates()] == ["P-1-1001"]
+
+
+def test_draft_still_generating_is_not_listed(processor):
+    _make_pending(processor, "1001", "P-1", draft_status="pending")
+
+    assert processor.get_pending_updates("1001") == []
+    assert processor.pending_view.get_employees_with_pending() == []
+
+
+def test_index_is_written_only_when_an_employee_enters_or_leaves(processor):
+    _make_pending(processor, "1001", "P-1")
+    etag = _index_shard(processor, "1001")['_etag']
+
+    _make_pending(processor, "1001", "P-2")
+    processor.discard_update("1001", "P-1")
+    assert _index_shard(processor, "1001")['_etag'] == etag
+    assert [entry['id'] for entry in processor.get_pending_updates("1001")] == ["P-2-1001"]
+
+    processor.discard_update("1001", "P-2")
+    assert processor.get_pending_updates("1001") == []
+    assert processor.pending_view.get_employees_with_pending() == []
+
+
+def test_new_hours_keep_the_pending_since_date(processor):
+    _make_pending(processor, "1001", "P-1")
+    pending_since = processor.get_pending_updates("1001")[0]['pending_since']
+
+    processor.process_key_member(key_member("1001", "P-1", 50.0))
+
+    entry = processor.get_pending_updates("1001")[0]
+    assert entry['total_hours'] == 50.0
+    assert entry['pending_since'] == pending_since
+
+
+def test_reconcile_rebuilds_lost_summaries_and_index_shards(processor):
+    _make_pending(processor, "1001", "P-1")
+    _make_pending(processor, "1002", "P-1")
+    view = processor.pending_view
+    processor.trackers_container.delete_item(view._summary_id("1001"), view._summary_partition_key("1001"))
+    shard = _index_shard(processor, "1002")
+    processor.trackers_container.delete_item(shard['id'], shard['partitionKey'])
+
+    result = view.reconcile()
+
+    assert result['repaired'] == 1
+    assert result['index_shards_repaired'] == 1
+    assert result['failed'] == 0
+    assert view.get_employees_with_pending() == ["1001", "1002"]
+    assert [entry['id'] for entry in view.get_employee_pending("1001")] == ["P-1-1001"]
+    assert view.reconcile() == {"employees": 2, "repaired": 0, "index_shards_repaired": 0, "failed": 0}
+
+
+def test_reconcile_drops_employees_without_pending_trackers(processor):
+    tracker = _make_pending(processor, "1001", "P-1")
+    # Moved out of the view without recording it, as a write from outside the processor would
+    processor._patch_tracker(tracker['id'], "1001", [{"op": "set", "path": "/added_to_resume", "value": "yes"}])
+
+    processor.pending_view.reconcile()
+
+    assert processor.get_pending_updates("1001") == []
+    assert processor.pending_view.get_employees_with_pending() == []
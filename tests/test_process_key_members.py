@@ -0,0 +1,81 @@
+"""Batch ingestion: process_key_members and its transactional batch writes."""
+
+from conftest import key_member
+from fake_backends import seed_employee, seed_project
+
+
+def _tracker(processor, employee_id, project_number):
+    return processor._read_tracker(f"{project_number}-{employee_id}", employee_id)
+
+
+def _event_count(processor, project_number):
+    return len(processor.events_container.query_items(
+        query="SELECT * FROM c WHERE c.project_number = @project_number",
+        parameters=[{"name": "@project_number", "value": project_number}],
+        partition_key=project_number
+    ))
+
+
+def test_batch_applies_latest_hours_per_tracker(processor):
+    entries = [
+        key_member("1001", "P-1", 5.0),
+        key_member("1002", "P-1", 7.0),
+        key_member("1001", "P-1", 12.0),
+        key_member("1001", "P-2", 3.0),
+    ]
+
+    results = processor.process_key_members(entries)
+
+    assert [result['status'] for result in results] == ["stored"] * 4
+    assert [result['tracker_id'] for result in results] == ["P-1-1001", "P-1-1002", "P-1-1001", "P-2-1001"]
+    assert _tracker(processor, "1001", "P-1")['total_hours'] == 12.0
+    assert _tracker(processor, "1002", "P-1")['total_hours'] == 7.0
+    assert _tracker(processor, "1001", "P-2")['total_hours'] == 3.0
+    assert _event_count(processor, "P-1") == 3
+
+
+def test_batch_patches_existing_trackers(processor):
+    processor.process_key_member(key_member("1001", "P-1", 5.0))
+
+    processor.process_key_members([key_member("1001", "P-1", 9.0, role="ENGR"), key_member("1001", "P-1", 11.0, role="ENGR")])
+
+    tracker = _tracker(processor, "1001", "P-1")
+    assert tracker['total_hours'] == 11.0
+    assert tracker['version'] == 2
+    assert [role['role_name'] for role in tracker['role_history']] == ["PMCL", "ENGR"]
+    assert tracker['role_history'][0]['end_date'] is not None
+    assert tracker['role_history'][1]['end_date'] is None
+
+
+def test_replayed_rows_keep_one_event(processor):
+    entries = [key_member("1001", "P-1", 5.0, event_id="row-1"), key_member("1001", "P-1", 6.0, event_id="row-2")]
+
+    processor.process_key_members(entries)
+    processor.process_key_members(entries)
+
+    assert _event_count(processor, "P-1") == 2
+    assert _tracker(processor, "1001", "P-1")['total_hours'] == 6.0
+
+
+def test_only_the_last_row_of_a_tracker_reports_the_trigger(processor):
+    seed_employee(processor, "1001", "Jane Doe", "jane@example.com")
+    seed_project(processor, "P-1", "Design and construction of the Lakeside water treatment plant expansion.")
+
+    results = processor.process_key_members([key_member("1001", "P-1", 30.0), key_member("1001", "P-1", 45.0)])
+
+    assert [result['status'] for result in results] == ["stored", "triggered"]
+    assert _tracker(processor, "1001", "P-1")['added_to_resume'] == "in_progress"
+
+
+def test_rows_whose_event_was_not_stored_are_reported(processor, monkeypatch):
+    def fail_upsert(item):
+        raise RuntimeError("event write failed")
+
+    monkeypatch.setattr(processor.events_container, "upsert_items", lambda items: [None] * len(items))
+    monkeypatch.setattr(processor.events_container, "upsert_item", fail_upsert)
+
+    results = processor.process_key_members([key_member("1001", "P-1", 5.0, event_id="row-1")])
+
+    assert results[0]['status'] == "event_not_stored"
+    assert results[0]['event_id'] == "row-1"
+    assert _tracker(processor, "1001", "P-1")['total_hours'] == 5.0
@@ -0,0 +1,84 @@
+"""search.in filters, batched key lookups and the project lookup's fallback for unsortable indexes."""
+
+import pytest
+
+from fake_backends import FakeSearchClient, seed_project
+from search_queries import eq_filter, in_filter, search_by_keys
+
+
+class CountingSearchClient(FakeSearchClient):
+    def __init__(self, index_name):
+        super().__init__(index_name)
+        self.requests = []
+
+    def search(self, *args, **kwargs):
+        self.requests.append(kwargs)
+        return super().search(*args, **kwargs)
+
+
+@pytest.fixture
+def index(processor):
+    client = CountingSearchClient("test-index")
+    client.upload_documents([
+        {"id": f"{key}-{page}", "key": key, "page": page}
+        for key in ["a", "b", "c", "d", "o'brien"] for page in range(3)
+    ])
+    return client
+
+
+def test_eq_filter_escapes_quotes():
+    assert eq_filter("employee_id", "o'brien") == "employee_id eq 'o''brien'"
+
+
+def test_in_filter_escapes_quotes():
+    assert in_filter("employee_id", ["1", "o'brien"]) == "search.in(employee_id, '1|o''brien', '|')"
+
+
+def test_in_filter_picks_a_delimiter_no_value_contains():
+    assert in_filter("project_number", ["a|b", "c,d"]) == "search.in(project_number, 'a|b;c,d', ';')"
+
+
+def test_in_filter_rejects_unusable_values():
+    with pytest.raises(ValueError):
+        in_filter("employee_id", [])
+    with pytest.raises(ValueError):
+        in_filter("employee_id", ["|,;~^"])
+
+
+def test_keys_are_grouped_and_deduplicated(index):
+    documents = search_by_keys(index, "key", ["a", "o'brien", "a", "", None, "missing"])
+
+    assert sorted(documents) == ["a", "o'brien"]
+    assert len(documents["o'brien"]) == 3
+    assert len(index.requests) == 1
+
+
+def test_sorted_lookup_pages_with_skip(index):
+    documents = search_by_keys(index, "key", ["a", "b"], page_size=2, order_by=["key asc", "page asc"])
+
+    assert [document['page'] for document in documents["a"]] == [0, 1, 2]
+    assert [document['page'] for document in documents["b"]] == [0, 1, 2]
+    # Every page came back full, so an empty fourth page marks the end
+    assert [request['skip'] for request in index.requests] == [0, 2, 4, 6]
+
+
+def test_unsorted_lookup_splits_chunks_that_fill_a_page(index):
+    documents = search_by_keys(index, "key", ["a", "b", "c", "d"], page_size=4)
+
+    assert {key: len(group) for key, group in documents.items()} == {"a": 3, "b": 3, "c": 3, "d": 3}
+    assert all("order_by" not in request for request in index.requests)
+    # One full page for all four keys, one for each half, then one per key
+    assert len(index.requests) == 7
+
+
+def test_project_lookup_retries_without_sort_when_index_rejects_it(processor):
+    seed_project(processor, "P-1", " ".join(f"first{index}" for index in range(300)))
+    seed_project(processor, "P-2", "second project")
+    processor.search_client_projects.sortable_fields = set()
+
+    descriptions = processor._get_project_descriptions(["P-1", "P-2"])
+
+    assert descriptions["P-1"].startswith("first0 ")
+    assert "first299" in descriptions["P-1"]
+    assert descriptions["P-2"] == "second project"
+    assert processor.project_order_by is None
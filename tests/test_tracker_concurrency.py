@@ -0,0 +1,79 @@
+"""Optimistic concurrency on trackers: ETag-conditioned writes and filter-predicate transitions."""
+
+import pytest
+
+from conftest import key_member
+from cosmosdb import PreconditionFailedError
+
+
+@pytest.fixture
+def tracker(processor):
+    processor.process_key_member(key_member("1001", "P-1", 5.0))
+    return processor._read_tracker("P-1-1001", "1001")
+
+
+def test_replace_with_stale_etag_is_rejected(processor, tracker):
+    processor._patch_tracker(tracker['id'], "1001", [{"op": "set", "path": "/description", "value": "newer"}])
+
+    tracker['description'] = "stale"
+    with pytest.raises(PreconditionFailedError):
+        processor.trackers_container.update_item(tracker, etag=tracker['_etag'])
+    assert processor._read_tracker(tracker['id'], "1001")['description'] == "newer"
+
+
+def test_patch_with_stale_etag_is_rejected(processor, tracker):
+    processor._patch_tracker(tracker['id'], "1001", [{"op": "set", "path": "/total_hours", "value": 6.0}])
+
+    with pytest.raises(PreconditionFailedError):
+        processor._patch_tracker(tracker['id'], "1001", [{"op": "set", "path": "/total_hours", "value": 7.0}], etag=tracker['_etag'])
+
+
+def test_mutation_is_reapplied_after_a_concurrent_write(processor, tracker):
+    concurrent_writes = []
+
+    def add_project_name(current):
+        if not concurrent_writes:
+            # Another writer changes the tracker between this read and the write
+            concurrent_writes.append(processor._patch_tracker(current['id'], "1001", [{"op": "set", "path": "/description", "value": "theirs"}]))
+        current['project_name'] = "ours"
+
+    updated = processor._mutate_tracker(tracker['id'], "1001", add_project_name, tracker)
+
+    assert updated['project_name'] == "ours"
+    assert updated['description'] == "theirs"
+    assert processor.get_conflict_retry_count() == 1
+
+
+def test_mutation_skipped_when_mutate_returns_false(processor, tracker):
+    assert processor._mutate_tracker(tracker['id'], "1001", lambda current: False) is None
+    assert processor._read_tracker(tracker['id'], "1001")['version'] == tracker['version']
+
+
+def test_transition_applies_only_from_the_expected_status(processor, tracker):
+    first = processor._mark_in_progress(tracker)
+    second = processor._mark_in_progress(tracker)
+
+    assert first['added_to_resume'] == "in_progress"
+    assert first['draft_status'] == "pending"
+    assert first['version'] == tracker['version'] + 1
+    assert second is None
+
+
+def test_concurrent_role_change_is_retried(processor, tracker, monkeypatch):
+    read_tracker = processor._read_tracker
+    reads = []
+
+    def read_then_change(tracker_id, employee_id):
+        current = read_tracker(tracker_id, employee_id)
+        if not reads:
+            processor._patch_tracker(tracker_id, employee_id, [{"op": "set", "path": "/description", "value": "theirs"}])
+        reads.append(current)
+        return current
+
+    monkeypatch.setattr(processor, "_read_tracker", read_then_change)
+    updated = processor._get_or_create_tracker(key_member("1001", "P-1", 8.0, role="ENGR"))
+
+    assert len(reads) == 2
+    assert updated['total_hours'] == 8.0
+    assert updated['description'] == "theirs"
+    assert [role['role_name'] for role in updated['role_history']] == ["PMCL", "ENGR"]